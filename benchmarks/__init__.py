@@ -0,0 +1,3 @@
+"""
+Бенчмарки горячих путей: распределение, статистика и сохранение данных.
+"""
@@ -0,0 +1,52 @@
+import random
+from typing import List
+from transport.client import Client
+from transport.airplane import Airplane
+from transport.van import Van
+from transport.ids import SeededAllocator, use_allocator
+
+
+def generate_fleet(count: int, seed: int = 0) -> List:
+    """
+    Сгенерировать воспроизводимый парк транспорта.
+
+    Примерно 20% - самолеты на 40-120 т, остальные - фургоны на 5-40 т.
+    ID транспорта тоже воспроизводимы (SeededAllocator с тем же зерном).
+
+    Args:
+        count: Количество транспортных средств
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        Список объектов Airplane и Van
+    """
+    rnd = random.Random(seed)
+    fleet = []
+    with use_allocator(SeededAllocator(seed)):
+        for _ in range(count):
+            if rnd.random() < 0.2:
+                fleet.append(Airplane(round(rnd.uniform(40, 120), 1), rnd.choice([9000, 10000, 12000])))
+            else:
+                fleet.append(Van(round(rnd.uniform(5, 40), 1), rnd.random() < 0.3))
+    return fleet
+
+
+def generate_clients(count: int, seed: int = 0) -> List[Client]:
+    """
+    Сгенерировать воспроизводимый список клиентов.
+
+    Веса распределены логнормально (медиана около 2 т, не больше 60 т),
+    около 10% клиентов - VIP.
+
+    Args:
+        count: Количество клиентов
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        Список объектов Client
+    """
+    rnd = random.Random(seed + 1)
+    return [
+        Client(f"Клиент {i}", round(min(60.0, max(0.1, rnd.lognormvariate(0.7, 0.9))), 2), rnd.random() < 0.1)
+        for i in range(count)
+    ]
@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from transport.transport_company import TransportCompany
+from transport.packing import STRATEGIES
+from transport.persistence import company_to_dict
+from transport.snapshot import SNAPSHOT_SUFFIX
+from benchmarks.generators import generate_fleet, generate_clients
+
+# Стратегии с полным перебором не масштабируются на большие объемы
+GREEDY_STRATEGIES = [name for name in STRATEGIES if name != "exact"]
+
+
+def measure(func, repeat: int, setup=None) -> dict:
+    """
+    Замерить время выполнения функции.
+
+    Args:
+        func: Функция без аргументов
+        repeat: Количество повторов
+        setup: Функция без аргументов, вызываемая перед каждым повтором (не замеряется)
+
+    Returns:
+        Словарь с минимальным, медианным и средним временем в мс
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": min(times),
+        "median_ms": statistics.median(times),
+        "mean_ms": statistics.fmean(times)
+    }
+
+
+def fill_company(company, clients, vehicles):
+    """Заполнить компанию транспортом и клиентами."""
+    for vehicle in vehicles:
+        company.add_vehicle(vehicle)
+    for client in clients:
+        company.add_client(client)
+    return company
+
+
+def bench_package(n_clients: int, n_vehicles: int, seed: int, repeat: int) -> list:
+    """Бенчмарки консольной версии (пакет transport)."""
+    company = fill_company(TransportCompany("Бенчмарк"),
+                           generate_clients(n_clients, seed), generate_fleet(n_vehicles, seed))
+    records = []
+
+    for name in GREEDY_STRATEGIES:
+        records.append({"name": "optimize_cargo_distribution", "variant": f"package/{name}",
+                        **measure(lambda: company.optimize_cargo_distribution(name), repeat)})
+    records.append({"name": "get_statistics", "variant": "package",
+                    **measure(company.get_statistics, repeat)})
+    records.append({"name": "list_vehicles", "variant": "package",
+                    **measure(company.list_vehicles, repeat)})
+    return records
+
+
+def bench_gui(n_clients: int, n_vehicles: int, seed: int, repeat: int) -> list:
+    """Бенчмарки графической версии в режиме offscreen (нужен PyQt6)."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt6.QtWidgets import QApplication
+        import main_gui
+    except ImportError as e:
+        print(f"GUI-бенчмарки пропущены: {e}", file=sys.stderr)
+        return []
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    records = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / "data.json"
+
+        company = fill_company(main_gui.TransportCompany("Бенчмарк"),
+                               generate_clients(n_clients, seed), generate_fleet(n_vehicles, seed))
+        company.DATA_FILE = data_file
+        records.append({"name": "optimize_cargo_distribution", "variant": "gui",
+                        **measure(company.optimize_cargo_distribution, repeat)})
+        records.append({"name": "save_to_file", "variant": "gui",
+                        **measure(company.save_to_file, repeat)})
+        company.close()
+
+        # Те же данные в JSON - в отдельном каталоге, чтобы не подхватывался data.snap
+        json_file = Path(tmp) / "json" / "data.json"
+        json_file.parent.mkdir()
+        json_file.write_text(json.dumps(company_to_dict(company), ensure_ascii=False), encoding="utf-8")
+
+        def load(path):
+            loaded = main_gui.TransportCompany("Бенчмарк")
+            loaded.DATA_FILE = path
+            try:
+                loaded.load_from_file()
+            finally:
+                # Каждый повтор запускает поток записи - его нужно остановить
+                loaded.close()
+
+        def reset_json():
+            # Загрузка из JSON один раз преобразует его в data.snap (как первый запуск GUI)
+            json_file.with_suffix(SNAPSHOT_SUFFIX).unlink(missing_ok=True)
+            json_file.with_suffix(".journal").unlink(missing_ok=True)
+
+        records.append({"name": "load_from_file", "variant": "gui/snap",
+                        **measure(lambda: load(data_file), repeat)})
+        records.append({"name": "load_from_file", "variant": "gui/json",
+                        **measure(lambda: load(json_file), repeat, reset_json)})
+
+        # MainWindow читает данные из TransportCompany.DATA_FILE при создании
+        original = main_gui.TransportCompany.DATA_FILE
+        main_gui.TransportCompany.DATA_FILE = data_file
+        try:
+            window = main_gui.MainWindow()
+        finally:
+            main_gui.TransportCompany.DATA_FILE = original
+        window.show()
+
+        def refresh():
+            window.refresh_tables()
+            app.processEvents()
+
+        records.append({"name": "refresh_tables", "variant": "gui", **measure(refresh, repeat)})
+        window.close()
+
+    return records
+
+
+def git_commit():
+    """Получить хеш текущего коммита, если доступен git."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки горячих путей транспортной компании")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Количество клиентов (по умолчанию 1000 10000 100000)")
+    parser.add_argument("--vehicles-ratio", type=float, default=0.05,
+                        help="Транспортных средств на одного клиента (по умолчанию 0.05)")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество повторов замера")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генераторов данных")
+    parser.add_argument("--no-gui", action="store_true", help="Пропустить GUI-бенчмарки")
+    parser.add_argument("--output", help="Файл для JSON-результатов (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_clients in args.sizes:
+        n_vehicles = max(1, int(n_clients * args.vehicles_ratio))
+        records = bench_package(n_clients, n_vehicles, args.seed, args.repeat)
+        if not args.no_gui:
+            records += bench_gui(n_clients, n_vehicles, args.seed, args.repeat)
+        for record in records:
+            record.update({"clients": n_clients, "vehicles": n_vehicles})
+            print(f"{record['name']:<28} {record['variant']:<36} n={n_clients:<8} "
+                  f"{record['median_ms']:10.2f} мс", file=sys.stderr)
+        results += records
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": args.seed,
+        "results": results
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,26 @@
+import argparse
+import asyncio
+import json
+import signal
 import sys
 import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Tuple
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from transport.client import Client
 from transport.airplane import Airplane
 from transport.van import Van
 from transport.transport_company import TransportCompany
+from transport.packing import STRATEGIES, DEFAULT_STRATEGY
+from transport.persistence import Journal, load_company, resolve_snapshot, save_snapshot
+from transport.snapshot import SNAPSHOT_SUFFIX
+from transport.importer import import_clients
+from transport.exporter import EXPORT_FORMATS, DEFAULT_BUFFER_SIZE
+from transport.service import PlanningService
+from transport import instrumentation
 
 def display_menu():
     """Отобразить главное меню."""
@@ -163,6 +178,7 @@ def main():
             print(f"Всего груза: {result['total_cargo']:.2f}т")
             print(f"Распределено: {result['cargo_distributed']:.2f}т")
             print(f"Использовано транспорта: {result['vehicles_used']} из {len(company.vehicles)}")
+            print(f"Нижняя граница: {result['lower_bound']} (разрыв {result['optimality_gap'] * 100:.1f}%)")
             
             if result['successful']:
                 print(f"\nУСПЕШНО ЗАГРУЖЕНЫ ({len(result['successful'])}):")
@@ -218,7 +234,230 @@ def main():
         else:
             print("Неверный выбор! Пожалуйста, выберите действие от 0 до 8.")
 
+def load_data_file(path: str, company_name: str, must_exist: bool = True) -> Tuple[TransportCompany, Journal]:
+    """
+    Загрузить компанию из файла данных GUI (снимок и журнал изменений).
+    
+    Если рядом с data.json есть двоичный снимок data.snap, загружается он.
+    
+    Args:
+        path: Путь к data.json
+        company_name: Название компании
+        must_exist: Требовать наличия файла данных (иначе - пустая компания)
+        
+    Returns:
+        Кортеж (транспортная компания, журнал изменений)
+    """
+    path = Path(path)
+    snapshot = resolve_snapshot(path)
+    if must_exist and not snapshot.exists():
+        raise FileNotFoundError(f"Файл данных не найден: {path}")
+    company = TransportCompany(company_name)
+    journal = Journal(path.with_suffix(".journal"))
+    load_company(company, snapshot, journal)
+    journal.close()
+    return company, journal
+
+@contextmanager
+def timed(timings: dict, phase: str):
+    """Замерить время этапа команды в миллисекундах."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = round((time.perf_counter() - start) * 1000, 3)
+
+def emit(report: dict, stream=None) -> None:
+    """Вывести отчет команды одной строкой JSON."""
+    print(json.dumps(report, ensure_ascii=False), file=stream or sys.stdout)
+
+def command_import(args, timings: dict) -> dict:
+    """Импортировать клиентов из CSV/JSON Lines и сохранить файл данных."""
+    with timed(timings, "load"):
+        company, journal = load_data_file(args.data, args.company, must_exist=False)
+    with timed(timings, "import"):
+        report = import_clients(company, args.file, args.format, args.batch_size, args.max_errors)
+    with timed(timings, "save"):
+        save_snapshot(company, Path(args.data).with_suffix(SNAPSHOT_SUFFIX), journal)
+    return {
+        "imported": report.imported,
+        "error_count": report.error_count,
+        "errors": [{"line": line, "message": message} for line, message in report.errors],
+        "total_clients": len(company.clients)
+    }
+
+def command_distribute(args, timings: dict) -> dict:
+    """
+    Рассчитать распределение грузов и вывести итоги (пробный запуск).
+    
+    Файлы данных не изменяются: закрепления клиентов за транспортом не
+    хранятся ни в снимке, ни в журнале, их восстанавливает следующее
+    распределение. Стратегии детерминированы, поэтому export с той же
+    стратегией (без улучшения, ограниченного временем) выгружает это же
+    распределение.
+    """
+    with timed(timings, "load"):
+        company, _ = load_data_file(args.data, args.company)
+    with timed(timings, "distribute"):
+        if args.shards:
+            result = company.optimize_sharded(args.strategy, args.shards, improve_ms=args.improve_ms)
+        else:
+            result = company.optimize_cargo_distribution(args.strategy, improve_ms=args.improve_ms)
+    report = {
+        "strategy": result["strategy"],
+        "elapsed_ms": result["elapsed_ms"],
+        "successful": len(result["successful"]),
+        "failed": len(result["failed"]),
+        "vehicles_used": result["vehicles_used"],
+        "lower_bound": result["lower_bound"],
+        "optimality_gap": result["optimality_gap"],
+        "total_vehicles": len(company.vehicles),
+        "total_cargo": result["total_cargo"],
+        "cargo_distributed": result["cargo_distributed"]
+    }
+    if "improvement" in result:
+        report["improvement"] = result["improvement"]
+    if args.shards:
+        report["shards"] = result["shards"]
+        report["rebalanced"] = result["rebalanced"]
+    return report
+
+def command_stats(args, timings: dict) -> dict:
+    """Вывести статистику компании."""
+    with timed(timings, "load"):
+        company, _ = load_data_file(args.data, args.company)
+    with timed(timings, "stats"):
+        return company.get_statistics()
+
+def command_export(args, timings: dict) -> dict:
+    """
+    Распределить грузы и выгрузить результат без интерактивного меню.
+    
+    Распределение рассчитывается заново (см. command_distribute) и, как
+    и там, в файлы данных не сохраняется.
+    """
+    with timed(timings, "load"):
+        company, _ = load_data_file(args.data, args.company)
+    with timed(timings, "distribute"):
+        company.optimize_cargo_distribution(args.strategy, improve_ms=args.improve_ms)
+    
+    target = sys.stdout if args.output == "-" else args.output
+    fmt = args.format or ("txt" if args.output == "-" else None)
+    with timed(timings, "export"):
+        count = company.export_distribution(target, fmt, args.buffer_size)
+    return {"output": args.output, "exported": count}
+
+async def serve(service: PlanningService, host: str, port: int) -> None:
+    """Запустить HTTP-сервис, сообщить адрес в stderr и работать до SIGINT/SIGTERM."""
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: остановка по Ctrl+C через KeyboardInterrupt
+    server = await service.start(host, port)
+    host, port = server.sockets[0].getsockname()[:2]
+    emit({"command": "serve", "listening": f"http://{host}:{port}"}, sys.stderr)
+    async with server:
+        await stop.wait()
+
+def command_serve(args, timings: dict) -> dict:
+    """Запустить HTTP/JSON-сервис планирования до остановки (Ctrl+C или SIGTERM)."""
+    with timed(timings, "load"):
+        company, journal = load_data_file(args.data, args.company, must_exist=False)
+    service = PlanningService(company, args.strategy, improve_ms=args.improve_ms)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    if args.save:
+        with timed(timings, "save"):
+            save_snapshot(company, Path(args.data).with_suffix(SNAPSHOT_SUFFIX), journal)
+    return {"replans": service.replans, "total_clients": len(company.clients),
+            "total_vehicles": len(company.vehicles)}
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создать разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(
+        description="Транспортная компания. Без аргументов запускается интерактивное меню. "
+                    "Команды выводят результат одной строкой JSON с замерами времени (timings_ms)."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    # Общие параметры всех команд
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data", default="data.json", help="Файл данных (по умолчанию data.json)")
+    common.add_argument("--company", default="Быстрая Доставка", help="Название компании")
+    
+    strategy = argparse.ArgumentParser(add_help=False)
+    strategy.add_argument("--strategy", choices=sorted(STRATEGIES), default=DEFAULT_STRATEGY,
+                          help=f"Стратегия распределения (по умолчанию {DEFAULT_STRATEGY})")
+    strategy.add_argument("--improve-ms", type=float, default=None,
+                          help="Бюджет улучшения плана локальным поиском в мс (по умолчанию без улучшения)")
+    
+    imp = subparsers.add_parser("import", parents=[common], help="Импортировать клиентов из CSV/JSON Lines")
+    imp.add_argument("file", help="Файл с клиентами")
+    imp.add_argument("--format", choices=("csv", "jsonl"),
+                     help="Формат файла (по умолчанию - по расширению)")
+    imp.add_argument("--batch-size", type=int, default=10_000, help="Размер пакета проверки")
+    imp.add_argument("--max-errors", type=int, default=1000, help="Максимум описаний ошибок в отчете")
+    imp.set_defaults(func=command_import)
+    
+    distribute = subparsers.add_parser("distribute", parents=[common, strategy], help="Рассчитать распределение без сохранения (пробный запуск)")
+    distribute.add_argument("--shards", type=int, default=0,
+                            help="Распределить по шардам в отдельных процессах (0 - в одном процессе)")
+    distribute.set_defaults(func=command_distribute)
+    
+    stats = subparsers.add_parser("stats", parents=[common], help="Показать статистику компании")
+    stats.set_defaults(func=command_stats)
+    
+    export = subparsers.add_parser("export", parents=[common, strategy],
+                                   help="Распределить грузы и выгрузить результат")
+    export.add_argument("output", help="Файл результата (- для вывода в stdout)")
+    export.add_argument("--format", choices=EXPORT_FORMATS,
+                        help="Формат выгрузки (по умолчанию - по расширению файла)")
+    export.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE,
+                        help=f"Размер буфера записи в байтах (по умолчанию {DEFAULT_BUFFER_SIZE})")
+    export.set_defaults(func=command_export)
+    
+    srv = subparsers.add_parser("serve", parents=[common, strategy], help="Запустить HTTP/JSON-сервис")
+    srv.add_argument("--host", default="127.0.0.1", help="Адрес (по умолчанию 127.0.0.1)")
+    srv.add_argument("--port", type=int, default=8080, help="Порт (по умолчанию 8080, 0 - любой свободный)")
+    srv.add_argument("--save", action="store_true", help="Сохранить данные в снимок при остановке")
+    srv.set_defaults(func=command_serve)
+    
+    return parser
+
+def run_cli(argv) -> int:
+    """
+    Выполнить команду командной строки.
+    
+    Отчет выводится в stdout (в stderr, если stdout занят выгрузкой),
+    ошибки - в stderr в виде {"command": ..., "error": ...}. При сборе
+    диагностики (TRANSPORT_PROFILE) отчет дополняется полем diagnostics.
+    
+    Returns:
+        Код завершения процесса
+    """
+    args = build_parser().parse_args(argv)
+    stream = sys.stderr if getattr(args, "output", None) == "-" else sys.stdout
+    timings = {}
+    try:
+        with timed(timings, "total"):
+            result = args.func(args, timings)
+    except (OSError, ValueError) as e:
+        emit({"command": args.command, "error": str(e)}, sys.stderr)
+        return 1
+    report = {"command": args.command, **result, "timings_ms": timings}
+    if instrumentation.enabled:
+        report["diagnostics"] = instrumentation.snapshot()
+    emit(report, stream)
+    return 0
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     try:
         main()
     except KeyboardInterrupt:
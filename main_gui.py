@@ -1,106 +1,146 @@
 import sys
-import json
-import csv
 from pathlib import Path
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
-    QPushButton, QTableWidget, QTableWidgetItem, QStatusBar, QDialog,
+    QPushButton, QTableView, QStatusBar, QDialog,
     QFormLayout, QLineEdit, QDoubleSpinBox, QCheckBox, QComboBox, QLabel,
-    QMessageBox, QFileDialog, QHeaderView, QAbstractItemView, QGroupBox
+    QMessageBox, QFileDialog, QHeaderView, QAbstractItemView, QGroupBox,
+    QProgressBar, QTableWidget, QTableWidgetItem, QPlainTextEdit
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction
 
 from transport.client import Client
 from transport.airplane import Airplane
 from transport.van import Van
+from transport.transport_company import TransportCompany as BaseTransportCompany
+from transport.packing import STRATEGIES, DEFAULT_STRATEGY, PackingCancelled, run_strategy
+from transport.persistence import BackgroundWriter, Journal, load_company, resolve_snapshot
+from transport.snapshot import SNAPSHOT_SUFFIX
+from transport.exporter import EXPORT_FORMATS
+from transport import instrumentation
 
 
 # ────────────────────── КОМПАНИЯ С СОХРАНЕНИЕМ И РАСПРЕДЕЛЕНИЕМ ──────────────────────
-class TransportCompany:
+class TransportCompany(BaseTransportCompany):
     DATA_FILE = Path("data.json")
+    COMPACT_EVERY = 500  # записей журнала между полными снимками
 
     def __init__(self, name: str):
-        self.name = name
-        self.vehicles = []
-        self.clients = []
-        self.last_distribution = {}  # vehicle_id → list[Client]
-
-    def add_vehicle(self, vehicle): self.vehicles.append(vehicle)
-    def add_client(self, client): self.clients.append(client)
-
-    def optimize_cargo_distribution(self) -> dict:
-        # Сброс загрузки
-        for v in self.vehicles:
-            v.unload_cargo()
-
-        # Сортировка: VIP → тяжёлые
-        sorted_clients = sorted(self.clients, key=lambda c: (-c.is_vip, -c.cargo_weight))
-
-        assignment = {v.vehicle_id: [] for v in self.vehicles}
-
-        for client in sorted_clients:
-            for vehicle in self.vehicles:
-                if vehicle.load_cargo(client):
-                    assignment[vehicle.vehicle_id].append(client)
-                    break
-
-        self.last_distribution = assignment
-        return assignment
-
-    # Кто куда погружен?
-    def get_client_vehicle_id(self, client) -> str | None:
-        for veh in self.vehicles:
-            if client in veh.clients_list:
-                return veh.vehicle_id
-        return None
+        super().__init__(name)
+        self._journal = None      # появляется после load_from_file / save_to_file
+        self._writer = None       # фоновая запись журнала и снимков
+        self._replaying = False
+
+    @property
+    def journal_file(self) -> Path:
+        return self.DATA_FILE.with_suffix(".journal")
+
+    # Двоичный снимок рядом с data.json; data.json читается, только если снимка нет
+    @property
+    def snapshot_file(self) -> Path:
+        return self.DATA_FILE.with_suffix(SNAPSHOT_SUFFIX)
+
+    # vehicle_id → list[Client]; пусто, пока распределение не выполнялось
+    @property
+    def last_distribution(self) -> dict:
+        if not self.has_plan:
+            return {}
+        return {v.vehicle_id: list(v.clients_list) for v in self.vehicles}
+
+    # ───── ЖУРНАЛ ИЗМЕНЕНИЙ ─────
+    # Изменения копятся в памяти и пакетами дописываются в data.journal
+    # фоновым потоком (flush_changes); полный снимок пишется только при компакции
+    def add_client(self, client):
+        super().add_client(client)
+        self._log("add_client", client=client.to_dict())
+
+    def replace_client(self, old, new):
+        index = self.clients.index(old)
+        vehicle = super().replace_client(old, new)
+        self._log("replace_client", index=index, client=new.to_dict())
+        return vehicle
+
+    def remove_client(self, client):
+        index = self.clients.index(client)
+        super().remove_client(client)
+        self._log("remove_client", index=index)
+
+    def add_vehicle(self, vehicle):
+        super().add_vehicle(vehicle)
+        self._log("add_vehicle", vehicle=vehicle.to_dict())
+
+    def replace_vehicle(self, old, new):
+        index = self.vehicles.index(old)
+        super().replace_vehicle(old, new)
+        self._log("replace_vehicle", index=index, vehicle=new.to_dict())
+
+    def remove_vehicle(self, vehicle):
+        index = self.vehicles.index(vehicle)
+        super().remove_vehicle(vehicle)
+        self._log("remove_vehicle", index=index)
+
+    def _log(self, op, **payload):
+        if self._writer is None or self._replaying:
+            return
+        self._writer.record(op, **payload)
 
-    # ───── СОХРАНЕНИЕ ─────
-    def save_to_file(self):
-        data = {
-            "clients": [c.__dict__ for c in self.clients],
-            "vehicles": []
-        }
-        for v in self.vehicles:
-            base = {
-                "vehicle_id": v.vehicle_id,
-                "capacity": v.capacity,
-                "current_load": v.current_load,
-            }
-            if isinstance(v, Airplane):
-                base.update({"type": "airplane", "max_altitude": v.max_altitude})
-            else:
-                base.update({
-                    "type": "van",
-                    "is_refrigerated": v.is_refrigerated
-                })
-            data["vehicles"].append(base)
+    # Есть изменения, ещё не записанные на диск
+    @property
+    def dirty(self) -> bool:
+        return self._writer is not None and self._writer.dirty
 
+    def flush_changes(self):
+        """Передать накопленные изменения фоновой записи (не блокирует UI)."""
+        if self._writer is None:
+            return
+        if self._writer.error is not None:
+            print(f"Ошибка сохранения: {self._writer.error}")  # следующий flush пишет полный снимок
+        self._writer.flush(self)
+
+    def _ensure_writer(self):
+        if self._journal is None:
+            self._journal = Journal(self.journal_file)
+        if self._writer is None:
+            self._writer = BackgroundWriter(self._journal, self.snapshot_file, self.COMPACT_EVERY)
+        return self._writer
+
+    # ───── СОХРАНЕНИЕ (компакция: снимок + очистка журнала) ─────
+    # Синхронно: дожидается фоновой записи и пишет полный снимок
+    def save_to_file(self):
         try:
-            self.DATA_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            with instrumentation.span("gui.save_to_file"):
+                self._ensure_writer().snapshot(self).result()
         except Exception as e:
             print(f"Ошибка сохранения: {e}")
 
-    # ───── ЗАГРУЗКА ─────
+    def close(self):
+        """Остановить поток записи и закрыть журнал."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._journal is not None:
+            self._journal.close()
+
+    # ───── ЗАГРУЗКА (снимок + повтор журнала) ─────
     def load_from_file(self):
-        if not self.DATA_FILE.exists():
-            return
+        journal = Journal(self.journal_file)
+        self._replaying = True
         try:
-            raw = json.loads(self.DATA_FILE.read_text(encoding="utf-8"))
-            self.clients = [Client(**c) for c in raw.get("clients", [])]
-
-            for v in raw.get("vehicles", []):
-                if v["type"] == "airplane":
-                    plane = Airplane(v["capacity"], v["max_altitude"])
-                else:
-                    plane = Van(v["capacity"], v.get("is_refrigerated", False))
-                plane.vehicle_id = v["vehicle_id"]
-                plane.current_load = v.get("current_load", 0.0)
-                plane.clients_list = []  # будет восстановлено при распределении
-                self.vehicles.append(plane)
+            with instrumentation.span("gui.load_from_file"):
+                load_company(self, resolve_snapshot(self.DATA_FILE), journal)
         except Exception as e:
             QMessageBox.critical(None, "Ошибка", f"Не удалось загрузить данные:\n{e}")
+            return
+        finally:
+            self._replaying = False
+            self._journal = journal
+            self._ensure_writer()
+
+        # Однократное преобразование data.json в двоичный снимок
+        if not self.snapshot_file.exists() and self.DATA_FILE.exists():
+            self.save_to_file()
 
 
 # ────────────────────── СТИЛЬ ──────────────────────
@@ -111,19 +151,255 @@ def apply_modern_dark_style(app):
         QGroupBox::title { subcontrol-origin: margin; left: 15px; padding: 0 10px; background: #1e1e1e; }
         QPushButton { background-color: #007acc; color: white; border: none; padding: 12px 20px; border-radius: 8px; font-weight: bold; font-size: 11pt; }
         QPushButton:hover { background-color: #1488d4; }
-        QTableWidget { background-color: #252526; gridline-color: #444; selection-background-color: #007acc; color: #ddd; border: 1px solid #555; border-radius: 8px; }
+        QTableView { background-color: #252526; gridline-color: #444; selection-background-color: #007acc; color: #ddd; border: 1px solid #555; border-radius: 8px; }
         QHeaderView::section { background-color: #333; padding: 10px; font-weight: bold; color: #88c0ff; border: none; }
         QStatusBar { background-color: #007acc; color: white; font-weight: bold; font-size: 10pt; }
     """)
 
 
+# ────────────────────── МОДЕЛИ ТАБЛИЦ ──────────────────────
+# Данные не копируются: модели читают списки компании и форматируют ячейку
+# только когда представление её рисует. Изменения сообщаются точечными
+# сигналами, поэтому добавление одного клиента не перестраивает таблицу.
+class BatchedTableModel(QAbstractTableModel):
+    """
+    Модель с отложенным обновлением строк.
+
+    Изменённые объекты копятся до flush_changes() и превращаются в строки
+    только тогда: одна пачка изменений — один проход и по сигналу dataChanged
+    на каждый непрерывный участок строк. Вставка и удаление строк (begin/end)
+    остаются немедленными, поэтому хранятся объекты, а не номера строк.
+    """
+    ROW_SCAN_LIMIT = 100_000  # длиннее — обновляется весь диапазон без поиска строк
+    MAX_RANGES = 64
+
+    def __init__(self, company, parent=None):
+        super().__init__(parent)
+        self.company = company
+        self._changed = {}        # id(объекта) → объект
+        self._changed_all = False
+
+    def items(self):
+        raise NotImplementedError
+
+    def mark_changed(self, objects):
+        if not self._changed_all:
+            self._changed.update((id(o), o) for o in objects if o is not None)
+
+    def mark_all_changed(self):
+        self._changed_all = True
+        self._changed.clear()
+
+    def flush_changes(self):
+        items = self.items()
+        if not items or not (self._changed_all or self._changed):
+            self._changed.clear()
+            self._changed_all = False
+            return
+        # Ленивый список клиентов не декодируется ради поиска строк
+        if (self._changed_all or len(items) > self.ROW_SCAN_LIMIT
+                or not getattr(items, "decoded", True)):
+            ranges = [(0, len(items) - 1)]
+        else:
+            changed = self._changed
+            rows = [i for i, o in enumerate(items) if id(o) in changed]
+            ranges = []
+            for row in rows:
+                if ranges and ranges[-1][1] == row - 1:
+                    ranges[-1] = (ranges[-1][0], row)
+                else:
+                    ranges.append((row, row))
+            if len(ranges) > self.MAX_RANGES:
+                ranges = [(ranges[0][0], ranges[-1][1])]
+        self._changed.clear()
+        self._changed_all = False
+        last_col = self.columnCount() - 1
+        for first, last in ranges:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_col))
+
+    def reset(self):
+        self._changed.clear()
+        self._changed_all = False
+        self.beginResetModel()
+        self.endResetModel()
+
+
+class ClientTableModel(BatchedTableModel):
+    HEADERS = ["Имя", "Вес груза", "VIP", "Погружен"]
+    LOADED_COLUMN = 3
+
+    def items(self):
+        return self.company.clients
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.company.clients)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        client = self.company.clients[index.row()]
+        col = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return client.name
+            if col == 1:
+                volume = f" / {client.volume:.1f} м³" if client.volume is not None else ""
+                return f"{client.cargo_weight:.2f} т{volume}"
+            if col == 2:
+                return "Да" if client.is_vip else "Нет"
+            veh_id = self.company.get_client_vehicle_id(client)
+            return f"Да (ID: {veh_id})" if veh_id else "Нет"
+
+        if col == 0 and role == Qt.ItemDataRole.ToolTipRole:
+            needs = []
+            if client.requires_refrigeration:
+                needs.append("нужен холодильник")
+            if client.altitude_limit is not None:
+                needs.append(f"высота до {client.altitude_limit:.0f} м")
+            return "Требования: " + ", ".join(needs) if needs else None
+
+        if col == self.LOADED_COLUMN:
+            if role == Qt.ItemDataRole.ForegroundRole:
+                loaded = self.company.get_client_vehicle_id(client) is not None
+                return Qt.GlobalColor.green if loaded else Qt.GlobalColor.red
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return "ID транспорта, куда загружен клиент"
+        return None
+
+    def add_client(self, client):
+        row = len(self.company.clients)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.company.add_client(client)
+        self.endInsertRows()
+
+    # Методы изменения возвращают затронутые ТС — их строки обновятся при flush_changes()
+    def replace_client(self, row, client):
+        old = self.company.clients[row]
+        touched = [self.company.get_client_vehicle(old)]
+        touched.append(self.company.replace_client(old, client))
+        self.mark_changed([client])
+        return touched
+
+    def remove_client(self, row):
+        client = self.company.clients[row]
+        vehicle = self.company.get_client_vehicle(client)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.company.remove_client(client)
+        self.endRemoveRows()
+        return [vehicle]
+
+
+class VehicleTableModel(BatchedTableModel):
+    HEADERS = ["ID", "Тип", "Вместимость", "Загрузка", "Свободно", "Доп. инфо"]
+
+    def items(self):
+        return self.company.vehicles
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.company.vehicles)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        v = self.company.vehicles[index.row()]
+        col = index.column()
+
+        if col == 0:
+            return v.vehicle_id
+        if col == 1:
+            return "Самолёт" if isinstance(v, Airplane) else "Фургон"
+        if col == 2:
+            return f"{v.capacity:.1f} т"
+        if col == 3:
+            return f"{v.current_load:.1f} т"
+        if col == 4:
+            return f"{v.get_free_capacity():.1f} т"
+        info = f"Высота: {v.max_altitude}m" if isinstance(v, Airplane) else ("Рефрижератор" if v.is_refrigerated else "Обычный")
+        if v.volume_capacity is not None:
+            info += f", объём {v.current_volume:.1f}/{v.volume_capacity:.1f} м³"
+        return info
+
+    def add_vehicle(self, vehicle):
+        row = len(self.company.vehicles)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.company.add_vehicle(vehicle)
+        self.endInsertRows()
+
+    # Методы изменения возвращают клиентов, выгруженных из заменённого/удалённого ТС
+    def replace_vehicle(self, row, vehicle):
+        old = self.company.vehicles[row]
+        unloaded = list(old.clients_list)
+        self.company.replace_vehicle(old, vehicle)
+        self.mark_changed([vehicle])
+        return unloaded
+
+    def remove_vehicle(self, row):
+        vehicle = self.company.vehicles[row]
+        unloaded = list(vehicle.clients_list)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.company.remove_vehicle(vehicle)
+        self.endRemoveRows()
+        return unloaded
+
+
+# ────────────────────── ФОНОВОЕ РАСПРЕДЕЛЕНИЕ ──────────────────────
+STRATEGY_LABELS = {
+    "first_fit": "First Fit (быстро)",
+    "best_fit_decreasing": "Best Fit Decreasing",
+    "worst_fit": "Worst Fit (равномерно)",
+    "exact": "Точный (малые задачи)",
+    "adaptive": "Адаптивный (до доказанного оптимума)",
+}
+
+
+class DistributionWorker(QThread):
+    progress = pyqtSignal(int)
+    planned = pyqtSignal(object)  # результат run_strategy или None при отмене
+
+    def __init__(self, clients, vehicles, strategy=DEFAULT_STRATEGY, parent=None):
+        super().__init__(parent)
+        # Снимки списков: UI может менять компанию, пока идёт расчёт
+        self.clients = list(clients)
+        self.vehicles = list(vehicles)
+        self.strategy = strategy
+
+    def run(self):
+        # Только расчёт плана — ТС не меняются, загрузка применяется в UI-потоке
+        try:
+            plan = run_strategy(
+                self.strategy, self.clients, self.vehicles,
+                progress=self.progress.emit,
+                is_cancelled=self.isInterruptionRequested,
+            )
+        except PackingCancelled:
+            plan = None
+        self.planned.emit(plan)
+
+
 # ────────────────────── ДИАЛОГИ (без изменений) ──────────────────────
 class ClientDialog(QDialog):
     def __init__(self, client=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Новый клиент" if not client else "Редактировать клиента")
         self.setModal(True)
-        self.resize(400, 240)
+        self.resize(400, 320)
 
         layout = QFormLayout(self)
         self.name = QLineEdit(client.name if client else "")
@@ -134,10 +410,26 @@ class ClientDialog(QDialog):
         self.weight.setValue(client.cargo_weight if client else 1.0)
         self.vip = QCheckBox("VIP-клиент")
         self.vip.setChecked(client.is_vip if client else False)
+        # Требования к перевозке; 0 в полях объёма и высоты — «не задано»
+        self.volume = QDoubleSpinBox()
+        self.volume.setRange(0, 99999)
+        self.volume.setSuffix(" м³")
+        self.volume.setSpecialValueText("не указан")
+        self.volume.setValue(client.volume or 0 if client else 0)
+        self.refrigeration = QCheckBox("Нужен холодильник")
+        self.refrigeration.setChecked(client.requires_refrigeration if client else False)
+        self.altitude_limit = QDoubleSpinBox()
+        self.altitude_limit.setRange(0, 50000)
+        self.altitude_limit.setSuffix(" м")
+        self.altitude_limit.setSpecialValueText("без ограничения")
+        self.altitude_limit.setValue(client.altitude_limit or 0 if client else 0)
 
         layout.addRow("Имя клиента:", self.name)
         layout.addRow("Вес груза:", self.weight)
         layout.addRow("", self.vip)
+        layout.addRow("Объём груза:", self.volume)
+        layout.addRow("", self.refrigeration)
+        layout.addRow("Макс. высота перевозки:", self.altitude_limit)
 
         btns = QHBoxLayout()
         save = QPushButton("Сохранить")
@@ -156,7 +448,9 @@ class ClientDialog(QDialog):
             QMessageBox.warning(self, "Ошибка", "Имя: только буквы, минимум 2 символа")
             return None
         try:
-            return Client(name, self.weight.value(), self.vip.isChecked())
+            return Client(name, self.weight.value(), self.vip.isChecked(),
+                          self.volume.value() or None, self.refrigeration.isChecked(),
+                          self.altitude_limit.value() or None)
         except Exception as e:
             QMessageBox.warning(self, "Ошибка", str(e))
             return None
@@ -180,9 +474,15 @@ class VehicleDialog(QDialog):
         self.altitude.setRange(1000, 50000)
         self.altitude.setSuffix(" м")
         self.refrigerated = QCheckBox("Рефрижератор")
+        self.volume_capacity = QDoubleSpinBox()
+        self.volume_capacity.setRange(0, 999999)
+        self.volume_capacity.setSuffix(" м³")
+        self.volume_capacity.setSpecialValueText("не ограничен")
+        self.volume_capacity.setValue(vehicle.volume_capacity or 0 if vehicle else 0)
 
         layout.addRow("Тип транспорта:", self.type)
         layout.addRow("Грузоподъёмность:", self.capacity)
+        layout.addRow("Объём кузова:", self.volume_capacity)
         layout.addRow("Максимальная высота:", self.altitude)
         layout.addRow("Доп. опции:", self.refrigerated)
 
@@ -216,17 +516,105 @@ class VehicleDialog(QDialog):
 
     def get_vehicle(self):
         try:
+            volume_capacity = self.volume_capacity.value() or None
             if self.type.currentText() == "Самолёт":
-                return Airplane(self.capacity.value(), self.altitude.value())
+                return Airplane(self.capacity.value(), self.altitude.value(), volume_capacity)
             else:
-                return Van(self.capacity.value(), self.refrigerated.isChecked())
+                return Van(self.capacity.value(), self.refrigerated.isChecked(), volume_capacity)
         except Exception as e:
             QMessageBox.warning(self, "Ошибка", str(e))
             return None
 
 
+class DiagnosticsDialog(QDialog):
+    """Интервалы, счетчики и профиль из transport.instrumentation."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Диагностика")
+        self.resize(760, 560)
+
+        layout = QVBoxLayout(self)
+        self.enabled = QCheckBox("Собирать интервалы и счётчики")
+        self.enabled.setChecked(instrumentation.enabled)
+        self.enabled.toggled.connect(self.toggle)
+        layout.addWidget(self.enabled)
+
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["Замер", "Вызовы / значение", "Всего, мс", "Среднее, мс", "Максимум, мс"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        # Профиль вызовов и памяти (TRANSPORT_PROFILE=cprofile,tracemalloc)
+        self.details = QPlainTextEdit()
+        self.details.setReadOnly(True)
+        layout.addWidget(self.details)
+
+        btns = QHBoxLayout()
+        refresh = QPushButton("Обновить")
+        reset = QPushButton("Сбросить")
+        export = QPushButton("Экспорт JSON")
+        close = QPushButton("Закрыть")
+        for btn in (refresh, reset, export, close):
+            btns.addWidget(btn)
+        layout.addLayout(btns)
+
+        refresh.clicked.connect(self.refresh)
+        reset.clicked.connect(self.reset)
+        export.clicked.connect(self.export_json)
+        close.clicked.connect(self.accept)
+        self.refresh()
+
+    def toggle(self, checked):
+        if checked:
+            instrumentation.enable()
+        else:
+            instrumentation.disable()
+
+    def refresh(self):
+        report = instrumentation.snapshot()
+        rows = [(name, str(s["calls"]), f"{s['total_ms']:.2f}", f"{s['mean_ms']:.3f}", f"{s['max_ms']:.2f}")
+                for name, s in report["spans"].items()]
+        rows += [(name, f"{value:,}".replace(",", " "), "", "", "") for name, value in report["counters"].items()]
+        if "vehicles_scanned_per_client" in report:
+            rows.append(("ТС просмотрено на клиента", f"{report['vehicles_scanned_per_client']:.2f}", "", "", ""))
+
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, text in enumerate(row):
+                self.table.setItem(r, c, QTableWidgetItem(text))
+
+        lines = []
+        if "profile" in report:
+            lines.append("Функции по суммарному времени (мс, с вложенными вызовами):")
+            lines += [f"{p['cumulative_ms']:10.2f} {p['calls']:>9}  {p['function']}" for p in report["profile"]]
+        if "memory" in report:
+            memory = report["memory"]
+            lines.append(f"Память: сейчас {memory['current_bytes'] / 1024:.0f} КБ, пик {memory['peak_bytes'] / 1024:.0f} КБ")
+            lines += [f"{m['size_bytes'] / 1024:10.0f} КБ  {m['line']}" for m in memory["top"]]
+        if not lines:
+            lines.append("Профиль не собирается: запустите с TRANSPORT_PROFILE=cprofile,tracemalloc")
+        self.details.setPlainText("\n".join(lines))
+
+    def reset(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Экспорт диагностики", "диагностика.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            instrumentation.export_json(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить:\n{e}")
+
+
 # ────────────────────── ГЛАВНОЕ ОКНО ──────────────────────
 class MainWindow(QMainWindow):
+    CHANGE_BATCH_MS = 150  # окно, в котором изменения собираются в одну пачку
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Besanets Corporation")
@@ -234,9 +622,17 @@ class MainWindow(QMainWindow):
 
         self.company = TransportCompany("Besanets Corporation")
         self.company.load_from_file()
+        self.replans_seen = self.company.replans
 
         QApplication.instance().aboutToQuit.connect(self.on_close)
 
+        # Конвейер изменений: первое изменение запускает таймер, всё, что
+        # пришло до его срабатывания, обновляет таблицы и пишется на диск разом
+        self.change_timer = QTimer(self)
+        self.change_timer.setSingleShot(True)
+        self.change_timer.setInterval(self.CHANGE_BATCH_MS)
+        self.change_timer.timeout.connect(self.flush_changes)
+
         self.setup_ui()
         self.refresh_tables()
         self.status.showMessage(f"Загружено: {len(self.company.clients)} клиентов • {len(self.company.vehicles)} ТС")
@@ -260,6 +656,14 @@ class MainWindow(QMainWindow):
             b.setMinimumHeight(44)
             b.clicked.connect(func)
             btns.addWidget(b)
+
+        # Стратегия распределения: скорость против минимального числа ТС
+        btns.addWidget(QLabel("Стратегия:"))
+        self.strategy_box = QComboBox()
+        for name in STRATEGIES:
+            self.strategy_box.addItem(STRATEGY_LABELS.get(name, name), name)
+        self.strategy_box.setCurrentIndex(self.strategy_box.findData(DEFAULT_STRATEGY))
+        btns.addWidget(self.strategy_box)
         layout.addLayout(btns)
 
         # Таблицы
@@ -269,8 +673,9 @@ class MainWindow(QMainWindow):
         # Клиенты — теперь 4 колонки!
         client_group = QGroupBox("Клиенты")
         cl = QVBoxLayout(client_group)
-        self.client_table = QTableWidget(0, 4)
-        self.client_table.setHorizontalHeaderLabels(["Имя", "Вес груза", "VIP", "Погружен"])
+        self.client_model = ClientTableModel(self.company, self)
+        self.client_table = QTableView()
+        self.client_table.setModel(self.client_model)
         self.client_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.client_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.client_table.doubleClicked.connect(self.edit_client)
@@ -280,8 +685,9 @@ class MainWindow(QMainWindow):
         # Транспорт
         vehicle_group = QGroupBox("Транспортные средства")
         vl = QVBoxLayout(vehicle_group)
-        self.vehicle_table = QTableWidget(0, 6)
-        self.vehicle_table.setHorizontalHeaderLabels(["ID", "Тип", "Вместимость", "Загрузка", "Свободно", "Доп. инфо"])
+        self.vehicle_model = VehicleTableModel(self.company, self)
+        self.vehicle_table = QTableView()
+        self.vehicle_table.setModel(self.vehicle_model)
         self.vehicle_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.vehicle_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.vehicle_table.doubleClicked.connect(self.edit_vehicle)
@@ -301,41 +707,50 @@ class MainWindow(QMainWindow):
         about_act = QAction("О программе", self)
         about_act.triggered.connect(self.show_about)
         help_menu.addAction(about_act)
+        diagnostics_act = QAction("Диагностика", self)
+        diagnostics_act.triggered.connect(self.show_diagnostics)
+        help_menu.addAction(diagnostics_act)
 
         self.status = QStatusBar()
         self.setStatusBar(self.status)
 
-    def refresh_tables(self):
-        # Клиенты
-        self.client_table.setRowCount(0)
-        for client in self.company.clients:
-            row = self.client_table.rowCount()
-            self.client_table.insertRow(row)
-            self.client_table.setItem(row, 0, QTableWidgetItem(client.name))
-            self.client_table.setItem(row, 1, QTableWidgetItem(f"{client.cargo_weight:.2f} т"))
-            self.client_table.setItem(row, 2, QTableWidgetItem("Да" if client.is_vip else "Нет"))
-
-            # ← НОВАЯ КОЛОНКА: Погружен?
-            veh_id = self.company.get_client_vehicle_id(client)
-            status = f"Да (ID: {veh_id})" if veh_id else "Нет"
-            item = QTableWidgetItem(status)
-            item.setForeground(Qt.GlobalColor.green if veh_id else Qt.GlobalColor.red)
-            item.setToolTip("ID транспорта, куда загружен клиент")
-            self.client_table.setItem(row, 3, item)
+        # Индикатор фонового распределения
+        self.worker = None
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(220)
+        self.progress_bar.setRange(0, 100)
+        self.cancel_btn = QPushButton("Отмена")
+        self.cancel_btn.clicked.connect(self.cancel_distribution)
+        self.status.addPermanentWidget(self.progress_bar)
+        self.status.addPermanentWidget(self.cancel_btn)
+        self.progress_bar.hide()
+        self.cancel_btn.hide()
 
-        # Транспорт
-        self.vehicle_table.setRowCount(0)
-        for v in self.company.vehicles:
-            row = self.vehicle_table.rowCount()
-            self.vehicle_table.insertRow(row)
-            typ = "Самолёт" if isinstance(v, Airplane) else "Фургон"
-            extra = f"Высота: {v.max_altitude}m" if isinstance(v, Airplane) else ("Рефрижератор" if v.is_refrigerated else "Обычный")
-            self.vehicle_table.setItem(row, 0, QTableWidgetItem(v.vehicle_id))
-            self.vehicle_table.setItem(row, 1, QTableWidgetItem(typ))
-            self.vehicle_table.setItem(row, 2, QTableWidgetItem(f"{v.capacity:.1f} т"))
-            self.vehicle_table.setItem(row, 3, QTableWidgetItem(f"{v.current_load:.1f} т"))
-            self.vehicle_table.setItem(row, 4, QTableWidgetItem(f"{v.get_free_capacity():.1f} т"))
-            self.vehicle_table.setItem(row, 5, QTableWidgetItem(extra))
+    def refresh_tables(self):
+        # Полная перерисовка нужна только после загрузки данных целиком
+        with instrumentation.span("gui.refresh_tables"):
+            self.client_model.reset()
+            self.vehicle_model.reset()
+
+    def changed(self, clients=(), vehicles=()):
+        """Отметить затронутые объекты; таблицы и файл обновятся в flush_changes()."""
+        if self.company.replans != self.replans_seen:
+            # Инкрементальная операция перешла к полной оптимизации (VIP или
+            # replan_threshold) - изменилась загрузка всех ТС и клиентов
+            self.replans_seen = self.company.replans
+            self.client_model.mark_all_changed()
+            self.vehicle_model.mark_all_changed()
+        self.client_model.mark_changed(clients)
+        self.vehicle_model.mark_changed(vehicles)
+        if not self.change_timer.isActive():
+            self.change_timer.start()
+
+    def flush_changes(self):
+        self.change_timer.stop()
+        with instrumentation.span("gui.flush_changes"):
+            self.client_model.flush_changes()
+            self.vehicle_model.flush_changes()
+            self.company.flush_changes()
 
     def distribute_cargo(self):
         if not self.company.vehicles:
@@ -344,19 +759,51 @@ class MainWindow(QMainWindow):
         if not self.company.clients:
             QMessageBox.information(self, "Инфо", "Нет клиентов для распределения")
             return
+        if self.worker is not None:
+            self.status.showMessage("Распределение уже выполняется…")
+            return
+
+        self.worker = DistributionWorker(self.company.clients, self.company.vehicles,
+                                         self.strategy_box.currentData(), self)
+        self.worker.progress.connect(self.progress_bar.setValue)
+        self.worker.planned.connect(self.on_distribution_planned)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.cancel_btn.show()
+        self.status.showMessage("Распределение груза…")
+        self.worker.start()
+
+    def cancel_distribution(self):
+        if self.worker is not None:
+            self.worker.requestInterruption()
+
+    def on_distribution_planned(self, plan):
+        self.worker = None
+        self.progress_bar.hide()
+        self.cancel_btn.hide()
+        if plan is None:
+            self.status.showMessage("Распределение отменено")
+            return
 
-        result = self.company.optimize_cargo_distribution()
-        loaded = sum(len(clients) for clients in result.values())
+        result = self.company.apply_plan(plan)
+        loaded = len(result["successful"])
         text = f"<h3>Распределение завершено</h3>"
-        text += f"<p>Загружено клиентов: <b>{loaded}</b> из {len(self.company.clients)}</p><ul>"
-        for vid, clients in result.items():
+        text += f"<p>Загружено клиентов: <b>{loaded}</b> из {len(self.company.clients)}<br>"
+        text += f"Использовано ТС: <b>{result['vehicles_used']}</b> • {result['elapsed_ms']:.1f} мс<br>"
+        text += (f"Нижняя граница: {result['lower_bound']} ТС • "
+                 f"разрыв {result['optimality_gap'] * 100:.1f}%</p><ul>")
+        for vid, clients in self.company.last_distribution.items():
             if clients:
                 w = sum(c.cargo_weight for c in clients)
                 text += f"<li><b>{vid}</b> → {len(clients)} чел., {w:.2f} т</li>"
         text += "</ul>"
 
         QMessageBox.information(self, "Готово!", text)
-        self.refresh_tables()
+        # План меняет загрузку всех ТС и колонку «Погружен» у всех клиентов
+        self.client_model.mark_all_changed()
+        self.vehicle_model.mark_all_changed()
+        self.changed()
         self.status.showMessage(f"Распределено {loaded} клиентов")
 
     def export_distribution(self):
@@ -366,83 +813,61 @@ class MainWindow(QMainWindow):
 
         path, _ = QFileDialog.getSaveFileName(
             self, "Экспорт распределения", "распределение",
-            "JSON (*.json);;CSV (*.csv);;Текст (*.txt)"
+            "JSON (*.json);;JSON Lines (*.jsonl);;CSV (*.csv);;Текст (*.txt)"
         )
         if not path:
             return
 
-        result = self.company.last_distribution
         try:
-            if path.endswith(".json"):
-                data = {vid: [c.__dict__ for c in clients] for vid, clients in result.items()}
-                with open(path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-
-            elif path.endswith(".csv"):
-                with open(path, "w", newline="", encoding="utf-8") as f:
-                    w = csv.writer(f)
-                    w.writerow(["ТС ID", "Имя клиента", "Вес", "VIP"])
-                    for vid, clients in result.items():
-                        for c in clients:
-                            w.writerow([vid, c.name, c.cargo_weight, "Да" if c.is_vip else "Нет"])
-
-            else:  # txt
-                with open(path, "w", encoding="utf-8") as f:
-                    for vid, clients in result.items():
-                        if clients:
-                            f.write(f"{vid}:\n")
-                            for c in clients:
-                                f.write(f"  • {c.name} — {c.cargo_weight}т (VIP: {c.is_vip})\n")
-                            f.write("\n")
-
+            fmt = Path(path).suffix.lstrip(".").lower()
+            self.company.export_distribution(path, fmt if fmt in EXPORT_FORMATS else "txt")
             self.status.showMessage(f"Экспортировано → {Path(path).name}")
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить:\n{e}")
 
     def add_client(self): self._open_client_dialog()
     def edit_client(self):
-        r = self.client_table.currentRow()
+        r = self.client_table.currentIndex().row()
         if r >= 0: self._open_client_dialog(self.company.clients[r])
 
     def _open_client_dialog(self, client=None):
         dlg = ClientDialog(client, self)
         if dlg.exec() == QDialog.DialogCode.Accepted and (c := dlg.get_client()):
             if client:
-                idx = self.company.clients.index(client)
-                self.company.clients[idx] = c
+                touched = self.client_model.replace_client(self.company.clients.index(client), c)
+                self.changed(vehicles=touched)
             else:
-                self.company.clients.append(c)
-            self.refresh_tables()
-            self.company.save_to_file()
+                self.client_model.add_client(c)
+                # После первого распределения новые клиенты размещаются инкрементально
+                vehicle = self.company.place_client(c) if self.company.has_plan else None
+                self.changed([c], [vehicle])
 
     def add_vehicle(self): self._open_vehicle_dialog()
     def edit_vehicle(self):
-        r = self.vehicle_table.currentRow()
+        r = self.vehicle_table.currentIndex().row()
         if r >= 0: self._open_vehicle_dialog(self.company.vehicles[r])
 
     def _open_vehicle_dialog(self, vehicle=None):
         dlg = VehicleDialog(vehicle, self)
         if dlg.exec() == QDialog.DialogCode.Accepted and (v := dlg.get_vehicle()):
             if vehicle:
-                idx = self.company.vehicles.index(vehicle)
-                self.company.vehicles[idx] = v
+                # Старое ТС разгружается — у его клиентов меняется колонка «Погружен»
+                unloaded = self.vehicle_model.replace_vehicle(self.company.vehicles.index(vehicle), v)
+                self.changed(clients=unloaded)
             else:
-                self.company.vehicles.append(v)
-            self.refresh_tables()
-            self.company.save_to_file()
+                self.vehicle_model.add_vehicle(v)
+                self.changed()
 
     def delete_selected(self):
         changed = False
-        if (r := self.client_table.currentRow()) >= 0:
-            del self.company.clients[r]
+        if (r := self.client_table.currentIndex().row()) >= 0:
+            self.changed(vehicles=self.client_model.remove_client(r))
             changed = True
-        if (r := self.vehicle_table.currentRow()) >= 0:
-            del self.company.vehicles[r]
+        if (r := self.vehicle_table.currentIndex().row()) >= 0:
+            self.changed(clients=self.vehicle_model.remove_vehicle(r))
             changed = True
         if changed:
-            self.refresh_tables()
-            self.company.save_to_file()
-            self.status.showMessage("Удалено и сохранено")
+            self.status.showMessage("Удалено")
 
     def show_about(self):
         QMessageBox.about(self, "О программе",
@@ -451,8 +876,17 @@ class MainWindow(QMainWindow):
                           "Вариант 4<br>"
                           "Разработчик: Lesha Besanets & Grok 4.1 Beta</p>")
 
+    def show_diagnostics(self):
+        DiagnosticsDialog(self).exec()
+
     def on_close(self):
+        if self.worker is not None:
+            self.worker.requestInterruption()
+            self.worker.wait()
+        # Синхронно: отложенные изменения и фоновая запись сводятся в полный снимок
+        self.change_timer.stop()
         self.company.save_to_file()
+        self.company.close()
 
 
 if __name__ == "__main__":
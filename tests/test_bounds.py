@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from transport import Client, Van
+from transport.bounds import lower_bound, lower_bound_l1, lower_bound_l2, plan_bounds
+
+
+def _optimum(weights, capacities):
+    """Наименьшее число ТС, вмещающих все грузы (полный перебор), или None."""
+    weights = sorted(weights, reverse=True)
+    loads = [0.0] * len(capacities)
+    best = [None]
+
+    def search(i: int, used: int) -> None:
+        if best[0] is not None and used >= best[0]:
+            return
+        if i == len(weights):
+            best[0] = used
+            return
+        for j, capacity in enumerate(capacities):
+            if loads[j] + weights[i] <= capacity + 1e-9:
+                opened = loads[j] == 0.0
+                loads[j] += weights[i]
+                search(i + 1, used + opened)
+                loads[j] = 0.0 if opened else loads[j] - weights[i]
+
+    search(0, 0)
+    return best[0]
+
+
+@pytest.mark.parametrize("integer", [True, False])
+def test_bounds_do_not_exceed_brute_force_optimum(integer):
+    rng = random.Random(23)
+    checked = tight = 0
+    for _ in range(300):
+        capacities = [rng.randint(4, 12) for _ in range(rng.randint(1, 5))]
+        if rng.random() < 0.4:
+            # Одинаковая грузоподъемность: классический случай L1/L2
+            capacities = [capacities[0]] * len(capacities)
+        weights = [rng.randint(1, 10) if integer else round(rng.uniform(0.1, 10), 2)
+                   for _ in range(rng.randint(0, 7))]
+        optimum = _optimum(weights, capacities)
+        if optimum is None:
+            continue
+        l1, l2 = lower_bound_l1(weights, capacities), lower_bound_l2(weights, capacities)
+        assert l1 <= optimum and l2 <= optimum, (weights, capacities)
+        assert lower_bound(weights, capacities) == max(l1, l2)
+        checked += 1
+        tight += max(l1, l2) == optimum
+    assert checked > 100 and tight > checked // 2
+
+
+def test_l2_is_stronger_than_l1_on_large_items():
+    # Каждый груз тяжелее половины: нужен отдельный транспорт, хотя по весу хватит двух
+    weights, capacities = [6, 6, 6], [10, 10, 10]
+    assert lower_bound_l1(weights, capacities) == 2
+    assert lower_bound_l2(weights, capacities) == 3 == _optimum(weights, capacities)
+
+
+def test_float_sums_do_not_inflate_bound():
+    assert lower_bound([0.1, 0.1, 0.1], [0.3]) == 1
+
+
+def test_plan_bounds_gap():
+    vehicles = [Van(10), Van(10), Van(10)]
+    placements = [(Client(f"Клиент {i}", 6), vehicles[i]) for i in range(3)]
+    assert plan_bounds(placements, vehicles, 3) == {"lower_bound": 3, "optimality_gap": 0.0}
+    assert plan_bounds(placements[:1], vehicles, 2)["optimality_gap"] == 1.0
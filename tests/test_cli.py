@@ -0,0 +1,34 @@
+import json
+
+from main import run_cli
+from transport import Client, Van
+
+
+def _write_data(tmp_path):
+    data = {
+        "clients": [Client(f"Клиент {i}", 1.0 + i % 5, i % 3 == 0).to_dict() for i in range(40)],
+        "vehicles": [Van(capacity, vehicle_id=f"v{i}").to_dict() for i, capacity in enumerate((12, 20, 9, 15))],
+    }
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _files(tmp_path) -> dict:
+    return {p.name: p.read_bytes() for p in tmp_path.iterdir()}
+
+
+def test_distribute_is_a_dry_run_and_export_matches_it(tmp_path, capsys):
+    path = _write_data(tmp_path)
+    before = _files(tmp_path)
+    assert run_cli(["distribute", "--data", str(path), "--strategy", "worst_fit"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["successful"] > 0 and report["failed"] > 0
+    assert _files(tmp_path) == before
+
+    output = tmp_path / "распределение.jsonl"
+    assert run_cli(["export", str(output), "--data", str(path), "--strategy", "worst_fit"]) == 0
+    exported = json.loads(capsys.readouterr().out)
+    assert exported["exported"] == report["successful"]
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert len({row["vehicle_id"] for row in rows}) == report["vehicles_used"]
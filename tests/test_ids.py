@@ -0,0 +1,79 @@
+import json
+import warnings
+
+import pytest
+
+from transport import CounterAllocator, SQLiteStorage, TransportCompany, Van, use_allocator
+from transport.ids import IdAllocator, SeededAllocator
+from transport.persistence import Journal, load_company
+
+
+def _load(tmp_path, path) -> TransportCompany:
+    company = TransportCompany("Тест")
+    load_company(company, path, Journal(tmp_path / "data.journal"))
+    return company
+
+
+def test_allocator_is_abstract():
+    with pytest.raises(TypeError):
+        IdAllocator()
+
+
+def test_allocate_skips_taken_ids():
+    first = SeededAllocator(1).allocate()
+    assert SeededAllocator(1).allocate({first}) != first
+    allocator = CounterAllocator()
+    assert allocator.allocate({"00000001", "00000002"}) == "00000003"
+
+
+def test_company_reassigns_duplicate_ids_and_releases_removed():
+    company = TransportCompany("Тест")
+    first, second = Van(10, vehicle_id="dup"), Van(5, vehicle_id="dup")
+    company.add_vehicle(first)
+    company.add_vehicle(second)
+    assert first.vehicle_id == "dup" and second.vehicle_id != "dup"
+    assert company.id_collisions == 1
+
+    company.remove_vehicle(first)
+    company.add_vehicle(Van(8, vehicle_id="dup"))
+    assert company.id_collisions == 1
+
+
+def test_counter_ids_do_not_collide_with_loaded_ones():
+    company = TransportCompany("Тест")
+    company.add_vehicle(Van(10, vehicle_id="00000001"))
+    with use_allocator(CounterAllocator()):
+        van = Van(5)
+        company.add_vehicle(van)
+    assert van.vehicle_id == "00000002"
+
+
+def test_reloading_keeps_ids_without_warnings(tmp_path):
+    vehicles = [{"type": "van", "vehicle_id": vehicle_id, "capacity": 10.0, "current_load": 0.0}
+                for vehicle_id in ("a1", "b2")]
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"vehicles": vehicles, "clients": []}), encoding="utf-8")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        first, second = _load(tmp_path, path), _load(tmp_path, path)
+    assert [v.vehicle_id for v in first.vehicles] == ["a1", "b2"]
+    assert [v.vehicle_id for v in second.vehicles] == ["a1", "b2"]
+
+
+def test_json_and_sqlite_handle_duplicates_the_same_way(tmp_path):
+    vehicle = {"type": "van", "vehicle_id": "dup", "capacity": 10.0, "current_load": 0.0}
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"vehicles": [vehicle, vehicle], "clients": []}), encoding="utf-8")
+    with pytest.warns(UserWarning, match="повторяющихся ID"):
+        company = _load(tmp_path, path)
+    ids = [v.vehicle_id for v in company.vehicles]
+    assert ids[0] == "dup" and len(set(ids)) == 2
+
+    # Уникальные ID сохраняются в SQLite (vehicle_id - первичный ключ)
+    storage = company.to_sqlite()
+    assert storage.get_vehicle_ids() == ids
+    # Загрузка в компанию, где ID уже заняты, дает новые ID с тем же предупреждением
+    with pytest.warns(UserWarning, match="повторяющихся ID"):
+        storage.load_company(company)
+    assert len({v.vehicle_id for v in company.vehicles}) == 4
+    storage.close()
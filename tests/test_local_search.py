@@ -0,0 +1,85 @@
+import random
+import time
+
+import pytest
+
+from transport import Airplane, Client, Van
+from transport.local_search import improve
+from transport.packing import STRATEGIES, run_strategy
+from transport.vehicle import fits
+
+
+def _instance(rng: random.Random, clients: int, vehicles: int):
+    """Случайная задача с запасом места, чтобы локальному поиску было что освобождать."""
+    fleet = []
+    for _ in range(vehicles):
+        volume_capacity = rng.choice([None, rng.randint(10, 40)])
+        if rng.random() < 0.3:
+            fleet.append(Airplane(rng.randint(5, 30), rng.choice([9000, 11000]), volume_capacity))
+        else:
+            fleet.append(Van(rng.randint(5, 30), rng.random() < 0.4, volume_capacity))
+    items = [
+        Client(f"Клиент {i}", rng.choice([rng.randint(1, 8), rng.uniform(0.1, 8)]), rng.random() < 0.3,
+               rng.choice([None, rng.uniform(0.5, 5)]), rng.random() < 0.2,
+               rng.choice([None, None, 10000]))
+        for i in range(clients)
+    ]
+    return items, fleet
+
+
+def _used(placements) -> int:
+    return len({id(v) for _, v in placements})
+
+
+def _check_feasible(placements):
+    loads, volumes = {}, {}
+    for client, vehicle in placements:
+        assert vehicle.accepts(client)
+        assert fits(loads.get(vehicle, 0.0), client.cargo_weight, vehicle.capacity)
+        loads[vehicle] = loads.get(vehicle, 0.0) + client.cargo_weight
+        if vehicle.volume_capacity is not None:
+            assert fits(volumes.get(vehicle, 0.0), client.volume or 0.0, vehicle.volume_capacity)
+            volumes[vehicle] = volumes.get(vehicle, 0.0) + (client.volume or 0.0)
+
+
+# Точный перебор на таких размерах слишком долог, а эвристики дают разные исходные планы
+@pytest.mark.parametrize("strategy", sorted(s for s in STRATEGIES if s not in ("exact", "adaptive")))
+def test_improve_keeps_clients_and_never_adds_vehicles(strategy):
+    rng = random.Random(17)
+    saved = 0
+    for _ in range(25):
+        clients, vehicles = _instance(rng, rng.randint(5, 60), rng.randint(3, 25))
+        placements = run_strategy(strategy, clients, vehicles)["placements"]
+        improved, stats = improve(placements, vehicles, budget_ms=1000)
+        assert sorted(id(c) for c, _ in improved) == sorted(id(c) for c, _ in placements)
+        assert _used(improved) == _used(placements) - stats["vehicles_saved"]
+        assert _used(improved) <= _used(placements)
+        _check_feasible(improved)
+        saved += stats["vehicles_saved"]
+    # Проверка не пустая: на этих задачах поиск действительно освобождает транспорт
+    assert saved > 0
+
+
+def test_zero_budget_leaves_plan_unchanged():
+    clients, vehicles = _instance(random.Random(2), 200, 80)
+    placements = run_strategy("worst_fit", clients, vehicles)["placements"]
+    improved, stats = improve(placements, vehicles, budget_ms=0)
+    assert stats["vehicles_saved"] == 0 and stats["moves"] == 0 and stats["swaps"] == 0
+    assert sorted((id(c), id(v)) for c, v in improved) == sorted((id(c), id(v)) for c, v in placements)
+
+
+def test_time_budget_is_respected():
+    rng = random.Random(1)
+    vehicles = [Van(rng.randint(5, 30), rng.random() < 0.4, rng.choice([None, rng.randint(10, 40)]))
+                for _ in range(800)]
+    clients = [Client(f"Клиент {i}", rng.randint(1, 8), False, rng.choice([None, rng.randint(1, 5)]),
+                      rng.random() < 0.2) for i in range(2000)]
+    placements = run_strategy("worst_fit", clients, vehicles)["placements"]
+    budget_ms = 20.0
+    start = time.perf_counter()
+    improved, stats = improve(placements, vehicles, budget_ms=budget_ms)
+    wall_ms = (time.perf_counter() - start) * 1000
+    # Запас покрывает построение индекса плана и один ход после проверки срока
+    assert stats["elapsed_ms"] <= wall_ms < budget_ms + 30
+    assert stats["budget_ms"] == budget_ms
+    _check_feasible(improved)
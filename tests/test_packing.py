@@ -0,0 +1,118 @@
+import random
+from itertools import product
+
+import pytest
+
+from transport import Airplane, Client, Van
+from transport.packing import STRATEGIES, PackingCancelled, run_strategy
+
+
+def _instance(rng: random.Random, clients: int, vehicles: int):
+    """Случайная небольшая задача с целыми весами (суммы float точны)."""
+    fleet = []
+    for _ in range(vehicles):
+        volume_capacity = rng.choice([None, rng.randint(4, 12)])
+        if rng.random() < 0.3:
+            fleet.append(Airplane(rng.randint(4, 14), rng.choice([9000, 11000]), volume_capacity))
+        else:
+            fleet.append(Van(rng.randint(3, 12), rng.random() < 0.4, volume_capacity))
+    items = [
+        Client(f"Клиент {i}", rng.randint(1, 8), rng.random() < 0.3,
+               rng.choice([None, rng.randint(1, 5)]), rng.random() < 0.2,
+               rng.choice([None, None, 10000]))
+        for i in range(clients)
+    ]
+    return items, fleet
+
+
+def _score(placements):
+    used = len({id(v) for _, v in placements})
+    return sum(c.is_vip for c, _ in placements), sum(c.cargo_weight for c, _ in placements), -used
+
+
+def _brute_force(clients, vehicles):
+    """Лучшая оценка полным перебором: каждый груз - в один из ТС или не размещен."""
+    best = None
+    for choice in product(range(-1, len(vehicles)), repeat=len(clients)):
+        loads = [0.0] * len(vehicles)
+        volumes = [0.0] * len(vehicles)
+        placements = []
+        for client, j in zip(clients, choice):
+            if j < 0:
+                continue
+            vehicle = vehicles[j]
+            loads[j] += client.cargo_weight
+            volumes[j] += client.volume or 0.0
+            if (not vehicle.accepts(client) or loads[j] > vehicle.capacity
+                    or (vehicle.volume_capacity is not None and volumes[j] > vehicle.volume_capacity)):
+                break
+            placements.append((client, vehicle))
+        else:
+            score = _score(placements)
+            if best is None or score > best:
+                best = score
+    return best
+
+
+def _check_feasible(placements, vehicles):
+    loads = {id(v): 0.0 for v in vehicles}
+    for client, vehicle in placements:
+        assert vehicle.accepts(client)
+        loads[id(vehicle)] += client.cargo_weight
+    for vehicle in vehicles:
+        assert loads[id(vehicle)] <= vehicle.capacity
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_strategy_partitions_clients_and_respects_constraints(strategy):
+    rng = random.Random(7)
+    for _ in range(30):
+        clients, vehicles = _instance(rng, rng.randint(0, 12), rng.randint(0, 5))
+        run = run_strategy(strategy, clients, vehicles)
+        placed = [c for c, _ in run["placements"]]
+        assert sorted(map(id, placed + run["failed"])) == sorted(map(id, clients))
+        _check_feasible(run["placements"], vehicles)
+
+
+def test_strategies_place_the_same_clients_when_fleet_has_room():
+    rng = random.Random(3)
+    for _ in range(20):
+        clients = [Client(f"Клиент {i}", rng.randint(1, 5), rng.random() < 0.3) for i in range(10)]
+        vehicles = [Van(40), Van(25), Airplane(60, 10000)]
+        expected = sorted(map(id, clients))
+        for strategy in STRATEGIES:
+            run = run_strategy(strategy, clients, vehicles)
+            assert sorted(id(c) for c, _ in run["placements"]) == expected, strategy
+            assert not run["failed"]
+
+
+def test_exact_matches_brute_force():
+    rng = random.Random(11)
+    for _ in range(40):
+        clients, vehicles = _instance(rng, rng.randint(1, 6), rng.randint(1, 3))
+        optimum = _brute_force(clients, vehicles)
+        exact = run_strategy("exact", clients, vehicles)
+        assert _score(exact["placements"]) == optimum
+        # Адаптивная стратегия доходит до точного перебора, если план не доказан оптимальным
+        assert _score(run_strategy("adaptive", clients, vehicles)["placements"]) == optimum
+        for strategy in STRATEGIES:
+            assert _score(run_strategy(strategy, clients, vehicles)["placements"]) <= optimum
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_cancellation_raises(strategy):
+    clients, vehicles = _instance(random.Random(5), 200, 10)
+    calls = []
+
+    def is_cancelled():
+        calls.append(None)
+        return len(calls) > 3
+
+    with pytest.raises(PackingCancelled):
+        run_strategy(strategy, clients, vehicles, is_cancelled=is_cancelled)
+    assert len(calls) == 4
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError, match="Неизвестная стратегия"):
+        run_strategy("no_such_strategy", [], [])
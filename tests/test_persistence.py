@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from transport import Client, TransportCompany, Van
+from transport.persistence import Journal, company_to_dict, load_company, save_snapshot
+
+
+def _load(tmp_path, snapshot_name: str = "data.json"):
+    company = TransportCompany("Тест")
+    journal = Journal(tmp_path / "data.journal")
+    applied = load_company(company, tmp_path / snapshot_name, journal)
+    return company, journal, applied
+
+
+def _client(name: str, weight: float) -> dict:
+    return Client(name, weight).to_dict()
+
+
+def test_torn_final_record_is_dropped_and_truncated(tmp_path):
+    journal = Journal(tmp_path / "data.journal")
+    journal.append("add_client", client=_client("Иван", 1.0))
+    journal.append("add_client", client=_client("Анна", 2.0))
+    journal.close()
+    valid = journal.path.read_bytes()
+    # Сбой посреди записи третьей строки
+    journal.path.write_bytes(valid + b'{"seq": 3, "op": "add_cli')
+
+    company, journal, applied = _load(tmp_path)
+    assert applied == 2
+    assert [c.name for c in company.clients] == ["Иван", "Анна"]
+    assert journal.path.read_bytes() == valid
+
+    # Новые записи продолжают нумерацию после последней целой записи
+    journal.append("add_client", client=_client("Петр", 3.0))
+    journal.close()
+    company, _, applied = _load(tmp_path)
+    assert applied == 3
+    assert [c.name for c in company.clients] == ["Иван", "Анна", "Петр"]
+
+
+def test_unterminated_last_line_counts_as_torn(tmp_path):
+    journal = Journal(tmp_path / "data.journal")
+    journal.append("add_client", client=_client("Иван", 1.0))
+    journal.close()
+    record = json.dumps({"seq": 2, "op": "add_client", "client": _client("Анна", 2.0)})
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write(record)  # без перевода строки: запись могла быть неполной
+
+    company, _, applied = _load(tmp_path)
+    assert applied == 1
+    assert [c.name for c in company.clients] == ["Иван"]
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_crash_between_snapshot_and_truncate_skips_applied_records(tmp_path, monkeypatch, binary):
+    company = TransportCompany("Тест")
+    journal = Journal(tmp_path / "data.journal")
+    for name, weight in (("Иван", 1.0), ("Анна", 2.0)):
+        company.add_client(Client(name, weight))
+        journal.append("add_client", client=_client(name, weight))
+
+    # Снимок записан, а очистить журнал процесс не успел
+    monkeypatch.setattr(Journal, "truncate", lambda self: self.close())
+    if binary:
+        save_snapshot(company, tmp_path / "data.snap", journal)
+    else:
+        journal.compact(tmp_path / "data.json", company_to_dict(company))
+    monkeypatch.undo()
+    assert len(journal.path.read_text(encoding="utf-8").splitlines()) == 2
+
+    restored, journal, applied = _load(tmp_path, "data.snap" if binary else "data.json")
+    assert applied == 0
+    assert [c.name for c in restored.clients] == ["Иван", "Анна"]
+
+    # Запись после сбоя получает следующий номер и применяется при загрузке
+    journal.append("add_client", client=_client("Петр", 3.0))
+    journal.close()
+    restored, _, applied = _load(tmp_path, "data.snap" if binary else "data.json")
+    assert applied == 1
+    assert [c.name for c in restored.clients] == ["Иван", "Анна", "Петр"]
+
+
+def test_replay_applies_replace_and_remove_by_index(tmp_path):
+    journal = Journal(tmp_path / "data.journal")
+    for name, weight in (("Иван", 1.0), ("Анна", 2.0), ("Петр", 3.0)):
+        journal.append("add_client", client=_client(name, weight))
+    journal.append("replace_client", index=1, client=_client("Мария", 4.0))
+    journal.append("remove_client", index=0)
+    for capacity in (5.0, 10.0, 15.0):
+        journal.append("add_vehicle", vehicle=Van(capacity, vehicle_id=f"v{int(capacity)}").to_dict())
+    journal.append("replace_vehicle", index=2, vehicle=Van(20.0, True, vehicle_id="v20").to_dict())
+    journal.append("remove_vehicle", index=0)
+    journal.close()
+
+    company, _, applied = _load(tmp_path)
+    assert applied == 10
+    assert [(c.name, c.cargo_weight) for c in company.clients] == [("Мария", 4.0), ("Петр", 3.0)]
+    assert [(v.vehicle_id, v.capacity) for v in company.vehicles] == [("v10", 10.0), ("v20", 20.0)]
+    assert company.vehicles[1].is_refrigerated
+    assert company.get_statistics()["total_capacity"] == 30.0
+
+
+def test_unknown_operation_is_rejected(tmp_path):
+    journal = Journal(tmp_path / "data.journal")
+    journal.append("rename_company", name="Другая")
+    journal.close()
+    with pytest.raises(ValueError, match="Неизвестная операция"):
+        _load(tmp_path)
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import pytest
+
+from transport import PlanningService, TransportCompany
+
+
+async def _exchange(port: int, request: bytes):
+    """Отправить сырой запрос и получить статус и тело ответа."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    await writer.drain()
+    status_line = await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    writer.close()
+    await writer.wait_closed()
+    return int(status_line.split()[1]), json.loads(body)
+
+
+def _post(path: str, body: bytes, length: str) -> bytes:
+    return (f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {length}\r\n"
+            f"Connection: close\r\n\r\n").encode("latin-1") + body
+
+
+async def _serve(requests):
+    service = PlanningService(TransportCompany("Тест"))
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return [await _exchange(port, request) for request in requests]
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.parametrize("length", ["abc", "-5", "1.5"])
+def test_invalid_content_length_is_bad_request(length):
+    body = json.dumps({"name": "Иван", "cargo_weight": 1.0}).encode("utf-8")
+    [(status, payload)] = asyncio.run(_serve([_post("/clients", body, length)]))
+    assert status == 400
+    assert "Content-Length" in payload["error"]
+
+
+def test_endpoints_over_localhost():
+    client = json.dumps({"name": "Иван", "cargo_weight": 2.0, "is_vip": True}).encode("utf-8")
+    vehicle = json.dumps({"type": "van", "capacity": 10.0}).encode("utf-8")
+    distribute = json.dumps({"placements": True}).encode("utf-8")
+    responses = asyncio.run(_serve([
+        _post("/clients", client, str(len(client))),
+        _post("/vehicles", vehicle, str(len(vehicle))),
+        _post("/distribute", distribute, str(len(distribute))),
+        b"GET /stats HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n",
+        b"GET /clients/0 HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n",
+    ]))
+    (added, client_id), (_, created), (_, result), (_, stats), (_, found) = responses
+    assert added == 201 and client_id == {"client_id": 0}
+    assert result["successful"] == 1 and result["placements"] == [
+        {"client_id": 0, "vehicle_id": created["vehicle_id"]}]
+    assert stats["total_clients"] == 1 and stats["vip_clients"] == 1
+    assert found["name"] == "Иван" and found["vehicle_id"] == created["vehicle_id"]
@@ -0,0 +1,131 @@
+import pytest
+
+from transport import Airplane, Client, TransportCompany, Van
+from transport.persistence import Journal, load_company
+from transport.snapshot import (CLIENT_RECORD, CLIENT_RECORD_V1, HEADER, MAGIC, VEHICLE_RECORD,
+                                VEHICLE_RECORD_V1, LazyClientList, encode_snapshot, open_snapshot)
+
+
+def _sample():
+    vehicles = [Airplane(50.0, 9000.0, 30.0, vehicle_id="самолет-1"), Van(10.0, True, vehicle_id="v2")]
+    vehicles[0].current_load, vehicles[0].current_volume = 12.5, 4.0
+    clients = [
+        Client("Иван", 1.5),
+        Client("Анна", 2.0, True, 0.5, True, 8000.0),
+        Client("Петр", 3.25, True),
+    ]
+    return vehicles, clients
+
+
+def _fields(client: Client) -> tuple:
+    return (client.name, client.cargo_weight, client.is_vip, client.volume,
+            client.requires_refrigeration, client.altitude_limit)
+
+
+def _legacy_snapshot(version: int, vehicles, clients) -> bytes:
+    """Снимок в формате версии 1 или 2 (без статистики в заголовке)."""
+    vehicle_record, client_record = {1: (VEHICLE_RECORD_V1, CLIENT_RECORD_V1),
+                                     2: (VEHICLE_RECORD, CLIENT_RECORD)}[version]
+    heap = bytearray()
+
+    def put(text):
+        data = text.encode("utf-8")
+        heap.extend(data)
+        return len(heap) - len(data), len(data)
+
+    parts = [HEADER.pack(MAGIC, version, 7, len(vehicles), len(clients))]
+    for vehicle in vehicles:
+        fields = [1, vehicle.capacity, vehicle.current_load, float(vehicle.is_refrigerated),
+                  *put(vehicle.vehicle_id)]
+        if version == 2:
+            fields += [float("nan"), 0.0]
+        parts.append(vehicle_record.pack(*fields))
+    for client in clients:
+        fields = [client.cargo_weight, *put(client.name), int(client.is_vip)]
+        if version == 2:
+            fields += [float("nan"), float("nan")]
+        parts.append(client_record.pack(*fields))
+    return b"".join(parts) + bytes(heap)
+
+
+def test_round_trip(tmp_path):
+    vehicles, clients = _sample()
+    path = tmp_path / "data.snap"
+    path.write_bytes(encode_snapshot(vehicles, clients, journal_seq=42))
+
+    restored, lazy, journal_seq = open_snapshot(path)
+    assert journal_seq == 42
+    assert [type(v) for v in restored] == [Airplane, Van]
+    plane, van = restored
+    assert (plane.vehicle_id, plane.capacity, plane.current_load, plane.max_altitude,
+            plane.volume_capacity, plane.current_volume) == ("самолет-1", 50.0, 12.5, 9000.0, 30.0, 4.0)
+    assert (van.vehicle_id, van.capacity, van.is_refrigerated, van.volume_capacity) == ("v2", 10.0, True, None)
+    assert [_fields(c) for c in lazy] == [_fields(c) for c in clients]
+    assert (lazy.vip_count, lazy.total_weight) == (2, 6.75)
+    assert lazy.decoded
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_older_versions_are_readable(tmp_path, version):
+    vehicles = [Van(10.0, True, vehicle_id="v1")]
+    clients = [Client("Иван", 1.5), Client("Анна", 2.0, True)]
+    path = tmp_path / "data.snap"
+    path.write_bytes(_legacy_snapshot(version, vehicles, clients))
+
+    restored, lazy, journal_seq = open_snapshot(path)
+    assert journal_seq == 7
+    assert [(v.vehicle_id, v.capacity, v.is_refrigerated) for v in restored] == [("v1", 10.0, True)]
+    assert [(c.name, c.cargo_weight, c.is_vip, c.volume) for c in lazy] == [
+        ("Иван", 1.5, False, None), ("Анна", 2.0, True, None)]
+    # Статистики в заголовке старых версий нет
+    assert lazy.vip_count is None and lazy.total_weight is None
+
+
+@pytest.mark.parametrize("cut", [HEADER.size - 1, HEADER.size + 4, -20])
+def test_truncated_snapshot_is_rejected(tmp_path, cut):
+    data = encode_snapshot(*_sample())
+    path = tmp_path / "data.snap"
+    path.write_bytes(data[:cut])
+    with pytest.raises(ValueError, match="поврежден"):
+        _, clients, _ = open_snapshot(path)
+        clients.materialize()
+
+
+def test_wrong_version_and_magic_are_rejected(tmp_path):
+    data = encode_snapshot(*_sample())
+    path = tmp_path / "data.snap"
+    path.write_bytes(data[:len(MAGIC)] + (99).to_bytes(4, "little") + data[len(MAGIC) + 4:])
+    with pytest.raises(ValueError, match="Неподдерживаемая версия"):
+        open_snapshot(path)
+    path.write_bytes(b"NOTSNAP!" + data[len(MAGIC):])
+    with pytest.raises(ValueError, match="не является"):
+        open_snapshot(path)
+
+
+def test_statistics_and_edits_do_not_decode_clients(tmp_path, monkeypatch):
+    clients = [Client(f"Клиент {i}", 1.0 + i % 3, i % 4 == 0) for i in range(100)]
+    path = tmp_path / "data.snap"
+    path.write_bytes(encode_snapshot([Van(10.0, vehicle_id="v1")], clients))
+    company = TransportCompany("Тест")
+    load_company(company, path, Journal(tmp_path / "data.journal"))
+    old = company.clients[10]
+
+    def fail(*args):
+        raise AssertionError("клиенты декодируются целиком")
+
+    monkeypatch.setattr(LazyClientList, "materialize", fail)
+    monkeypatch.setattr(LazyClientList, "_decode", fail)
+    assert company.get_statistics()["vip_clients"] == 25
+
+    new = Client("Новый", 2.0, True)
+    company.replace_client(old, new)
+    company.add_client(Client("Еще один", 1.0, True))
+    assert company.clients.index(new) == 10
+    assert company.place_client(new) is company.vehicles[0]
+    stats = company.get_statistics()
+    assert stats["total_clients"] == 101 and stats["vip_clients"] == 27
+    assert company.clients.vip_count == 27
+    assert company.clients.total_weight == pytest.approx(sum(c.cargo_weight for c in clients) + 1.0)
+
+    monkeypatch.undo()
+    assert sum(c.is_vip for c in company.clients) == 27
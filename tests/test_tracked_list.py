@@ -0,0 +1,39 @@
+import copy
+import pickle
+
+from transport import Client, TransportCompany, Van
+from transport.tracked_list import TrackedList
+
+
+def test_pickle_keeps_items_and_version():
+    items = TrackedList([1, 2])
+    items.append(3)
+    restored = pickle.loads(pickle.dumps(items))
+    assert type(restored) is TrackedList
+    assert restored == [1, 2, 3]
+    assert restored.version == items.version
+    restored.append(4)
+    assert restored.version == items.version + 1
+
+
+def test_deepcopy_keeps_version():
+    items = TrackedList([[1], [2]])
+    items.pop()
+    restored = copy.deepcopy(items)
+    assert restored == [[1]] and restored[0] is not items[0]
+    assert restored.version == items.version
+
+
+def test_company_pickle_round_trip():
+    company = TransportCompany("Тест")
+    company.add_vehicle(Van(10))
+    company.add_client(Client("Иван", 4.0, True))
+    company.add_client(Client("Анна", 3.0))
+    company.optimize_cargo_distribution()
+
+    restored = pickle.loads(pickle.dumps(company))
+    assert [c.name for c in restored.clients] == ["Иван", "Анна"]
+    assert restored.get_statistics() == company.get_statistics()
+    assert restored.vehicles[0].current_load == 7.0
+    restored.add_client(Client("Петр", 1.0))
+    assert restored.get_statistics()["total_clients"] == 3
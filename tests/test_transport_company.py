@@ -0,0 +1,40 @@
+import pytest
+
+from transport import Client, TransportCompany, Van
+from transport.packing import STRATEGIES, run_strategy
+
+
+def _tenths_company() -> TransportCompany:
+    # 0.1 + 0.1 + 0.1 > 0.3 и 0.3 - 0.1 - 0.1 < 0.1 в float
+    company = TransportCompany("Тест")
+    company.add_vehicle(Van(0.3))
+    for i in range(3):
+        company.add_client(Client(f"Клиент {i}", 0.1))
+    return company
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_plan_and_loading_agree_on_float_sums(strategy):
+    company = _tenths_company()
+    run = run_strategy(strategy, company.clients, company.vehicles)
+    result = company.apply_plan(run)
+    assert len(run["placements"]) == 3
+    assert len(result["successful"]) == 3 and not result["failed"]
+    assert result["vehicles_used"] == 1
+
+
+def test_place_client_tries_next_vehicle_when_loading_is_rejected():
+    company = TransportCompany("Тест")
+    small, large = Van(5), Van(10)
+    company.add_vehicle(small)
+    company.add_vehicle(large)
+    company.replan_threshold = 10
+    company.optimize_cargo_distribution()
+
+    # Индекс плана по-прежнему считает фургон на 5 т пустым
+    small.current_load = 4.5
+    client = Client("Иван", 2.0)
+    company.add_client(client)
+    assert company.place_client(client) is large
+    assert company.get_client_vehicle(client) is large
+    assert company._free_index.free(small) == 0.5
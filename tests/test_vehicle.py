@@ -0,0 +1,33 @@
+import copy
+import pickle
+
+from transport import Airplane, Client, TransportCompany
+
+
+def test_pickle_drops_company_reference():
+    company = TransportCompany("Тест")
+    airplane = Airplane(10, 9000)
+    company.add_vehicle(airplane)
+    company.add_client(Client("Иван", 3.0))
+    company.optimize_cargo_distribution()
+
+    data = pickle.dumps(airplane)
+    assert b"TransportCompany" not in data
+    restored = pickle.loads(data)
+    assert restored._owner is None
+    assert restored.vehicle_id == airplane.vehicle_id
+    assert restored.max_altitude == 9000 and restored.current_load == 3.0
+    assert copy.deepcopy(airplane)._owner is None
+    assert airplane._owner is company
+
+
+def test_company_relinks_vehicles_after_unpickling():
+    company = TransportCompany("Тест")
+    company.add_vehicle(Airplane(10, 9000))
+    company.add_client(Client("Иван", 3.0))
+    company.optimize_cargo_distribution()
+
+    restored = pickle.loads(pickle.dumps(company))
+    assert restored.vehicles[0]._owner is restored
+    restored.vehicles[0].unload_cargo()
+    assert restored.get_statistics()["used_capacity"] == 0
@@ -7,6 +7,17 @@ from .vehicle import Vehicle
 from .airplane import Airplane
 from .van import Van
 from .transport_company import TransportCompany
+from .capacity_index import FreeCapacityIndex
+from .columnar import ColumnarFleet
+from .scenarios import Scenario, evaluate_scenarios
+from .sharding import run_sharded
+from .sqlite_storage import SQLiteStorage
+from .importer import ImportReport, import_clients
+from .service import PlanningService
+from .ids import CounterAllocator, RandomAllocator, SeededAllocator, set_allocator, use_allocator
 
-__all__ = ['Client', 'Vehicle', 'Airplane', 'Van', 'TransportCompany']
+__all__ = ['Client', 'Vehicle', 'Airplane', 'Van', 'TransportCompany', 'FreeCapacityIndex', 'ColumnarFleet',
+           'Scenario', 'evaluate_scenarios', 'run_sharded', 'SQLiteStorage',
+           'ImportReport', 'import_clients', 'PlanningService',
+           'CounterAllocator', 'RandomAllocator', 'SeededAllocator', 'set_allocator', 'use_allocator']
 __version__ = '1.0.0'
\ No newline at end of file
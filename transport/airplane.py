@@ -1,3 +1,4 @@
+from typing import Optional
 from .vehicle import Vehicle
 
 class Airplane(Vehicle):
@@ -6,15 +7,20 @@ class Airplane(Vehicle):
     Наследуется от Vehicle.
     """
     
-    def __init__(self, capacity: float, max_altitude: float):
+    __slots__ = ('max_altitude',)
+    
+    def __init__(self, capacity: float, max_altitude: float, volume_capacity: Optional[float] = None,
+                 vehicle_id: Optional[str] = None):
         """
         Инициализация самолета.
         
         Args:
             capacity: Грузоподъемность в тоннах
             max_altitude: Максимальная высота полета в метрах
+            volume_capacity: Вместимость в м³ (None - объем не ограничен)
+            vehicle_id: Существующий ID; None - выдать новый
         """
-        super().__init__(capacity)
+        super().__init__(capacity, volume_capacity, vehicle_id)
         self._validate_altitude(max_altitude)
         self.max_altitude = max_altitude
     
@@ -23,6 +29,21 @@ class Airplane(Vehicle):
         if not isinstance(altitude, (int, float)) or altitude <= 0:
             raise ValueError("Максимальная высота полета должна быть положительным числом")
     
+    def accepts(self, client) -> bool:
+        """
+        Самолет без холодильника; груз с ограничением высоты принимается,
+        только если потолок самолета не выше ограничения.
+        """
+        if client.requires_refrigeration:
+            return False
+        return client.altitude_limit is None or self.max_altitude <= client.altitude_limit
+    
+    def to_dict(self) -> dict:
+        """Получить словарь атрибутов для сериализации."""
+        data = super().to_dict()
+        data.update({"type": "airplane", "max_altitude": self.max_altitude})
+        return data
+    
     def __str__(self):
         base_str = super().__str__()
         return f"Самолет - {base_str}, Макс. высота: {self.max_altitude}м"
@@ -0,0 +1,143 @@
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Iterable, List, Sequence, Tuple
+from .vehicle import Vehicle
+from .client import Client
+
+# Допуск сравнения сумм float: граница не должна вырасти из-за погрешности сложения
+TOLERANCE = 1e-9
+
+# Сколько значений порога alpha проверяется в L2 (не больше; оценка остается
+# корректной при любом наборе порогов, меньший набор лишь ослабляет ее)
+MAX_ALPHAS = 256
+
+
+def _capacity_prefix(capacities: Iterable[float]) -> List[float]:
+    """Суммы грузоподъемности k самых вместительных ТС: prefix[k]."""
+    return [0.0, *accumulate(sorted(capacities, reverse=True))]
+
+
+def _cover_count(prefix: List[float], amount: float) -> int:
+    """
+    Минимальное число ТС, способных вместе вместить amount тонн.
+
+    Грузоподъемность любых k транспортных средств не больше суммы k самых
+    вместительных. Если не хватает всего парка, возвращается len(prefix).
+    """
+    if amount <= TOLERANCE:
+        return 0
+    return bisect_left(prefix, amount - TOLERANCE * max(1.0, amount))
+
+
+def _l2(weights: List[float], prefix: List[float], largest: float) -> int:
+    """Оценка L2 по весам, упорядоченным по возрастанию."""
+    n = len(weights)
+    vehicles = len(prefix) - 1
+    sums = [0.0, *accumulate(weights)]
+    half = largest / 2
+    small_end = bisect_right(weights, half)  # Веса [0, small_end) не больше половины
+
+    # Оценка максимальна на порогах, равных весам мелких грузов; при большом
+    # числе различных весов берутся равномерно расположенные по рангу
+    step = max(1, small_end // MAX_ALPHAS)
+    alphas = {0.0, *weights[:small_end:step]}
+
+    best = 0
+    for alpha in alphas:
+        lo = bisect_left(weights, alpha)
+        mid_end = bisect_right(weights, largest - alpha)
+        # J1 (тяжелее largest - alpha) и J2 (тяжелее половины) попарно не делят
+        # транспорт, а J3 (от alpha до половины) не помещается к грузам J1
+        n1 = n - mid_end
+        n2 = mid_end - small_end
+        residual = prefix[min(n2, vehicles)] - (sums[mid_end] - sums[small_end])
+        extra = _cover_count(prefix, sums[small_end] - sums[lo] - residual)
+        best = max(best, n1 + n2 + extra)
+    return best
+
+
+def lower_bound_l1(weights: Iterable[float], capacities: Iterable[float]) -> int:
+    """
+    Непрерывная оценка L1 числа транспорта для перевозки грузов.
+
+    Для одинаковой грузоподъемности C это ceil(sum / C); для разной -
+    наименьшее k, при котором k самых вместительных ТС вмещают общий вес
+    (бинарный поиск по префиксным суммам).
+
+    Args:
+        weights: Веса грузов
+        capacities: Грузоподъемности транспорта
+
+    Returns:
+        Нижняя граница числа транспорта (len(capacities) + 1 - не помещается весь вес)
+    """
+    return _cover_count(_capacity_prefix(capacities), sum(weights))
+
+
+def lower_bound_l2(weights: Iterable[float], capacities: Iterable[float]) -> int:
+    """
+    Оценка L2 Мартелло-Тота, обобщенная на разную грузоподъемность.
+
+    Для порога alpha грузы тяжелее половины наибольшей грузоподъемности
+    требуют отдельного транспорта каждый; грузы от alpha до половины могут
+    занять только остаток этого транспорта (не больше суммы самых
+    вместительных ТС за вычетом крупных грузов), а избыток требует
+    дополнительного транспорта. Для одинаковой грузоподъемности совпадает
+    с классической L2.
+
+    Args:
+        weights: Веса грузов
+        capacities: Грузоподъемности транспорта
+
+    Returns:
+        Нижняя граница числа транспорта
+    """
+    prefix = _capacity_prefix(capacities)
+    if len(prefix) == 1:
+        return 0
+    return _l2(sorted(weights), prefix, prefix[1])
+
+
+def lower_bound(weights: Iterable[float], capacities: Iterable[float]) -> int:
+    """
+    Наибольшая из оценок L1 и L2.
+
+    Ограничения по объему и совместимости не учитываются (релаксация),
+    поэтому оценка остается нижней границей и для задачи с ними.
+
+    Args:
+        weights: Веса грузов
+        capacities: Грузоподъемности транспорта
+
+    Returns:
+        Нижняя граница числа транспорта
+    """
+    ordered = sorted(weights)
+    if not ordered:
+        return 0
+    prefix = _capacity_prefix(capacities)
+    if len(prefix) == 1:
+        return 1
+    return max(_cover_count(prefix, sum(ordered)), _l2(ordered, prefix, prefix[1]))
+
+
+def plan_bounds(placements: Sequence[Tuple[Client, Vehicle]], vehicles: Sequence[Vehicle],
+                vehicles_used: int) -> dict:
+    """
+    Нижняя граница и разрыв оптимальности плана.
+
+    Граница считается для размещенных грузов: меньшим числом транспорта
+    их перевезти нельзя.
+
+    Args:
+        placements: Пары клиент-транспорт плана
+        vehicles: Весь парк
+        vehicles_used: Число задействованного транспорта
+
+    Returns:
+        Словарь с lower_bound и optimality_gap - относительным превышением
+        числа транспорта над границей (0.0 - план оптимален по числу ТС)
+    """
+    bound = lower_bound((c.cargo_weight for c, _ in placements), (v.capacity for v in vehicles))
+    gap = (vehicles_used - bound) / bound if bound else 0.0
+    return {"lower_bound": bound, "optimality_gap": gap}
@@ -0,0 +1,474 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from .vehicle import CAPACITY_TOLERANCE, Vehicle
+from .client import Client
+from . import instrumentation
+
+# Дополнительная проверка кандидата (например, по объему); None - любой подходит
+Accept = Optional[Callable[[Vehicle], bool]]
+
+
+def compatibility_class(category: Tuple[bool, Optional[float]], altitudes: List[float]) -> Hashable:
+    """
+    Класс совместимости категории груза (Client.category) с парком.
+
+    Грузы с разным ограничением высоты совместимы с одним и тем же
+    транспортом, если под ограничение попадает одно и то же множество
+    потолков самолетов парка. Поэтому ограничение заменяется наибольшим
+    потолком не выше него (0.0 - ни одного), а ограничение не ниже всех
+    потолков - на None, и число классов не превышает удвоенного числа
+    различных потолков плюс два.
+
+    Args:
+        category: Категория груза (холодильник, ограничение высоты)
+        altitudes: Различные потолки самолетов парка по возрастанию
+
+    Returns:
+        Ключ класса совместимости
+    """
+    refrigeration, limit = category
+    if limit is None:
+        return category
+    pos = bisect_right(altitudes, limit)
+    if pos == len(altitudes):
+        return refrigeration, None
+    return refrigeration, altitudes[pos - 1] if pos else 0.0
+
+class FreeCapacityIndex:
+    """
+    Индекс транспортных средств, упорядоченный по свободной грузоподъемности.
+
+    Хранит отсортированный список ключей (свободно, порядковый номер), поэтому
+    поиск подходящего транспорта выполняется бинарным поиском за O(log V).
+    Порядковый номер сохраняет исходный порядок добавления при равной
+    свободной грузоподъемности. Груз считается помещающимся с допуском
+    CAPACITY_TOLERANCE, как и в Vehicle.load_cargo.
+    """
+
+    def __init__(self, vehicles: Iterable[Vehicle] = (), frees: Optional[Iterable[float]] = None):
+        """
+        Инициализация индекса.
+
+        Args:
+            vehicles: Транспортные средства
+            frees: Свободная грузоподъемность каждого транспорта
+                (по умолчанию get_free_capacity())
+        """
+        self._keys: List[Tuple[float, int]] = []
+        self._key_of: Dict[Vehicle, Tuple[float, int]] = {}
+        self._vehicle_at: Dict[int, Vehicle] = {}
+        self._counter = 0
+
+        if frees is None:
+            for vehicle in vehicles:
+                self.add(vehicle)
+        else:
+            for vehicle, free in zip(vehicles, frees):
+                self.add(vehicle, free)
+
+    def add(self, vehicle: Vehicle, free: Optional[float] = None) -> None:
+        """
+        Добавить транспортное средство в индекс.
+
+        Args:
+            vehicle: Транспортное средство
+            free: Свободная грузоподъемность (по умолчанию get_free_capacity())
+        """
+        if vehicle in self._key_of:
+            raise ValueError(f"Транспорт {vehicle.vehicle_id} уже есть в индексе")
+
+        if free is None:
+            free = vehicle.get_free_capacity()
+
+        key = (free, self._counter)
+        self._counter += 1
+        self._key_of[vehicle] = key
+        self._vehicle_at[key[1]] = vehicle
+        insort(self._keys, key)
+
+    def remove(self, vehicle: Vehicle) -> None:
+        """Удалить транспортное средство из индекса."""
+        key = self._key_of.pop(vehicle)
+        del self._vehicle_at[key[1]]
+        del self._keys[bisect_left(self._keys, key)]
+
+    def update(self, vehicle: Vehicle, free: Optional[float] = None) -> None:
+        """
+        Обновить свободную грузоподъемность транспортного средства.
+
+        Args:
+            vehicle: Транспортное средство из индекса
+            free: Новое значение (по умолчанию get_free_capacity())
+        """
+        if free is None:
+            free = vehicle.get_free_capacity()
+
+        old_key = self._key_of[vehicle]
+        if old_key[0] == free:
+            return
+
+        # Порядковый номер сохраняется, чтобы порядок при равенстве не менялся
+        new_key = (free, old_key[1])
+        del self._keys[bisect_left(self._keys, old_key)]
+        insort(self._keys, new_key)
+        self._key_of[vehicle] = new_key
+
+    def free(self, vehicle: Vehicle) -> float:
+        """Получить свободную грузоподъемность, записанную в индексе."""
+        return self._key_of[vehicle][0]
+
+    def best_fit(self, weight: float, accept: Accept = None) -> Optional[Vehicle]:
+        """
+        Найти транспорт с наименьшим свободным местом, достаточным для груза.
+
+        Args:
+            weight: Вес груза в тоннах
+            accept: Дополнительная проверка кандидата; кандидаты перебираются
+                по возрастанию свободного места, пока проверка не пройдет
+
+        Returns:
+            Транспортное средство или None, если груз никуда не помещается
+        """
+        pos = bisect_left(self._keys, (weight - CAPACITY_TOLERANCE, -1))
+        if accept is None:
+            return self._vehicle_at[self._keys[pos][1]] if pos < len(self._keys) else None
+        for _, order in islice(self._keys, pos, None):
+            if accept(self._vehicle_at[order]):
+                return self._vehicle_at[order]
+        return None
+
+    def worst_fit(self, weight: float, accept: Accept = None) -> Optional[Vehicle]:
+        """
+        Найти транспорт с наибольшим свободным местом, если груз в него помещается.
+
+        Args:
+            weight: Вес груза в тоннах
+            accept: Дополнительная проверка кандидата; кандидаты перебираются
+                по убыванию свободного места, пока проверка не пройдет
+
+        Returns:
+            Транспортное средство или None, если груз никуда не помещается
+        """
+        need = weight - CAPACITY_TOLERANCE
+        for free, order in reversed(self._keys):
+            if free < need:
+                break
+            if accept is None or accept(self._vehicle_at[order]):
+                return self._vehicle_at[order]
+        return None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, vehicle):
+        return vehicle in self._key_of
+
+    def __iter__(self):
+        """Перебор транспорта по возрастанию свободной грузоподъемности."""
+        return (self._vehicle_at[order] for _, order in self._keys)
+
+    def __reversed__(self):
+        """Перебор транспорта по убыванию свободной грузоподъемности."""
+        return (self._vehicle_at[order] for _, order in reversed(self._keys))
+
+
+class FirstFitTree:
+    """
+    Дерево отрезков максимумов свободной грузоподъемности.
+
+    Позволяет за O(log V) найти первый по порядку транспорт, в который
+    помещается груз (First Fit), не просматривая весь список.
+    """
+
+    def __init__(self, vehicles: Iterable[Vehicle], frees: Optional[Iterable[float]] = None):
+        """
+        Инициализация дерева.
+
+        Args:
+            vehicles: Транспортные средства в порядке перебора
+            frees: Свободная грузоподъемность каждого транспорта
+                (по умолчанию get_free_capacity())
+        """
+        self._vehicles: List[Vehicle] = list(vehicles)
+        if frees is None:
+            frees = (v.get_free_capacity() for v in self._vehicles)
+        self._pos: Dict[Vehicle, int] = {v: i for i, v in enumerate(self._vehicles)}
+
+        size = 1
+        while size < len(self._vehicles):
+            size *= 2
+        self._size = size
+        self._tree = [float("-inf")] * (2 * size)
+
+        for i, free in enumerate(frees):
+            self._tree[size + i] = free
+        for i in range(size - 1, 0, -1):
+            self._tree[i] = max(self._tree[2 * i], self._tree[2 * i + 1])
+
+    def update(self, vehicle: Vehicle, free: Optional[float] = None) -> None:
+        """
+        Обновить свободную грузоподъемность транспортного средства.
+
+        Args:
+            vehicle: Транспортное средство из дерева
+            free: Новое значение (по умолчанию get_free_capacity())
+        """
+        if free is None:
+            free = vehicle.get_free_capacity()
+
+        i = self._size + self._pos[vehicle]
+        self._tree[i] = free
+        i //= 2
+        while i:
+            self._tree[i] = max(self._tree[2 * i], self._tree[2 * i + 1])
+            i //= 2
+
+    def free(self, vehicle: Vehicle) -> float:
+        """Получить свободную грузоподъемность, записанную в дереве."""
+        return self._tree[self._size + self._pos[vehicle]]
+
+    def first_fit(self, weight: float, accept: Accept = None) -> Optional[Vehicle]:
+        """
+        Найти первый по порядку транспорт, в который помещается груз.
+
+        Args:
+            weight: Вес груза в тоннах
+            accept: Дополнительная проверка кандидата; кандидаты перебираются
+                по порядку, пока проверка не пройдет
+
+        Returns:
+            Транспортное средство или None, если груз никуда не помещается
+        """
+        weight -= CAPACITY_TOLERANCE
+        if not self._vehicles or self._tree[1] < weight:
+            return None
+
+        pos = self._first_from(0, weight)
+        while accept is not None and pos >= 0 and not accept(self._vehicles[pos]):
+            pos = self._first_from(pos + 1, weight) if pos + 1 < len(self._vehicles) else -1
+        return self._vehicles[pos] if pos >= 0 else None
+
+    def _first_from(self, start: int, weight: float) -> int:
+        """Найти первую позицию не меньше start, где помещается груз, или -1."""
+        i = self._size + start
+        if self._tree[i] < weight:
+            # Подъем до ближайшего правого поддерева, где груз помещается
+            while True:
+                while i > 1 and i & 1:
+                    i //= 2
+                if i <= 1:
+                    return -1
+                i += 1
+                if self._tree[i] >= weight:
+                    break
+        while i < self._size:
+            i = 2 * i if self._tree[2 * i] >= weight else 2 * i + 1
+        return i - self._size
+
+    def __len__(self):
+        return len(self._vehicles)
+
+    def __contains__(self, vehicle):
+        return vehicle in self._pos
+
+
+
+class CategoryIndex:
+    """
+    Индексы свободного места транспорта по категориям груза.
+
+    Для каждого класса совместимости груза (compatibility_class) при первом
+    обращении строится отдельный индекс из совместимого с ним транспорта
+    (Vehicle.accepts), поэтому поиск кандидата для груза с требованиями
+    стоит столько же, сколько без них: один поиск за O(log V) по индексу
+    класса, без перебора несовместимого транспорта. Транспорт входит в
+    индексы всех классов, с которыми совместим, и при погрузке обновляется
+    во всех; число классов ограничено числом различных потолков самолетов,
+    а не числом различных ограничений высоты у клиентов. Объем - второе измерение: индексы упорядочены
+    по весу, а среди кандидатов по весу выбирается первый, где хватает
+    объема (проверка включается, только если у груза и у транспорта
+    объем задан).
+    """
+
+    def __init__(self, vehicles: Iterable[Vehicle], frees: Optional[Iterable[float]] = None,
+                 volumes: Optional[Iterable[Optional[float]]] = None, factory=FreeCapacityIndex):
+        """
+        Инициализация индексов.
+
+        Args:
+            vehicles: Транспортные средства (порядок задает порядок при равенстве)
+            frees: Свободная грузоподъемность (по умолчанию get_free_capacity())
+            volumes: Свободный объем, None - не ограничен (по умолчанию по текущей загрузке)
+            factory: Класс индекса категории: FreeCapacityIndex или FirstFitTree
+        """
+        self._vehicles: List[Vehicle] = list(vehicles)
+        if frees is None:
+            frees = (v.get_free_capacity() for v in self._vehicles)
+        if volumes is None:
+            volumes = (None if v.volume_capacity is None else v.get_free_volume() for v in self._vehicles)
+        self._free: Dict[Vehicle, float] = dict(zip(self._vehicles, frees))
+        # Только транспорт с ограниченным объемом
+        self._free_volume: Dict[Vehicle, float] = {
+            v: volume for v, volume in zip(self._vehicles, volumes) if volume is not None
+        }
+        self._factory = factory
+        self._altitudes: List[float] = sorted({v.max_altitude for v in self._vehicles if hasattr(v, "max_altitude")})
+        self._indexes: Dict[Hashable, object] = {}    # класс совместимости -> индекс
+        self._exemplars: Dict[Hashable, Client] = {}  # клиент, по которому проверяется совместимость
+        self._lookup: Dict[Hashable, object] = {}     # категория груза -> индекс ее класса
+        self._member_of: Dict[Vehicle, list] = {v: [] for v in self._vehicles}
+        # Кандидаты, отвергнутые проверкой объема (считаются при включенной диагностике)
+        self.rejected = 0
+
+    def _index_for(self, client: Client):
+        """Получить индекс класса совместимости груза клиента, построив его при необходимости."""
+        category = client.category
+        index = self._lookup.get(category)
+        if index is not None:
+            return index
+        key = compatibility_class(category, self._altitudes)
+        index = self._indexes.get(key)
+        if index is None:
+            members = [v for v in self._vehicles if v.accepts(client)]
+            index = self._factory(members, [self._free[v] for v in members])
+            self._indexes[key] = index
+            self._exemplars[key] = client
+            for vehicle in members:
+                self._member_of[vehicle].append(index)
+        self._lookup[category] = index
+        return index
+
+    def _add_altitude(self, altitude: float) -> None:
+        """
+        Учесть новый потолок самолета: он делит классы совместимости.
+
+        Индексы классов, чьи грузы теперь относятся к разным классам,
+        удаляются и строятся заново при следующем обращении.
+        """
+        insort(self._altitudes, altitude)
+        self._lookup.clear()
+        for key, exemplar in list(self._exemplars.items()):
+            if compatibility_class(exemplar.category, self._altitudes) != key:
+                index = self._indexes.pop(key)
+                del self._exemplars[key]
+                for members in self._member_of.values():
+                    if index in members:
+                        members.remove(index)
+
+    def _volume_check(self, need: float) -> Callable[[Vehicle], bool]:
+        """Проверка, что в транспорте хватает свободного объема."""
+        free_volume = self._free_volume
+        need -= CAPACITY_TOLERANCE
+        if not instrumentation.enabled:
+            return lambda vehicle: free_volume.get(vehicle, need) >= need
+
+        def check(vehicle: Vehicle) -> bool:
+            if free_volume.get(vehicle, need) >= need:
+                return True
+            self.rejected += 1
+            return False
+        return check
+
+    # Поиск вызывается на каждый груз, поэтому категория (Client.category) и
+    # отсутствие ограничений по объему проверяются без лишних вызовов функций
+
+    def best_fit(self, client: Client) -> Optional[Vehicle]:
+        """Совместимый транспорт с наименьшим достаточным свободным местом."""
+        index = self._lookup.get((client.requires_refrigeration, client.altitude_limit))
+        if index is None:
+            index = self._index_for(client)
+        if client.volume is None or not self._free_volume:
+            return index.best_fit(client.cargo_weight)
+        return index.best_fit(client.cargo_weight, self._volume_check(client.volume))
+
+    def worst_fit(self, client: Client) -> Optional[Vehicle]:
+        """Совместимый транспорт с наибольшим свободным местом."""
+        index = self._lookup.get((client.requires_refrigeration, client.altitude_limit))
+        if index is None:
+            index = self._index_for(client)
+        if client.volume is None or not self._free_volume:
+            return index.worst_fit(client.cargo_weight)
+        return index.worst_fit(client.cargo_weight, self._volume_check(client.volume))
+
+    def first_fit(self, client: Client) -> Optional[Vehicle]:
+        """Первый по порядку совместимый транспорт, где хватает места."""
+        index = self._lookup.get((client.requires_refrigeration, client.altitude_limit))
+        if index is None:
+            index = self._index_for(client)
+        if client.volume is None or not self._free_volume:
+            return index.first_fit(client.cargo_weight)
+        return index.first_fit(client.cargo_weight, self._volume_check(client.volume))
+
+    def candidates(self, client: Client) -> Iterable[Vehicle]:
+        """Совместимый транспорт по убыванию свободной грузоподъемности (без учета объема)."""
+        return reversed(self._index_for(client))
+
+    def consume(self, vehicle: Vehicle, client: Client) -> None:
+        """Учесть размещение груза клиента в плане (сам транспорт не изменяется)."""
+        free = self._free[vehicle] - client.cargo_weight
+        self._free[vehicle] = free
+        for index in self._member_of[vehicle]:
+            index.update(vehicle, free)
+        if client.volume is not None and vehicle in self._free_volume:
+            self._free_volume[vehicle] -= client.volume
+
+    def release(self, vehicle: Vehicle, client: Client) -> None:
+        """Учесть выгрузку груза клиента из плана (обратно consume)."""
+        free = self._free[vehicle] + client.cargo_weight
+        self._free[vehicle] = free
+        for index in self._member_of[vehicle]:
+            index.update(vehicle, free)
+        if client.volume is not None and vehicle in self._free_volume:
+            self._free_volume[vehicle] += client.volume
+
+    def update(self, vehicle: Vehicle) -> None:
+        """Обновить свободное место по текущей загрузке транспорта."""
+        if vehicle.volume_capacity is not None:
+            self._free_volume[vehicle] = vehicle.get_free_volume()
+        free = self._free[vehicle] = vehicle.get_free_capacity()
+        for index in self._member_of[vehicle]:
+            index.update(vehicle, free)
+
+    def free(self, vehicle: Vehicle) -> float:
+        """Получить свободную грузоподъемность, записанную в индексе."""
+        return self._free[vehicle]
+
+    def add(self, vehicle: Vehicle, free: Optional[float] = None,
+            free_volume: Optional[float] = None) -> None:
+        """
+        Добавить транспорт во все совместимые индексы.
+
+        Args:
+            vehicle: Транспортное средство
+            free: Свободная грузоподъемность (по умолчанию get_free_capacity())
+            free_volume: Свободный объем, если он ограничен (по умолчанию get_free_volume())
+        """
+        if vehicle in self._free:
+            raise ValueError(f"Транспорт {vehicle.vehicle_id} уже есть в индексе")
+        self._vehicles.append(vehicle)
+        self._free[vehicle] = vehicle.get_free_capacity() if free is None else free
+        if vehicle.volume_capacity is not None:
+            self._free_volume[vehicle] = vehicle.get_free_volume() if free_volume is None else free_volume
+        self._member_of[vehicle] = []
+        altitude = getattr(vehicle, "max_altitude", None)
+        if altitude is not None and altitude not in self._altitudes:
+            self._add_altitude(altitude)
+        for category, index in self._indexes.items():
+            if vehicle.accepts(self._exemplars[category]):
+                index.add(vehicle, self._free[vehicle])
+                self._member_of[vehicle].append(index)
+
+    def remove(self, vehicle: Vehicle) -> None:
+        """Удалить транспорт из всех индексов."""
+        for index in self._member_of.pop(vehicle):
+            index.remove(vehicle)
+        del self._free[vehicle]
+        self._free_volume.pop(vehicle, None)
+        self._vehicles.remove(vehicle)
+
+    def __len__(self):
+        return len(self._vehicles)
+
+    def __contains__(self, vehicle):
+        return vehicle in self._free
@@ -1,9 +1,16 @@
+from typing import Optional, Tuple
+
 class Client:
     """
     Класс для представления клиента транспортной компании.
     """
     
-    def __init__(self, name: str, cargo_weight: float, is_vip: bool = False):
+    # Без __dict__ у каждого экземпляра: экономия памяти на миллионах клиентов
+    __slots__ = ('name', 'cargo_weight', 'is_vip', 'volume', 'requires_refrigeration', 'altitude_limit')
+    
+    def __init__(self, name: str, cargo_weight: float, is_vip: bool = False,
+                 volume: Optional[float] = None, requires_refrigeration: bool = False,
+                 altitude_limit: Optional[float] = None):
         """
         Инициализация клиента.
         
@@ -11,12 +18,20 @@ class Client:
             name: Имя клиента
             cargo_weight: Вес груза в тоннах
             is_vip: VIP-статус (по умолчанию False)
+            volume: Объем груза в м³ (None - не учитывается)
+            requires_refrigeration: Требуется ли холодильник
+            altitude_limit: Максимальная допустимая высота перевозки в метрах
+                (None - без ограничения)
         """
         self._validate_data(name, cargo_weight, is_vip)
+        self._validate_requirements(volume, requires_refrigeration, altitude_limit)
         
         self.name = name
         self.cargo_weight = cargo_weight
         self.is_vip = is_vip
+        self.volume = volume
+        self.requires_refrigeration = requires_refrigeration
+        self.altitude_limit = altitude_limit
     
     def _validate_data(self, name: str, cargo_weight: float, is_vip: bool):
         """Валидация входных данных."""
@@ -29,6 +44,72 @@ class Client:
         if not isinstance(is_vip, bool):
             raise ValueError("VIP-статус должен быть булевым значением")
     
+    def _validate_requirements(self, volume, requires_refrigeration, altitude_limit):
+        """Валидация требований к перевозке."""
+        if volume is not None and (not isinstance(volume, (int, float)) or volume <= 0):
+            raise ValueError("Объем груза должен быть положительным числом")
+        
+        if not isinstance(requires_refrigeration, bool):
+            raise ValueError("Требование холодильника должно быть булевым значением")
+        
+        if altitude_limit is not None and (not isinstance(altitude_limit, (int, float)) or altitude_limit <= 0):
+            raise ValueError("Ограничение высоты должно быть положительным числом")
+    
+    @property
+    def category(self) -> Tuple[bool, Optional[float]]:
+        """
+        Категория груза: требования, от которых зависит выбор транспорта.
+        
+        Клиенты одной категории совместимы с одним и тем же транспортом.
+        """
+        return self.requires_refrigeration, self.altitude_limit
+    
+    @classmethod
+    def from_validated(cls, name: str, cargo_weight: float, is_vip: bool,
+                       volume: Optional[float] = None, requires_refrigeration: bool = False,
+                       altitude_limit: Optional[float] = None) -> "Client":
+        """
+        Создать клиента из уже проверенных данных без повторной валидации.
+        
+        Используется при пакетном импорте, где данные проверяются заранее.
+        
+        Args:
+            name: Имя клиента
+            cargo_weight: Вес груза в тоннах
+            is_vip: VIP-статус
+            volume: Объем груза в м³
+            requires_refrigeration: Требуется ли холодильник
+            altitude_limit: Максимальная допустимая высота перевозки
+        
+        Returns:
+            Объект клиента
+        """
+        client = cls.__new__(cls)
+        client.name = name
+        client.cargo_weight = cargo_weight
+        client.is_vip = is_vip
+        client.volume = volume
+        client.requires_refrigeration = requires_refrigeration
+        client.altitude_limit = altitude_limit
+        return client
+    
+    def to_dict(self) -> dict:
+        """
+        Получить словарь атрибутов для сериализации.
+        
+        Returns:
+            Словарь, совместимый с аргументами конструктора; требования
+            к перевозке включаются, только если они заданы
+        """
+        data = {"name": self.name, "cargo_weight": self.cargo_weight, "is_vip": self.is_vip}
+        if self.volume is not None:
+            data["volume"] = self.volume
+        if self.requires_refrigeration:
+            data["requires_refrigeration"] = True
+        if self.altitude_limit is not None:
+            data["altitude_limit"] = self.altitude_limit
+        return data
+    
     def __str__(self):
         vip_status = "VIP" if self.is_vip else "обычный"
         return f"Клиент: {self.name}, Груз: {self.cargo_weight}т, Статус: {vip_status}"
@@ -0,0 +1,221 @@
+from typing import Dict, Hashable, List, Sequence, Tuple
+from .vehicle import CAPACITY_TOLERANCE, Vehicle
+from .client import Client
+from .airplane import Airplane
+from .capacity_index import compatibility_class
+from .packing import Placement
+
+try:
+    import numpy as np
+except ImportError:  # NumPy - необязательная зависимость
+    np = None
+
+
+class ColumnarFleet:
+    """
+    Колоночное (struct-of-arrays) представление парка и клиентов на NumPy.
+
+    Грузоподъемности, загрузки, веса и VIP-флаги хранятся в массивах, поэтому
+    статистика, проверки выполнимости и поиск кандидатов для погрузки
+    выполняются векторно, без прохода по объектам Python. Требования
+    к перевозке учитываются масками совместимости: маска транспорта,
+    подходящего для груза, вычисляется один раз на класс совместимости
+    (capacity_index.compatibility_class);
+    объем - второе измерение вместимости (не заданный объем не ограничивает).
+    """
+
+    def __init__(self, vehicles: Sequence[Vehicle], clients: Sequence[Client]):
+        """
+        Инициализация колоночного представления.
+
+        Args:
+            vehicles: Транспортные средства
+            clients: Клиенты
+        """
+        if np is None:
+            raise ImportError("Для колоночного представления требуется NumPy (pip install numpy)")
+
+        self.vehicles = list(vehicles)
+        self.clients = list(clients)
+
+        self.capacities = np.fromiter((v.capacity for v in self.vehicles), dtype=np.float64, count=len(self.vehicles))
+        self.loads = np.fromiter((v.current_load for v in self.vehicles), dtype=np.float64, count=len(self.vehicles))
+        self.is_airplane = np.fromiter((isinstance(v, Airplane) for v in self.vehicles), dtype=bool, count=len(self.vehicles))
+        self.weights = np.fromiter((c.cargo_weight for c in self.clients), dtype=np.float64, count=len(self.clients))
+        self.is_vip = np.fromiter((c.is_vip for c in self.clients), dtype=bool, count=len(self.clients))
+
+        n_vehicles, n_clients = len(self.vehicles), len(self.clients)
+        inf = float("inf")
+        self.volume_capacities = np.fromiter((inf if v.volume_capacity is None else v.volume_capacity
+                                              for v in self.vehicles), dtype=np.float64, count=n_vehicles)
+        self.volume_loads = np.fromiter((v.current_volume for v in self.vehicles), dtype=np.float64, count=n_vehicles)
+        self.volumes = np.fromiter((c.volume or 0.0 for c in self.clients), dtype=np.float64, count=n_clients)
+        # Маски совместимости по классам (номер класса - позиция в _masks),
+        # номер класса каждого клиента и маска каждого клиента
+        self._altitudes = sorted({v.max_altitude for v in self.vehicles if isinstance(v, Airplane)})
+        self._masks = []
+        self._codes: Dict[Hashable, int] = {}  # категория груза или класс -> номер класса
+        self.class_codes = np.fromiter((self._class_code(c) for c in self.clients), dtype=np.intp,
+                                       count=n_clients)
+        self.categories = [self._masks[code] for code in self.class_codes]
+
+    def _class_code(self, client: Client) -> int:
+        """Получить номер класса совместимости груза клиента, вычислив маску при необходимости."""
+        code = self._codes.get(client.category)
+        if code is None:
+            key = compatibility_class(client.category, self._altitudes)
+            code = self._codes.get(key)
+            if code is None:
+                code = len(self._masks)
+                self._masks.append(np.fromiter((v.accepts(client) for v in self.vehicles), dtype=bool,
+                                               count=len(self.vehicles)))
+                self._codes[key] = code
+            self._codes[client.category] = code
+        return code
+
+    @classmethod
+    def from_company(cls, company) -> "ColumnarFleet":
+        """Построить представление по транспорту и клиентам компании."""
+        return cls(company.vehicles, company.clients)
+
+    def get_free_capacities(self):
+        """Получить массив свободной грузоподъемности."""
+        return self.capacities - self.loads
+
+    def get_statistics(self, company_name: str = "") -> dict:
+        """
+        Получить статистику в формате TransportCompany.get_statistics().
+
+        Args:
+            company_name: Название компании для поля company_name
+
+        Returns:
+            Словарь со статистикой
+        """
+        total_capacity = float(self.capacities.sum())
+        used_capacity = float(self.loads.sum())
+        vip_clients = int(np.count_nonzero(self.is_vip))
+
+        return {
+            "company_name": company_name,
+            "total_vehicles": len(self.vehicles),
+            "total_capacity": total_capacity,
+            "used_capacity": used_capacity,
+            "utilization_percentage": (used_capacity / total_capacity * 100) if total_capacity > 0 else 0,
+            "total_clients": len(self.clients),
+            "vip_clients": vip_clients,
+            "regular_clients": len(self.clients) - vip_clients
+        }
+
+    def infeasible_clients(self) -> List[Client]:
+        """
+        Найти клиентов, для которых нет ни одного совместимого транспорта
+        с достаточной грузоподъемностью и объемом.
+
+        Для каждого класса совместимости транспорт сортируется по грузоподъемности,
+        и для каждого груза берется наибольшая вместимость по объему среди
+        транспорта не слабее его по весу - проверка векторная.
+
+        Returns:
+            Список клиентов, которых нельзя разместить ни при каком распределении
+        """
+        infeasible = np.zeros(len(self.clients), dtype=bool)
+        for code, mask in enumerate(self._masks):
+            members = self.class_codes == code
+            capacities = self.capacities[mask]
+            if not len(capacities):
+                infeasible |= members
+                continue
+            order = np.argsort(capacities)
+            capacities = capacities[order]
+            # Наибольший объем среди транспорта с позиции i и дальше (по возрастанию веса)
+            best_volume = np.maximum.accumulate(self.volume_capacities[mask][order][::-1])[::-1]
+            pos = np.searchsorted(capacities, self.weights - CAPACITY_TOLERANCE, side="left")
+            has_weight = pos < len(capacities)
+            volume_ok = np.zeros(len(self.clients), dtype=bool)
+            volume_ok[has_weight] = best_volume[pos[has_weight]] >= self.volumes[has_weight] - CAPACITY_TOLERANCE
+            infeasible |= members & ~(has_weight & volume_ok)
+        return [self.clients[i] for i in np.flatnonzero(infeasible)]
+
+    def _fits(self, weight: float, volume: float = 0.0, mask=None):
+        """Маска транспорта, где хватает веса и объема (и совместимого, если задана маска)."""
+        # Та же проверка с допуском, что и vehicle.fits при погрузке
+        fits = self.loads + weight <= self.capacities + CAPACITY_TOLERANCE
+        if volume:
+            fits &= self.volume_loads + volume <= self.volume_capacities + CAPACITY_TOLERANCE
+        if mask is not None:
+            fits &= mask
+        return fits
+
+    def first_fit(self, weight: float, volume: float = 0.0, mask=None) -> int:
+        """
+        Найти первый по порядку транспорт, в который помещается груз.
+
+        Args:
+            weight: Вес груза в тоннах
+            volume: Объем груза в м³
+            mask: Маска совместимого транспорта (по умолчанию - весь)
+
+        Returns:
+            Позиция транспорта или -1
+        """
+        fits = self._fits(weight, volume, mask)
+        pos = int(fits.argmax()) if len(fits) else 0
+        return pos if len(fits) and fits[pos] else -1
+
+    def best_fit(self, weight: float, volume: float = 0.0, mask=None) -> int:
+        """
+        Найти транспорт с наименьшим достаточным свободным местом.
+
+        Args:
+            weight: Вес груза в тоннах
+            volume: Объем груза в м³
+            mask: Маска совместимого транспорта (по умолчанию - весь)
+
+        Returns:
+            Позиция транспорта или -1
+        """
+        fits = self._fits(weight, volume, mask)
+        if not fits.any():
+            return -1
+        free = np.where(fits, self.capacities - self.loads, np.inf)
+        return int(free.argmin())
+
+    def pack(self, strategy: str = "best_fit") -> Tuple[List[Placement], List[Client]]:
+        """
+        Спланировать распределение с векторным поиском кандидатов.
+
+        Клиенты обрабатываются в том же порядке, что и в packing.sort_clients:
+        сначала VIP, затем по убыванию веса. Загрузка транспорта в объектах
+        не изменяется - изменяются только массивы loads и volume_loads.
+
+        Args:
+            strategy: "best_fit" или "first_fit"
+
+        Returns:
+            Кортеж (список пар клиент-транспорт, список неразмещенных клиентов)
+        """
+        if strategy == "best_fit":
+            find = self.best_fit
+        elif strategy == "first_fit":
+            find = self.first_fit
+        else:
+            raise ValueError(f"Неизвестная стратегия: {strategy}")
+
+        # lexsort: последний ключ - основной (VIP первыми), затем по убыванию веса
+        order = np.lexsort((-self.weights, ~self.is_vip))
+        max_capacity = self.capacities.max() if len(self.vehicles) else 0.0
+
+        placements: List[Placement] = []
+        failed: List[Client] = []
+        for i in order:
+            weight, volume = self.weights[i], self.volumes[i]
+            pos = find(weight, volume, self.categories[i]) if weight <= max_capacity + CAPACITY_TOLERANCE else -1
+            if pos < 0:
+                failed.append(self.clients[i])
+                continue
+            self.loads[pos] += weight
+            self.volume_loads[pos] += volume
+            placements.append((self.clients[i], self.vehicles[pos]))
+
+        return placements, failed
@@ -0,0 +1,128 @@
+import csv
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, TextIO, Tuple, Union
+from .vehicle import Vehicle
+from .client import Client
+from . import instrumentation
+
+PathLike = Union[str, Path]
+
+EXPORT_FORMATS = ("json", "jsonl", "csv", "txt")
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+
+def iter_assignments(company) -> Iterator[Tuple[Vehicle, Client]]:
+    """
+    Перебрать пары транспорт-клиент текущего распределения.
+
+    Пары берутся прямо из списков клиентов транспорта, без промежуточных
+    коллекций.
+
+    Args:
+        company: Транспортная компания
+
+    Returns:
+        Итератор по парам (транспорт, клиент)
+    """
+    for vehicle in company.vehicles:
+        for client in vehicle.clients_list:
+            yield vehicle, client
+
+
+@contextmanager
+def _open_output(target: Union[PathLike, TextIO], buffer_size: int):
+    """Открыть файл для записи или использовать переданный поток как есть."""
+    if hasattr(target, "write"):
+        yield target
+    else:
+        with open(target, "w", encoding="utf-8", newline="", buffering=buffer_size) as f:
+            yield f
+
+
+def _write_json(company, f: TextIO) -> int:
+    """Записать {vehicle_id: [клиенты]} по одному клиенту за раз."""
+    count = 0
+    f.write("{")
+    for i, vehicle in enumerate(company.vehicles):
+        f.write(f'{"," if i else ""}\n  {json.dumps(vehicle.vehicle_id)}: [')
+        for j, client in enumerate(vehicle.clients_list):
+            f.write(f'{"," if j else ""}\n    {json.dumps(client.to_dict(), ensure_ascii=False)}')
+            count += 1
+        f.write("\n  ]" if vehicle.clients_list else "]")
+    f.write("\n}\n")
+    return count
+
+
+def _write_jsonl(company, f: TextIO) -> int:
+    """Записать по одной строке JSON на каждого размещенного клиента."""
+    count = 0
+    for vehicle, client in iter_assignments(company):
+        f.write(json.dumps({"vehicle_id": vehicle.vehicle_id, **client.to_dict()}, ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def _write_csv(company, f: TextIO) -> int:
+    """Записать таблицу ТС ID, Имя клиента, Вес, VIP."""
+    count = 0
+    writer = csv.writer(f)
+    writer.writerow(["ТС ID", "Имя клиента", "Вес", "VIP"])
+    for vehicle, client in iter_assignments(company):
+        writer.writerow([vehicle.vehicle_id, client.name, client.cargo_weight, "Да" if client.is_vip else "Нет"])
+        count += 1
+    return count
+
+
+def _write_txt(company, f: TextIO) -> int:
+    """Записать текстовый отчет, сгруппированный по транспорту."""
+    count = 0
+    for vehicle in company.vehicles:
+        if not vehicle.clients_list:
+            continue
+        f.write(f"{vehicle.vehicle_id}:\n")
+        for client in vehicle.clients_list:
+            f.write(f"  • {client.name} — {client.cargo_weight}т (VIP: {client.is_vip})\n")
+            count += 1
+        f.write("\n")
+    return count
+
+
+_WRITERS = {
+    "json": _write_json,
+    "jsonl": _write_jsonl,
+    "csv": _write_csv,
+    "txt": _write_txt
+}
+
+
+def export_distribution(company, target: Union[PathLike, TextIO], fmt: Optional[str] = None,
+                        buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """
+    Потоково выгрузить текущее распределение грузов.
+
+    Записи формируются по одной прямо из списков клиентов транспорта и
+    сбрасываются на диск блоками по buffer_size байт, поэтому расход
+    памяти не зависит от объема выгрузки.
+
+    Args:
+        company: Транспортная компания
+        target: Путь к файлу или открытый текстовый поток
+        fmt: Формат (json, jsonl, csv, txt); по умолчанию - по расширению файла
+        buffer_size: Размер буфера записи в байтах
+
+    Returns:
+        Количество выгруженных назначений
+    """
+    if fmt is None:
+        fmt = Path(getattr(target, "name", str(target))).suffix.lstrip(".") or "txt"
+    fmt = fmt.lower()
+    if fmt not in _WRITERS:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}. Доступны: {', '.join(EXPORT_FORMATS)}")
+    if buffer_size <= 0:
+        raise ValueError("Размер буфера должен быть положительным числом")
+
+    with instrumentation.span("export_distribution"), _open_output(target, buffer_size) as f:
+        return _WRITERS[fmt](company, f)
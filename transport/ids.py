@@ -0,0 +1,169 @@
+import os
+import random
+import sys
+import warnings
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Container, Iterator, Union
+from . import instrumentation
+
+# Длина ID транспорта: 8 шестнадцатеричных символов, как у прежнего str(uuid4())[:8]
+ID_BITS = 32
+
+
+class IdAllocator(ABC):
+    """
+    Базовый класс генератора ID транспорта.
+
+    Генератор не хранит выданные ID: уникальность обеспечивает область,
+    где она нужна, - компания (TransportCompany) передает свои занятые ID
+    в allocate(), и совпадающий кандидат генерируется заново. Поэтому
+    память не растет со временем работы процесса, а повторная загрузка
+    тех же данных не дает ложных совпадений. Все ID интернируются
+    (sys.intern): словари, где ключ - vehicle_id, сравнивают их по ссылке.
+    Подклассы реализуют _next().
+    """
+
+    @abstractmethod
+    def _next(self) -> str:
+        """Следующий кандидат в ID."""
+
+    def allocate(self, taken: Container[str] = ()) -> str:
+        """
+        Выдать новый ID.
+
+        Args:
+            taken: Занятые ID, которые нельзя выдать (например, ID транспорта компании)
+
+        Returns:
+            Интернированный ID
+        """
+        while True:
+            candidate = self._next()
+            if candidate not in taken:
+                return sys.intern(candidate)
+
+
+class CounterAllocator(IdAllocator):
+    """Монотонный счетчик: ID 00000001, 00000002, ..."""
+
+    def __init__(self, start: int = 1):
+        """
+        Инициализация счетчика.
+
+        Args:
+            start: Первое значение счетчика
+        """
+        self._counter = start
+
+    def _next(self) -> str:
+        candidate = format(self._counter, "08x")
+        self._counter += 1
+        return candidate
+
+
+class SeededAllocator(IdAllocator):
+    """Детерминированные псевдослучайные ID: одно зерно - одна последовательность."""
+
+    def __init__(self, seed: int = 0):
+        """
+        Инициализация генератора.
+
+        Args:
+            seed: Зерно генератора
+        """
+        self._random = random.Random(seed)
+
+    def _next(self) -> str:
+        return format(self._random.getrandbits(ID_BITS), "08x")
+
+
+class RandomAllocator(SeededAllocator):
+    """
+    Случайные ID, разные при каждом запуске (по умолчанию).
+
+    Генератор один раз получает зерно из os.urandom, после чего ID
+    выдаются без системных вызовов и форматирования UUID.
+    """
+
+    def __init__(self):
+        super().__init__(int.from_bytes(os.urandom(16), "big"))
+
+    def reseed(self) -> None:
+        """Получить новое зерно (после fork, чтобы процессы не выдавали одинаковые ID)."""
+        self._random.seed(int.from_bytes(os.urandom(16), "big"))
+
+
+_allocator: IdAllocator = RandomAllocator()
+
+
+def _after_fork() -> None:
+    if isinstance(_allocator, RandomAllocator):
+        _allocator.reseed()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def get_allocator() -> IdAllocator:
+    """Получить текущий генератор ID."""
+    return _allocator
+
+
+def set_allocator(allocator: IdAllocator) -> IdAllocator:
+    """
+    Установить генератор ID для нового транспорта.
+
+    Args:
+        allocator: Генератор ID
+
+    Returns:
+        Предыдущий генератор
+    """
+    global _allocator
+    previous, _allocator = _allocator, allocator
+    return previous
+
+
+@contextmanager
+def use_allocator(allocator: IdAllocator) -> Iterator[IdAllocator]:
+    """
+    Временно использовать генератор ID, например для воспроизводимого парка:
+
+        with use_allocator(SeededAllocator(42)):
+            fleet = [Van(10) for _ in range(1000)]
+    """
+    previous = set_allocator(allocator)
+    try:
+        yield allocator
+    finally:
+        set_allocator(previous)
+
+
+def allocate_id(taken: Container[str] = ()) -> str:
+    """Выдать новый ID текущим генератором, не совпадающий с занятыми taken."""
+    return _allocator.allocate(taken)
+
+
+def intern_id(vehicle_id: str) -> str:
+    """Интернировать существующий ID (например, загруженный из файла)."""
+    return sys.intern(vehicle_id)
+
+
+def report_duplicates(count: int, source: Union[str, os.PathLike]) -> None:
+    """
+    Сообщить о транспорте, получившем новый ID из-за повтора в данных.
+
+    Загрузчики JSON, двоичного снимка и SQLite добавляют транспорт через
+    TransportCompany.add_vehicle, которая выдает повторяющемуся ID новый,
+    и сообщают о таких случаях одинаково: счетчиком диагностики
+    ids.duplicate_vehicle_ids и предупреждением.
+
+    Args:
+        count: Сколько транспорта получило новый ID
+        source: Источник данных (для текста предупреждения)
+    """
+    if count:
+        instrumentation.count("ids.duplicate_vehicle_ids", count)
+        warnings.warn(f"{source}: повторяющихся ID транспорта - {count}, выданы новые ID", stacklevel=3)
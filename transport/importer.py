@@ -0,0 +1,268 @@
+import csv
+import json
+import math
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+from .client import Client
+
+try:
+    import numpy as np
+except ImportError:  # NumPy - необязательная зависимость
+    np = None
+
+PathLike = Union[str, Path]
+# Строка файла: (номер строки, словарь полей или None, если строку не удалось разобрать)
+Row = Tuple[int, Optional[dict]]
+
+VIP_TRUE = {"1", "true", "yes", "да", "vip"}
+VIP_FALSE = {"", "0", "false", "no", "нет"}
+
+
+class ImportReport:
+    """
+    Итог импорта клиентов.
+
+    Хранит не больше max_errors описаний ошибок, чтобы память не росла
+    на файлах с большим числом некорректных строк; общее число ошибок
+    считается всегда.
+    """
+
+    def __init__(self, max_errors: int = 1000):
+        """
+        Инициализация отчета.
+
+        Args:
+            max_errors: Максимальное число сохраняемых описаний ошибок
+        """
+        self.max_errors = max_errors
+        self.imported = 0
+        self.error_count = 0
+        self.errors: List[Tuple[int, str]] = []
+
+    def add_error(self, line: int, message: str) -> None:
+        """
+        Зарегистрировать ошибку в строке файла.
+
+        Args:
+            line: Номер строки (с единицы)
+            message: Описание ошибки
+        """
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, message))
+
+    def __str__(self):
+        return f"Импортировано клиентов: {self.imported}, ошибок: {self.error_count}"
+
+
+def iter_csv_rows(path: PathLike) -> Iterator[Row]:
+    """
+    Построчно прочитать CSV-файл с заголовком name, cargo_weight, is_vip.
+
+    Необязательные столбцы требований к перевозке: volume,
+    requires_refrigeration, altitude_limit.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Итератор по парам (номер строки, словарь полей)
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = {"name", "cargo_weight"} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"В заголовке CSV нет столбцов: {', '.join(sorted(missing))}")
+        for row in reader:
+            yield reader.line_num, row
+
+
+def iter_jsonl_rows(path: PathLike) -> Iterator[Row]:
+    """
+    Построчно прочитать файл JSON Lines с объектами клиентов.
+
+    Пустые строки пропускаются, строки с некорректным JSON возвращаются
+    как (номер строки, None).
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Итератор по парам (номер строки, словарь полей или None)
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_no, row if isinstance(row, dict) else None
+
+
+def _parse_weight(value) -> float:
+    """Привести вес груза к float."""
+    if isinstance(value, bool) or value is None:
+        raise ValueError("Вес груза должен быть положительным числом")
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"Некорректный вес груза: {value!r}") from None
+    if isinstance(value, (int, float)):
+        return float(value)
+    raise ValueError("Вес груза должен быть положительным числом")
+
+
+def _parse_flag(value, message: str) -> bool:
+    """Привести флаг к bool (в CSV допускаются 1/0, true/false, да/нет)."""
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    text = str(value).strip().lower()
+    if text in VIP_TRUE:
+        return True
+    if text in VIP_FALSE:
+        return False
+    raise ValueError(f"{message}: {value!r}")
+
+
+def _parse_vip(value) -> bool:
+    """Привести VIP-статус к bool."""
+    return _parse_flag(value, "Некорректный VIP-статус")
+
+
+def _parse_optional(value, message: str) -> Optional[float]:
+    """Привести необязательное положительное число к float (пустое значение - None)."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"{message}: {value!r}")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{message}: {value!r}") from None
+    if not (number > 0 and math.isfinite(number)):
+        raise ValueError(f"{message}: {value!r}")
+    return number
+
+
+def validate_batch(batch: Iterable[Row], report: ImportReport) -> List[Client]:
+    """
+    Проверить пакет строк и создать клиентов для корректных.
+
+    Типы полей разбираются построчно, проверка диапазона весов выполняется
+    для всего пакета сразу (векторно, если установлен NumPy). Требования
+    к перевозке (объем, холодильник, ограничение высоты) необязательны.
+    Ошибки записываются в отчет с номерами строк.
+
+    Args:
+        batch: Пакет строк
+        report: Отчет импорта
+
+    Returns:
+        Список клиентов из корректных строк
+    """
+    lines, names, weights, vips, requirements = [], [], [], [], []
+    errors = []
+    for line_no, row in batch:
+        if row is None:
+            errors.append((line_no, "Строка не является объектом JSON"))
+            continue
+        try:
+            name = row.get("name")
+            if not isinstance(name, str) or not name.strip():
+                raise ValueError("Имя клиента должно быть непустой строкой")
+            weight = _parse_weight(row.get("cargo_weight"))
+            is_vip = _parse_vip(row.get("is_vip"))
+            required = (
+                _parse_optional(row.get("volume"), "Некорректный объем груза"),
+                _parse_flag(row.get("requires_refrigeration"), "Некорректное требование холодильника"),
+                _parse_optional(row.get("altitude_limit"), "Некорректное ограничение высоты"),
+            )
+        except ValueError as e:
+            errors.append((line_no, str(e)))
+            continue
+        lines.append(line_no)
+        names.append(name)
+        weights.append(weight)
+        vips.append(is_vip)
+        requirements.append(required)
+
+    if np is not None and weights:
+        column = np.fromiter(weights, dtype=np.float64, count=len(weights))
+        bad = (~(np.isfinite(column) & (column > 0))).tolist()
+    else:
+        bad = [not (w > 0 and math.isfinite(w)) for w in weights]
+
+    clients = []
+    for line_no, name, weight, is_vip, required, is_bad in zip(lines, names, weights, vips, requirements, bad):
+        if is_bad:
+            errors.append((line_no, "Вес груза должен быть положительным числом"))
+        else:
+            clients.append(Client.from_validated(name, weight, is_vip, *required))
+
+    for line_no, message in sorted(errors):
+        report.add_error(line_no, message)
+    return clients
+
+
+def iter_client_batches(rows: Iterable[Row], report: ImportReport,
+                        batch_size: int = 10_000) -> Iterator[List[Client]]:
+    """
+    Разбить поток строк на пакеты и проверить каждый.
+
+    В памяти одновременно находится не больше batch_size строк.
+
+    Args:
+        rows: Поток строк
+        report: Отчет импорта
+        batch_size: Размер пакета
+
+    Returns:
+        Итератор по спискам корректных клиентов
+    """
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield validate_batch(batch, report)
+
+
+def import_clients(company, path: PathLike, fmt: Optional[str] = None,
+                   batch_size: int = 10_000, max_errors: int = 1000) -> ImportReport:
+    """
+    Потоково импортировать клиентов из CSV или JSON Lines.
+
+    Файл читается генератором, проверяется пакетами и передается в
+    company.add_client; некорректные строки пропускаются и попадают
+    в отчет с номерами строк.
+
+    Args:
+        company: Транспортная компания
+        path: Путь к файлу
+        fmt: Формат ("csv" или "jsonl"); по умолчанию - по расширению файла
+        batch_size: Размер пакета проверки
+        max_errors: Максимальное число сохраняемых описаний ошибок
+
+    Returns:
+        Отчет импорта
+    """
+    fmt = (fmt or Path(path).suffix.lstrip(".")).lower()
+    if fmt == "csv":
+        rows = iter_csv_rows(path)
+    elif fmt in ("jsonl", "ndjson"):
+        rows = iter_jsonl_rows(path)
+    else:
+        raise ValueError(f"Неизвестный формат импорта: {fmt}. Доступны: csv, jsonl")
+
+    report = ImportReport(max_errors)
+    for clients in iter_client_batches(rows, report, batch_size):
+        for client in clients:
+            company.add_client(client)
+        report.imported += len(clients)
+    return report
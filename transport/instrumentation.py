@@ -0,0 +1,254 @@
+import atexit
+import cProfile
+import json
+import multiprocessing
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Переменная окружения, включающая сбор при импорте: "1" - интервалы и
+# счетчики, "cprofile" и/или "tracemalloc" (через запятую) - также профиль
+# вызовов и распределение памяти
+ENV_VAR = "TRANSPORT_PROFILE"
+# Необязательный путь, куда при завершении процесса записывается JSON-отчет
+OUTPUT_ENV_VAR = "TRANSPORT_PROFILE_OUTPUT"
+
+# Сколько самых затратных функций и строк выделения памяти попадает в отчет
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 10
+
+# Флаг читается в горячем коде как instrumentation.enabled: при выключенном
+# сборе span() возвращает общий пустой контекст, а count() сразу выходит
+enabled = False
+
+_NULL_SPAN = nullcontext()
+_lock = threading.Lock()
+_local = threading.local()
+_spans: Dict[str, List[float]] = {}    # имя -> [вызовы, сумма с, максимум с]
+_counters: Dict[str, int] = {}
+_profile_calls = False
+_stats: Optional[pstats.Stats] = None
+
+
+class _Span:
+    """Замер интервала; самый внешний интервал потока включает cProfile."""
+
+    __slots__ = ("name", "start", "nested", "profile")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.nested = _profile_calls
+        self.profile: Optional[cProfile.Profile] = None
+
+    def __enter__(self):
+        if self.nested:
+            depth = getattr(_local, "depth", 0)
+            _local.depth = depth + 1
+            if depth == 0:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                    self.profile = profile
+                except ValueError:
+                    # Профилировщик уже активен (в другом потоке или снаружи)
+                    pass
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        with _lock:
+            entry = _spans.get(self.name)
+            if entry is None:
+                _spans[self.name] = [1, elapsed, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+                if elapsed > entry[2]:
+                    entry[2] = elapsed
+        if self.nested:
+            _local.depth -= 1
+        if self.profile is not None:
+            self.profile.disable()
+            _merge_profile(self.profile)
+        return False
+
+
+def _merge_profile(profile: cProfile.Profile) -> None:
+    """Добавить профиль интервала к накопленной статистике."""
+    global _stats
+    with _lock:
+        if _stats is None:
+            _stats = pstats.Stats(profile)
+        else:
+            _stats.add(profile)
+
+
+def span(name: str):
+    """
+    Замерить интервал работы блока:
+
+        with instrumentation.span("save_snapshot"):
+            ...
+
+    При выключенном сборе возвращается общий пустой контекст.
+
+    Args:
+        name: Имя интервала (постоянная строка: на горячем пути не форматируется)
+
+    Returns:
+        Контекстный менеджер
+    """
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """
+    Увеличить счетчик.
+
+    Args:
+        name: Имя счетчика
+        n: Приращение
+    """
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def enable(cprofile: bool = False, memory: bool = False) -> None:
+    """
+    Включить сбор интервалов и счетчиков.
+
+    Args:
+        cprofile: Профилировать вызовы (cProfile) внутри самых внешних интервалов
+        memory: Отслеживать выделение памяти (tracemalloc)
+    """
+    global enabled, _profile_calls
+    _profile_calls = cprofile
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    enabled = True
+
+
+def disable() -> None:
+    """Выключить сбор (накопленные данные сохраняются до reset())."""
+    global enabled, _profile_calls
+    enabled = False
+    _profile_calls = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def reset() -> None:
+    """Очистить накопленные интервалы, счетчики и профиль."""
+    global _stats
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _stats = None
+    if tracemalloc.is_tracing():
+        tracemalloc.clear_traces()
+        tracemalloc.reset_peak()
+
+
+def _profile_report() -> List[dict]:
+    """Самые затратные функции по суммарному времени с вложенными вызовами."""
+    if _stats is None:
+        return []
+    rows = []
+    for (filename, line, function), (_, calls, total, cumulative, _) in _stats.stats.items():
+        rows.append({
+            "function": f"{Path(filename).name}:{line}({function})",
+            "calls": calls,
+            "total_ms": total * 1000,
+            "cumulative_ms": cumulative * 1000
+        })
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:TOP_FUNCTIONS]
+
+
+def _memory_report() -> Optional[dict]:
+    """Текущий и пиковый объем памяти и строки с наибольшим выделением."""
+    if not tracemalloc.is_tracing():
+        return None
+    current, peak = tracemalloc.get_traced_memory()
+    top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+    return {
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "top": [{"line": f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno}",
+                 "size_bytes": s.size, "count": s.count} for s in top]
+    }
+
+
+def snapshot() -> dict:
+    """
+    Получить накопленные данные.
+
+    Returns:
+        Словарь: enabled, spans (имя -> calls, total_ms, mean_ms, max_ms),
+        counters, vehicles_scanned_per_client (если были размещения), а при
+        профилировании - profile (самые затратные функции) и memory
+    """
+    with _lock:
+        spans = {
+            name: {"calls": calls, "total_ms": total * 1000,
+                   "mean_ms": total * 1000 / calls, "max_ms": peak * 1000}
+            for name, (calls, total, peak) in sorted(_spans.items())
+        }
+        counters = dict(sorted(_counters.items()))
+        profile = _profile_report()
+    report = {"enabled": enabled, "spans": spans, "counters": counters}
+    tried = counters.get("packing.placements_tried")
+    if tried:
+        report["vehicles_scanned_per_client"] = counters.get("packing.vehicles_scanned", 0) / tried
+    if profile:
+        report["profile"] = profile
+    memory = _memory_report()
+    if memory is not None:
+        report["memory"] = memory
+    return report
+
+
+def to_json(indent: Optional[int] = 2) -> str:
+    """Накопленные данные в виде JSON."""
+    return json.dumps(snapshot(), ensure_ascii=False, indent=indent)
+
+
+def export_json(path: Union[str, os.PathLike]) -> int:
+    """
+    Записать накопленные данные в JSON-файл.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Количество записанных байт
+    """
+    data = to_json().encode("utf-8")
+    Path(path).write_bytes(data)
+    return len(data)
+
+
+def configure_from_env() -> None:
+    """Включить сбор по переменной окружения TRANSPORT_PROFILE."""
+    value = os.environ.get(ENV_VAR, "").strip().lower()
+    if value in ("", "0", "off", "false", "no"):
+        return
+    modes = {mode.strip() for mode in value.split(",")}
+    enable(cprofile="cprofile" in modes, memory="tracemalloc" in modes)
+    output = os.environ.get(OUTPUT_ENV_VAR)
+    # Процессы-исполнители (шарды, сценарии) не перезаписывают отчет основного процесса
+    if output and multiprocessing.parent_process() is None:
+        atexit.register(export_json, output)
+
+
+configure_from_env()
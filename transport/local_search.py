@@ -0,0 +1,263 @@
+import time
+from itertools import islice
+from typing import Dict, List, Optional, Sequence, Tuple
+from .vehicle import CAPACITY_TOLERANCE, Vehicle, fits
+from .client import Client
+from .capacity_index import CategoryIndex
+
+Placement = Tuple[Client, Vehicle]
+
+# Сколько транспорта с наибольшим свободным местом просматривается при поиске обмена
+MAX_CANDIDATES = 32
+
+
+class _Plan:
+    """
+    Изменяемое состояние плана для локального поиска.
+
+    Загрузка по весу и объему хранится по транспорту, поэтому проверка
+    хода (приращение загрузки двух ТС) стоит O(1), а индекс свободного
+    места обновляется только для затронутого транспорта.
+    """
+
+    def __init__(self, placements: Sequence[Placement]):
+        self.contents: Dict[Vehicle, List[Client]] = {}
+        self.load: Dict[Vehicle, float] = {}
+        self.volume: Dict[Vehicle, float] = {}
+        for client, vehicle in placements:
+            self.contents.setdefault(vehicle, []).append(client)
+            self.load[vehicle] = self.load.get(vehicle, 0.0) + client.cargo_weight
+            self.volume[vehicle] = self.volume.get(vehicle, 0.0) + (client.volume or 0.0)
+        used = list(self.contents)
+        self.index = CategoryIndex(
+            used,
+            (v.capacity - self.load[v] for v in used),
+            (None if v.volume_capacity is None else v.volume_capacity - self.volume[v] for v in used)
+        )
+        self.journal: List[Tuple[Client, Vehicle, Vehicle]] = []
+
+    def fits(self, vehicle: Vehicle, weight: float, volume: float) -> bool:
+        """Поместится ли в транспорт приращение веса и объема (может быть отрицательным)."""
+        if not fits(self.load[vehicle], weight, vehicle.capacity):
+            return False
+        return vehicle.volume_capacity is None or fits(self.volume[vehicle], volume, vehicle.volume_capacity)
+
+    def transfer(self, client: Client, source: Vehicle, target: Vehicle) -> None:
+        """Перенести груз клиента и записать ход в журнал для отката."""
+        self.contents[source].remove(client)
+        self.contents[target].append(client)
+        self.load[source] -= client.cargo_weight
+        self.load[target] += client.cargo_weight
+        volume = client.volume or 0.0
+        self.volume[source] -= volume
+        self.volume[target] += volume
+        if source in self.index:
+            self.index.release(source, client)
+        if target in self.index:
+            self.index.consume(target, client)
+        self.journal.append((client, source, target))
+
+    def rollback(self) -> None:
+        """Отменить все ходы из журнала."""
+        while self.journal:
+            client, source, target = self.journal.pop()
+            self.transfer(client, target, source)
+            self.journal.pop()
+
+
+def _swap_one(plan: _Plan, vehicle: Vehicle, client: Client) -> bool:
+    """
+    Обмен 1-1: груз client уходит в другой ТС, оттуда приходит более легкий.
+
+    Выбирается самый легкий подходящий груз, чтобы загрузка освобождаемого
+    транспорта уменьшилась как можно сильнее.
+    """
+    weight, volume = client.cargo_weight, client.volume or 0.0
+    for other in islice(plan.index.candidates(client), MAX_CANDIDATES):
+        need = weight - (other.capacity - plan.load[other])
+        if need >= weight:
+            # Транспорт упорядочен по убыванию свободного места: дальше места нет
+            break
+        best: Optional[Client] = None
+        for swap in plan.contents[other]:
+            w = swap.cargo_weight
+            if not need <= w < weight or (best is not None and w >= best.cargo_weight):
+                continue
+            delta_volume = volume - (swap.volume or 0.0)
+            if (vehicle.accepts(swap) and plan.fits(other, weight - w, delta_volume)
+                    and plan.fits(vehicle, w - weight, -delta_volume)):
+                best = swap
+        if best is not None:
+            plan.transfer(best, other, vehicle)
+            plan.transfer(client, vehicle, other)
+            return True
+    return False
+
+
+def _swap_two(plan: _Plan, vehicle: Vehicle, client: Client) -> bool:
+    """
+    Обмен 2-1: client и еще один груз уходят в другой ТС, оттуда приходит один
+    груз легче их суммы - освобождаемый транспорт теряет один груз и вес.
+    """
+    for pair in plan.contents[vehicle]:
+        if pair is client:
+            continue
+        weight = client.cargo_weight + pair.cargo_weight
+        volume = (client.volume or 0.0) + (pair.volume or 0.0)
+        for other in islice(plan.index.candidates(client), MAX_CANDIDATES):
+            need = weight - (other.capacity - plan.load[other])
+            if need >= weight:
+                break
+            if not other.accepts(pair):
+                continue
+            for swap in plan.contents[other]:
+                w = swap.cargo_weight
+                if not need <= w < weight:
+                    continue
+                delta_volume = volume - (swap.volume or 0.0)
+                if (vehicle.accepts(swap) and plan.fits(other, weight - w, delta_volume)
+                        and plan.fits(vehicle, w - weight, -delta_volume)):
+                    plan.transfer(swap, other, vehicle)
+                    plan.transfer(client, vehicle, other)
+                    plan.transfer(pair, vehicle, other)
+                    return True
+    return False
+
+
+def _consolidate(plan: _Plan, vehicles: Sequence[Vehicle], deadline: float, stats: dict) -> None:
+    """
+    Перегрузить несколько наименее загруженных ТС в один незадействованный.
+
+    Незадействованный транспорт обходится по убыванию грузоподъемности;
+    в него целиком переносятся грузы задействованного транспорта в порядке
+    возрастания загрузки, пока они помещаются. Если перенесены грузы хотя
+    бы двух ТС, число транспорта уменьшается.
+    """
+    unused = sorted((v for v in vehicles if v not in plan.contents), key=lambda v: v.capacity, reverse=True)
+    donors = sorted(plan.contents, key=plan.load.__getitem__)
+    for spare in unused:
+        if time.perf_counter() > deadline or len(donors) < 2:
+            break
+        room = spare.capacity
+        room_volume = float("inf") if spare.volume_capacity is None else spare.volume_capacity
+        chosen = []
+        for donor in donors:
+            load = plan.load[donor]
+            if load > room + CAPACITY_TOLERANCE:
+                # Доноры упорядочены по возрастанию загрузки: дальше не поместятся
+                break
+            if plan.volume[donor] <= room_volume + CAPACITY_TOLERANCE and all(spare.accepts(c) for c in plan.contents[donor]):
+                chosen.append(donor)
+                room -= load
+                room_volume -= plan.volume[donor]
+        if len(chosen) < 2:
+            continue
+
+        plan.contents[spare] = []
+        plan.load[spare] = plan.volume[spare] = 0.0
+        plan.index.add(spare, spare.capacity, spare.volume_capacity)
+        for donor in chosen:
+            for client in list(plan.contents[donor]):
+                plan.transfer(client, donor, spare)
+                stats["moves"] += 1
+            del plan.contents[donor]
+            plan.index.remove(donor)
+        plan.journal.clear()
+        chosen_ids = set(map(id, chosen))
+        donors = [d for d in donors if id(d) not in chosen_ids]
+        stats["vehicles_saved"] += len(chosen) - 1
+
+
+def _empty(plan: _Plan, vehicle: Vehicle, deadline: float, stats: dict) -> bool:
+    """
+    Освободить транспорт, перенеся его грузы в другой задействованный транспорт.
+
+    Самый тяжелый груз переносится в транспорт с наименьшим достаточным
+    местом (Best Fit), а если места нет - обменивается 1-1 или 2-1 на более
+    легкие. Каждый ход уменьшает число грузов или вес освобождаемого
+    транспорта, поэтому процесс конечен. При неудаче все ходы откатываются.
+    """
+    free = plan.index.free(vehicle)
+    free_volume = None if vehicle.volume_capacity is None else vehicle.volume_capacity - plan.volume[vehicle]
+    plan.index.remove(vehicle)
+    plan.journal.clear()
+    moves = swaps = 0
+
+    contents = plan.contents[vehicle]
+    while contents:
+        if time.perf_counter() > deadline:
+            break
+        client = max(contents, key=lambda c: c.cargo_weight)
+        target = plan.index.best_fit(client)
+        if target is not None:
+            plan.transfer(client, vehicle, target)
+            moves += 1
+        elif _swap_one(plan, vehicle, client) or _swap_two(plan, vehicle, client):
+            swaps += 1
+        else:
+            break
+
+    if contents:
+        plan.rollback()
+        plan.index.add(vehicle, free, free_volume)
+        return False
+
+    del plan.contents[vehicle]
+    stats["moves"] += moves
+    stats["swaps"] += swaps
+    return True
+
+
+def improve(placements: Sequence[Placement], vehicles: Sequence[Vehicle] = (),
+            budget_ms: float = 50.0) -> Tuple[List[Placement], dict]:
+    """
+    Улучшить план локальным поиском: освободить задействованный транспорт.
+
+    Сначала наименее загруженный транспорт перегружается в более
+    вместительный незадействованный (см. _consolidate). Затем транспорт
+    обходится от наименее загруженного, и для каждого делается попытка
+    перенести все его грузы в остальной задействованный транспорт ходами
+    переноса и обменами 1-1 и 2-1 (см. _empty). Проходы повторяются, пока
+    они освобождают транспорт и не истек бюджет времени. Размещенные
+    клиенты остаются размещенными, ограничения по весу, объему и
+    совместимости соблюдаются.
+
+    Args:
+        placements: Пары клиент-транспорт исходного плана
+        vehicles: Весь парк (нужен для перегрузки в незадействованный транспорт)
+        budget_ms: Бюджет времени в миллисекундах
+
+    Returns:
+        Кортеж (пары клиент-транспорт улучшенного плана, итоги: vehicles_saved,
+        moves, swaps, elapsed_ms, budget_ms и saved_per_ms - освобожденный
+        транспорт на миллисекунду работы)
+    """
+    start = time.perf_counter()
+    deadline = start + budget_ms / 1000
+    plan = _Plan(placements)
+    stats = {"vehicles_saved": 0, "moves": 0, "swaps": 0}
+    _consolidate(plan, vehicles, deadline, stats)
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        spare = sum(plan.index.free(v) for v in plan.contents)
+        for vehicle in sorted(plan.contents, key=plan.load.__getitem__):
+            if time.perf_counter() > deadline:
+                break
+            load = plan.load[vehicle]
+            # Грузы не поместятся в свободное место остального транспорта
+            if load > spare - plan.index.free(vehicle):
+                continue
+            if _empty(plan, vehicle, deadline, stats):
+                stats["vehicles_saved"] += 1
+                spare -= vehicle.capacity
+                improved = True
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    stats.update(
+        elapsed_ms=elapsed_ms,
+        budget_ms=budget_ms,
+        saved_per_ms=stats["vehicles_saved"] / elapsed_ms if elapsed_ms else 0.0
+    )
+    return [(client, vehicle) for vehicle, clients in plan.contents.items() for client in clients], stats
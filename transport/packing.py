@@ -0,0 +1,414 @@
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from .vehicle import Vehicle, fits
+from .client import Client
+from .capacity_index import CategoryIndex, FreeCapacityIndex, FirstFitTree
+from .bounds import lower_bound, plan_bounds
+from .local_search import improve
+from . import instrumentation
+
+Placement = Tuple[Client, Vehicle]
+PackingPlan = Tuple[List[Placement], List[Client]]
+
+# Реестр стратегий: имя -> функция (clients, vehicles, **options) -> (placements, failed)
+STRATEGIES: Dict[str, Callable[..., PackingPlan]] = {}
+
+DEFAULT_STRATEGY = "best_fit_decreasing"
+
+
+class PackingCancelled(Exception):
+    """Планирование прервано по запросу (is_cancelled вернул True)."""
+
+
+def register_strategy(name: str):
+    """
+    Зарегистрировать стратегию распределения под заданным именем.
+
+    Args:
+        name: Имя стратегии в реестре
+
+    Returns:
+        Декоратор, возвращающий функцию без изменений
+    """
+    def decorator(func):
+        STRATEGIES[name] = func
+        return func
+    return decorator
+
+
+def get_strategy(name: str) -> Callable[..., PackingPlan]:
+    """
+    Получить стратегию распределения по имени.
+
+    Args:
+        name: Имя стратегии
+
+    Returns:
+        Функция стратегии
+    """
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Неизвестная стратегия распределения: {name}. "
+                         f"Доступны: {', '.join(sorted(STRATEGIES))}") from None
+
+
+def sort_clients(clients: Sequence[Client]) -> List[Client]:
+    """
+    Упорядочить клиентов для распределения: сначала VIP, затем по убыванию веса.
+
+    Args:
+        clients: Клиенты
+
+    Returns:
+        Новый отсортированный список
+    """
+    return sorted(clients, key=lambda c: (not c.is_vip, -c.cargo_weight))
+
+
+def _greedy(clients: Sequence[Client], find: Callable[[Client], Optional[Vehicle]],
+            index: CategoryIndex, progress=None, is_cancelled=None) -> PackingPlan:
+    """
+    Общий цикл жадных стратегий.
+
+    Args:
+        clients: Клиенты
+        find: Поиск совместимого транспорта, где хватает веса и объема для груза клиента
+        index: Индекс, в котором учитываются размещения
+        progress: Необязательный обратный вызов с процентом выполнения
+        is_cancelled: Необязательная проверка запроса на отмену
+
+    Returns:
+        Кортеж (список пар клиент-транспорт, список неразмещенных клиентов)
+    """
+    placements: List[Placement] = []
+    failed: List[Client] = []
+
+    ordered = sort_clients(clients)
+    total = len(ordered)
+    step = max(1, total // 100)
+    rejected = index.rejected
+
+    for i, client in enumerate(ordered):
+        if i % step == 0:
+            if is_cancelled is not None and is_cancelled():
+                raise PackingCancelled()
+            if progress is not None:
+                progress(i * 100 // total)
+
+        vehicle = find(client)
+        if vehicle is None:
+            failed.append(client)
+            continue
+
+        index.consume(vehicle, client)
+        placements.append((client, vehicle))
+
+    if progress is not None:
+        progress(100)
+    # Просмотренный транспорт: найденный кандидат и отвергнутые проверкой объема
+    instrumentation.count("packing.placements_tried", total)
+    instrumentation.count("packing.placements_failed", len(failed))
+    instrumentation.count("packing.vehicles_scanned", len(placements) + index.rejected - rejected)
+    return placements, failed
+
+
+def _score(plan: PackingPlan) -> Tuple[int, float, int]:
+    """Оценка плана: размещенные VIP, размещенный вес, минус задействованный транспорт."""
+    placed = plan[0]
+    used = len({id(v) for _, v in placed})
+    return (sum(c.is_vip for c, _ in placed), sum(c.cargo_weight for c, _ in placed), -used)
+
+
+def is_proven_optimal(plan: PackingPlan, vehicles: Sequence[Vehicle]) -> bool:
+    """
+    Проверить, что план доказуемо оптимален.
+
+    План оптимален, если размещены все клиенты, а число задействованного
+    транспорта совпадает с нижней границей bounds.lower_bound.
+
+    Args:
+        plan: Кортеж (размещения, неразмещенные клиенты)
+        vehicles: Весь парк
+
+    Returns:
+        True если лучшего плана не существует
+    """
+    placements, failed = plan
+    if failed:
+        return False
+    used = len({id(v) for _, v in placements})
+    return used <= lower_bound((c.cargo_weight for c, _ in placements), (v.capacity for v in vehicles))
+
+
+def _empty_fleet_index(vehicles: Sequence[Vehicle], factory=FreeCapacityIndex) -> CategoryIndex:
+    """Индексы пустого транспорта по категориям груза."""
+    return CategoryIndex(vehicles, (v.capacity for v in vehicles),
+                         (v.volume_capacity for v in vehicles), factory)
+
+
+def _capacity_index(vehicles: Sequence[Vehicle]) -> CategoryIndex:
+    """Индекс пустого транспорта; при равенстве первым идет более вместительный."""
+    return _empty_fleet_index(sorted(vehicles, key=lambda v: v.capacity, reverse=True))
+
+
+@register_strategy("first_fit")
+def first_fit(clients: Sequence[Client], vehicles: Sequence[Vehicle], **options) -> PackingPlan:
+    """
+    First Fit: груз помещается в первый по списку транспорт, где хватает места.
+
+    Порядок транспорта сохраняется; поиск идет по дереву отрезков своей
+    категории груза за O(log V). Транспортные средства считаются пустыми
+    и не изменяются.
+
+    Returns:
+        Кортеж (список пар клиент-транспорт, список неразмещенных клиентов)
+    """
+    index = _empty_fleet_index(vehicles, FirstFitTree)
+    return _greedy(clients, index.first_fit, index, **options)
+
+
+@register_strategy("best_fit_decreasing")
+def best_fit_decreasing(clients: Sequence[Client], vehicles: Sequence[Vehicle], **options) -> PackingPlan:
+    """
+    Best Fit Decreasing: груз помещается в транспорт с наименьшим достаточным местом.
+
+    План строится по индексам свободной грузоподъемности категорий груза,
+    поэтому каждое размещение стоит O(log V) независимо от требований
+    к перевозке. Транспортные средства считаются пустыми и не изменяются.
+
+    Returns:
+        Кортеж (список пар клиент-транспорт, список неразмещенных клиентов)
+    """
+    index = _capacity_index(vehicles)
+    return _greedy(clients, index.best_fit, index, **options)
+
+
+@register_strategy("worst_fit")
+def worst_fit(clients: Sequence[Client], vehicles: Sequence[Vehicle], **options) -> PackingPlan:
+    """
+    Worst Fit: груз помещается в транспорт с наибольшим свободным местом.
+
+    Дает равномерную загрузку парка ценой большего числа задействованного
+    транспорта. Транспортные средства считаются пустыми и не изменяются.
+
+    Returns:
+        Кортеж (список пар клиент-транспорт, список неразмещенных клиентов)
+    """
+    index = _capacity_index(vehicles)
+    return _greedy(clients, index.worst_fit, index, **options)
+
+
+@register_strategy("exact")
+def exact(clients: Sequence[Client], vehicles: Sequence[Vehicle],
+          max_clients: int = 16, node_limit: int = 200_000, **options) -> PackingPlan:
+    """
+    Точное решение методом ветвей и границ для небольших задач.
+
+    Критерии в порядке важности: число размещенных VIP-клиентов, общий
+    размещенный вес, минимальное число задействованного транспорта.
+    Начальным рекордом служит решение Best Fit Decreasing, поэтому результат
+    не хуже жадного. Если клиентов больше max_clients или жадное решение
+    доказуемо оптимально (is_proven_optimal), перебор не выполняется и
+    возвращается решение Best Fit Decreasing; при превышении node_limit -
+    лучшее найденное.
+
+    Args:
+        clients: Клиенты
+        vehicles: Транспортные средства (считаются пустыми)
+        max_clients: Максимальное число клиентов для перебора
+        node_limit: Максимальное число узлов дерева перебора
+
+    Returns:
+        Кортеж (список пар клиент-транспорт, список неразмещенных клиентов)
+    """
+    greedy_plan = best_fit_decreasing(clients, vehicles, **options)
+    if len(clients) > max_clients or not vehicles or is_proven_optimal(greedy_plan, vehicles):
+        return greedy_plan
+
+    items = sort_clients(clients)
+    n = len(items)
+    capacities = [v.capacity for v in vehicles]
+    loads = [0.0] * len(vehicles)
+    counts = [0] * len(vehicles)
+    inf = float("inf")
+    volume_caps = [inf if v.volume_capacity is None else v.volume_capacity for v in vehicles]
+    volumes = [c.volume or 0.0 for c in items]
+    volume_loads = [0.0] * len(vehicles)
+    # Маска совместимости груза i с транспортом j и «тип» транспорта для отсечения
+    # симметричных вариантов: пустые ТС с одинаковым типом взаимозаменяемы
+    compatible = [[v.accepts(c) for v in vehicles] for c in items]
+    kinds = [(capacities[j], volume_caps[j], tuple(row[j] for row in compatible))
+             for j in range(len(vehicles))]
+
+    # Остаток VIP и веса начиная с позиции i - для оптимистичной оценки
+    vip_left = [0] * (n + 1)
+    cargo_left = [0.0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        vip_left[i] = vip_left[i + 1] + items[i].is_vip
+        cargo_left[i] = cargo_left[i + 1] + items[i].cargo_weight
+
+    best = [_score(greedy_plan), None]
+    choice = [-1] * n
+    nodes = [0]
+
+    def search(i: int, vip: int, cargo: float, used: int) -> None:
+        nodes[0] += 1
+        if nodes[0] > node_limit:
+            return
+        if (vip + vip_left[i], cargo + cargo_left[i], -used) <= best[0]:
+            return
+        if i == n:
+            best[0] = (vip, cargo, -used)
+            best[1] = list(choice)
+            return
+
+        client = items[i]
+        weight = client.cargo_weight
+        volume = volumes[i]
+        accepts = compatible[i]
+        tried_empty = set()
+        # Сначала уже загруженный транспорт, затем пустой (без симметричных повторов)
+        for j in sorted(range(len(vehicles)), key=lambda k: counts[k] == 0):
+            if (not accepts[j] or not fits(loads[j], weight, capacities[j])
+                    or not fits(volume_loads[j], volume, volume_caps[j])):
+                continue
+            if counts[j] == 0:
+                if kinds[j] in tried_empty:
+                    continue
+                tried_empty.add(kinds[j])
+
+            loads[j] += weight
+            volume_loads[j] += volume
+            counts[j] += 1
+            choice[i] = j
+            search(i + 1, vip + client.is_vip, cargo + weight, used + (counts[j] == 1))
+            loads[j] -= weight
+            volume_loads[j] -= volume
+            counts[j] -= 1
+
+        choice[i] = -1
+        search(i + 1, vip, cargo, used)
+
+    search(0, 0, 0.0, 0)
+
+    if best[1] is None:
+        return greedy_plan
+
+    placements = [(items[i], vehicles[j]) for i, j in enumerate(best[1]) if j >= 0]
+    failed = [items[i] for i, j in enumerate(best[1]) if j < 0]
+    return placements, failed
+
+
+@register_strategy("adaptive")
+def adaptive(clients: Sequence[Client], vehicles: Sequence[Vehicle],
+             max_clients: int = 16, node_limit: int = 200_000, **options) -> PackingPlan:
+    """
+    Адаптивная стратегия: от дешевых методов к дорогим до доказанной оптимальности.
+
+    Сначала строится план Best Fit Decreasing, затем First Fit Decreasing
+    (First Fit по транспорту в порядке убывания грузоподъемности), затем,
+    для небольших задач, точный перебор. Как только план доказуемо
+    оптимален (is_proven_optimal), остальные методы пропускаются.
+    Возвращается лучший из построенных планов.
+
+    Args:
+        clients: Клиенты
+        vehicles: Транспортные средства (считаются пустыми)
+        max_clients: Максимальное число клиентов для точного перебора
+        node_limit: Максимальное число узлов дерева перебора
+
+    Returns:
+        Кортеж (список пар клиент-транспорт, список неразмещенных клиентов)
+    """
+    solvers = [
+        lambda: best_fit_decreasing(clients, vehicles, **options),
+        lambda: first_fit(clients, sorted(vehicles, key=lambda v: v.capacity, reverse=True), **options),
+    ]
+    if vehicles and len(clients) <= max_clients:
+        solvers.append(lambda: exact(clients, vehicles, max_clients, node_limit, **options))
+
+    best = None
+    for solve in solvers:
+        plan = solve()
+        if best is None or _score(plan) > _score(best):
+            best = plan
+        if is_proven_optimal(best, vehicles):
+            break
+    return best
+
+
+def run_strategy(name: str, clients: Sequence[Client], vehicles: Sequence[Vehicle],
+                 improve_ms: Optional[float] = None, **options) -> dict:
+    """
+    Выполнить стратегию и замерить ее работу.
+
+    Args:
+        name: Имя стратегии из реестра
+        clients: Клиенты
+        vehicles: Транспортные средства (считаются пустыми)
+        improve_ms: Бюджет улучшения плана локальным поиском в мс
+            (None или 0 - без улучшения), см. local_search.improve
+        **options: Параметры стратегии (progress, is_cancelled, ...)
+
+    Returns:
+        Словарь с планом (placements, failed), временем работы в мс,
+        числом задействованного транспорта, нижней границей этого числа
+        для размещенных грузов (lower_bound) и относительным разрывом
+        (optimality_gap), см. bounds.plan_bounds; с improve_ms - также
+        итоги улучшения (improvement)
+    """
+    strategy = get_strategy(name)
+
+    start = time.perf_counter()
+    with instrumentation.span("packing.strategy"):
+        placements, failed = strategy(clients, vehicles, **options)
+    improvement = None
+    if improve_ms:
+        with instrumentation.span("packing.improve"):
+            placements, improvement = improve(placements, vehicles, improve_ms)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    vehicles_used = len({id(v) for _, v in placements})
+    with instrumentation.span("packing.bounds"):
+        bounds = plan_bounds(placements, vehicles, vehicles_used)
+    run = {
+        "strategy": name,
+        "placements": placements,
+        "failed": failed,
+        "elapsed_ms": elapsed_ms,
+        "vehicles_used": vehicles_used,
+        **bounds
+    }
+    if improvement is not None:
+        run["improvement"] = improvement
+    return run
+
+
+def compare_strategies(clients: Sequence[Client], vehicles: Sequence[Vehicle],
+                       names: Optional[Sequence[str]] = None) -> List[dict]:
+    """
+    Сравнить стратегии на одних и тех же данных.
+
+    Args:
+        clients: Клиенты
+        vehicles: Транспортные средства (считаются пустыми)
+        names: Имена стратегий (по умолчанию все зарегистрированные)
+
+    Returns:
+        Список отчетов: стратегия, время в мс, задействованный транспорт,
+        нижняя граница и разрыв, число неразмещенных клиентов и размещенный вес
+    """
+    reports = []
+    for name in names or list(STRATEGIES):
+        run = run_strategy(name, clients, vehicles)
+        reports.append({
+            "strategy": name,
+            "elapsed_ms": run["elapsed_ms"],
+            "vehicles_used": run["vehicles_used"],
+            "lower_bound": run["lower_bound"],
+            "optimality_gap": run["optimality_gap"],
+            "failed": len(run["failed"]),
+            "cargo_distributed": sum(c.cargo_weight for c, _ in run["placements"])
+        })
+    return reports
@@ -0,0 +1,488 @@
+import copy
+import json
+import os
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+from .vehicle import Vehicle
+from .client import Client
+from .airplane import Airplane
+from .van import Van
+from .ids import report_duplicates
+from . import instrumentation
+from .snapshot import SNAPSHOT_SUFFIX, LazyClientList, encode_snapshot, is_snapshot, open_snapshot
+
+PathLike = Union[str, Path]
+
+
+def company_to_dict(company) -> dict:
+    """
+    Получить снимок данных компании для сохранения.
+
+    Args:
+        company: Транспортная компания
+
+    Returns:
+        Словарь с ключами clients и vehicles
+    """
+    return {
+        "clients": [c.to_dict() for c in company.clients],
+        "vehicles": [v.to_dict() for v in company.vehicles]
+    }
+
+
+def vehicle_from_dict(data: dict) -> Vehicle:
+    """
+    Восстановить транспортное средство из словаря Vehicle.to_dict().
+
+    Сохраняются ID и текущая загрузка; список клиентов восстанавливается
+    при следующем распределении.
+
+    Args:
+        data: Словарь с данными транспорта
+
+    Returns:
+        Объект Airplane или Van
+    """
+    volume_capacity = data.get("volume_capacity")
+    if data["type"] == "airplane":
+        vehicle = Airplane(data["capacity"], data["max_altitude"], volume_capacity, data["vehicle_id"])
+    else:
+        vehicle = Van(data["capacity"], data.get("is_refrigerated", False), volume_capacity, data["vehicle_id"])
+    vehicle.current_load = data.get("current_load", 0.0)
+    vehicle.current_volume = data.get("current_volume", 0.0)
+    return vehicle
+
+
+def populate_company(company, data: dict) -> None:
+    """
+    Заполнить компанию клиентами и транспортом из снимка.
+
+    Args:
+        company: Транспортная компания
+        data: Словарь в формате company_to_dict()
+    """
+    for c in data.get("clients", []):
+        company.add_client(Client(**c))
+    for v in data.get("vehicles", []):
+        company.add_vehicle(vehicle_from_dict(v))
+
+
+def resolve_snapshot(data_path: PathLike) -> Path:
+    """
+    Выбрать файл снимка для загрузки.
+
+    Двоичный снимок рядом с data.json (data.snap) имеет приоритет;
+    если его нет, используется JSON.
+
+    Args:
+        data_path: Путь к data.json
+
+    Returns:
+        Путь к двоичному снимку, если он есть, иначе data_path
+    """
+    data_path = Path(data_path)
+    binary_path = data_path.with_suffix(SNAPSHOT_SUFFIX)
+    return binary_path if binary_path.exists() else data_path
+
+
+def load_company(company, snapshot_path: PathLike, journal: "Journal") -> int:
+    """
+    Загрузить компанию из снимка и повторить записи журнала.
+
+    Формат снимка (двоичный или JSON) определяется по содержимому файла.
+    Клиенты двоичного снимка декодируются лениво, при первом обращении.
+    Повторяющиеся ID транспорта в данных не отклоняются (файл остается
+    читаемым): транспорт получает новый ID (TransportCompany.add_vehicle),
+    о чем сообщает ids.report_duplicates - так же, как при загрузке из SQLite.
+
+    Args:
+        company: Транспортная компания (обычно пустая)
+        snapshot_path: Путь к снимку (может отсутствовать)
+        journal: Журнал изменений к снимку
+
+    Returns:
+        Количество примененных записей журнала
+    """
+    snapshot_path = Path(snapshot_path)
+    snapshot_seq = 0
+    collisions = company.id_collisions
+    with instrumentation.span("persistence.load_snapshot"):
+        if snapshot_path.exists():
+            if is_snapshot(snapshot_path):
+                vehicles, clients, snapshot_seq = open_snapshot(snapshot_path)
+                company.clients = clients
+                for vehicle in vehicles:
+                    company.add_vehicle(vehicle)
+            else:
+                raw = json.loads(snapshot_path.read_text(encoding="utf-8"))
+                populate_company(company, raw)
+                snapshot_seq = raw.get("journal_seq", 0)
+    with instrumentation.span("persistence.replay_journal"):
+        applied = journal.replay(company, snapshot_seq)
+    report_duplicates(company.id_collisions - collisions, snapshot_path)
+    return applied
+
+
+def save_snapshot(company, path: PathLike, journal: "Journal") -> int:
+    """
+    Записать двоичный снимок компании и очистить журнал.
+
+    Args:
+        company: Транспортная компания
+        path: Путь к файлу снимка
+        journal: Журнал изменений, учтенных в снимке
+
+    Returns:
+        Количество записанных байт
+    """
+    vehicles, clients = capture_snapshot(company)
+    return _write_snapshot(path, journal, vehicles, clients)
+
+
+def _write_snapshot(path: PathLike, journal: "Journal", vehicles, clients) -> int:
+    """Записать снимок, учитывающий все записи журнала, и очистить журнал."""
+    with instrumentation.span("persistence.write_snapshot"):
+        written = write_atomic(path, encode_snapshot(vehicles, clients, journal.seq))
+        journal.truncate()
+    return written
+
+
+def capture_snapshot(company) -> Tuple[list, list]:
+    """
+    Снять копию данных компании для записи снимка в другом потоке.
+
+    Копируются список клиентов (клиенты не изменяются, а заменяются) и
+    сами транспортные средства, загрузка которых меняется при распределении.
+
+    Args:
+        company: Транспортная компания
+
+    Returns:
+        Кортеж (транспорт, клиенты)
+    """
+    # Отображение старого снимка нужно освободить до замены файла
+    if isinstance(company.clients, LazyClientList):
+        company.clients.materialize()
+    return [copy.copy(v) for v in company.vehicles], list(company.clients)
+
+
+def write_atomic(path: PathLike, text: Union[str, bytes]) -> int:
+    """
+    Атомарно записать файл.
+
+    Данные пишутся во временный файл в том же каталоге, сбрасываются на диск
+    и переименовываются поверх целевого файла. При сбое посреди записи на
+    диске остается либо старая, либо новая версия файла целиком.
+
+    Args:
+        path: Путь к файлу
+        text: Содержимое (строка записывается в UTF-8)
+
+    Returns:
+        Количество записанных байт
+    """
+    path = Path(path)
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    instrumentation.count("persistence.bytes_written", len(data))
+    return len(data)
+
+
+class Journal:
+    """
+    Журнал изменений (write-ahead log) в формате JSON Lines.
+
+    Каждое изменение дописывается в конец файла отдельной строкой с
+    порядковым номером, поэтому сохранение стоит O(изменения). Периодическая
+    компакция записывает полный снимок атомарным переименованием и очищает
+    журнал; номер последней учтенной записи хранится в снимке, так что сбой
+    между записью снимка и очисткой журнала не приводит к повторному
+    применению изменений.
+    """
+
+    def __init__(self, path: PathLike, fsync: bool = True):
+        """
+        Инициализация журнала.
+
+        Args:
+            path: Путь к файлу журнала
+            fsync: Сбрасывать ли каждую запись на диск
+        """
+        self.path = Path(path)
+        self.fsync = fsync
+        self.seq = 0          # Номер последней записи
+        self.pending = 0      # Записей после последней компакции
+        self._file = None
+
+    def records(self, after_seq: int = 0) -> Iterator[dict]:
+        """
+        Прочитать записи журнала.
+
+        Оборванная последняя строка (сбой посреди записи) отбрасывается,
+        а файл усекается до последней целой записи.
+
+        Args:
+            after_seq: Пропустить записи с номером не больше указанного
+
+        Returns:
+            Итератор по записям
+        """
+        if not self.path.exists():
+            return
+        valid_size = 0
+        torn = False
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("оборванная запись")
+                    record = json.loads(line)
+                except ValueError:
+                    torn = True
+                    break
+                valid_size += len(line)
+                self.seq = max(self.seq, record["seq"])
+                if record["seq"] > after_seq:
+                    yield record
+        if torn:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_size)
+
+    def replay(self, company, after_seq: int = 0) -> int:
+        """
+        Применить записи журнала к компании.
+
+        Args:
+            company: Транспортная компания, загруженная из снимка
+            after_seq: Номер последней записи, уже учтенной в снимке
+
+        Returns:
+            Количество примененных записей
+        """
+        self.seq = max(self.seq, after_seq)
+        count = 0
+        for record in self.records(after_seq):
+            apply_record(company, record)
+            count += 1
+        self.pending = count
+        return count
+
+    def append(self, op: str, **payload) -> int:
+        """
+        Дописать изменение в журнал.
+
+        Args:
+            op: Тип изменения (add_client, replace_client, remove_client,
+                add_vehicle, replace_vehicle, remove_vehicle)
+            **payload: Данные изменения
+
+        Returns:
+            Количество записанных байт
+        """
+        self.seq += 1
+        line = json.dumps({"seq": self.seq, "op": op, **payload}, ensure_ascii=False) + "\n"
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(line)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.pending += 1
+        written = len(line.encode("utf-8"))
+        instrumentation.count("persistence.bytes_written", written)
+        return written
+
+    def append_many(self, records: List[Tuple[str, dict]]) -> int:
+        """
+        Дописать пакет изменений одной записью в файл и одним fsync.
+
+        Args:
+            records: Пары (тип изменения, данные изменения)
+
+        Returns:
+            Количество записанных байт
+        """
+        if not records:
+            return 0
+        lines = []
+        for op, payload in records:
+            self.seq += 1
+            lines.append(json.dumps({"seq": self.seq, "op": op, **payload}, ensure_ascii=False) + "\n")
+        data = "".join(lines)
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.pending += len(records)
+        written = len(data.encode("utf-8"))
+        instrumentation.count("persistence.bytes_written", written)
+        return written
+
+    def compact(self, snapshot_path: PathLike, data: dict, indent: Optional[int] = 2) -> int:
+        """
+        Записать полный снимок и очистить журнал.
+
+        Args:
+            snapshot_path: Путь к файлу снимка
+            data: Данные в формате company_to_dict()
+            indent: Отступ JSON
+
+        Returns:
+            Количество записанных байт снимка
+        """
+        snapshot = dict(data, journal_seq=self.seq)
+        written = write_atomic(snapshot_path, json.dumps(snapshot, ensure_ascii=False, indent=indent))
+        self.truncate()
+        return written
+
+    def truncate(self) -> None:
+        """Очистить журнал после записи снимка, учитывающего все записи."""
+        self.close()
+        open(self.path, "w", encoding="utf-8").close()
+        self.pending = 0
+
+    def close(self) -> None:
+        """Закрыть файл журнала."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def apply_record(company, record: dict) -> None:
+    """
+    Применить одну запись журнала к компании.
+
+    Args:
+        company: Транспортная компания
+        record: Запись журнала
+    """
+    op = record["op"]
+    if op == "add_client":
+        company.add_client(Client(**record["client"]))
+    elif op == "replace_client":
+        company.replace_client(company.clients[record["index"]], Client(**record["client"]))
+    elif op == "remove_client":
+        company.remove_client(company.clients[record["index"]])
+    elif op == "add_vehicle":
+        company.add_vehicle(vehicle_from_dict(record["vehicle"]))
+    elif op == "replace_vehicle":
+        company.replace_vehicle(company.vehicles[record["index"]], vehicle_from_dict(record["vehicle"]))
+    elif op == "remove_vehicle":
+        company.remove_vehicle(company.vehicles[record["index"]])
+    else:
+        raise ValueError(f"Неизвестная операция журнала: {op}")
+
+
+class BackgroundWriter:
+    """
+    Фоновое сохранение: журнал и снимки пишутся в отдельном потоке.
+
+    Изменения накапливаются в памяти (record) и передаются потоку записи
+    пакетами (flush): один пакет - одна запись в файл и один fsync. Снимок
+    пишется тем же потоком, поэтому операции попадают на диск в порядке
+    постановки, и снимок учитывает ровно те записи журнала, что были
+    поставлены до него. Флаг dirty показывает, что не все изменения еще
+    на диске.
+    """
+
+    def __init__(self, journal: Journal, snapshot_path: PathLike, compact_every: int = 500):
+        """
+        Инициализация.
+
+        Args:
+            journal: Журнал изменений
+            snapshot_path: Путь к файлу снимка
+            compact_every: Записей журнала между полными снимками
+        """
+        self.journal = journal
+        self.snapshot_path = Path(snapshot_path)
+        self.compact_every = compact_every
+        self.error: Optional[BaseException] = None  # Последняя ошибка записи
+        self._buffer: List[Tuple[str, dict]] = []
+        self._since_snapshot = journal.pending
+        self._last: Optional[Future] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persistence")
+
+    @property
+    def dirty(self) -> bool:
+        """Есть ли изменения, еще не записанные на диск."""
+        return bool(self._buffer) or (self._last is not None and not self._last.done())
+
+    def record(self, op: str, **payload) -> None:
+        """Запомнить изменение до следующего flush (O(1), без ввода-вывода)."""
+        self._buffer.append((op, payload))
+
+    def flush(self, company) -> Optional[Future]:
+        """
+        Передать накопленные изменения потоку записи.
+
+        Если с последнего снимка накопилось compact_every записей или
+        предыдущая запись завершилась ошибкой, вместо журнала пишется снимок.
+
+        Args:
+            company: Транспортная компания (для снимка)
+
+        Returns:
+            Future последней поставленной операции или None, если писать нечего
+        """
+        if not self._buffer:
+            return None
+        batch, self._buffer = self._buffer, []
+        self._since_snapshot += len(batch)
+        if self._since_snapshot >= self.compact_every or self.error is not None:
+            return self.snapshot(company)
+        return self._submit(self.journal.append_many, batch)
+
+    def snapshot(self, company) -> Future:
+        """
+        Записать снимок в фоне.
+
+        Данные компании копируются в вызывающем потоке; изменения, накопленные
+        до вызова, учитываются снимком и в журнал не пишутся.
+
+        Args:
+            company: Транспортная компания
+
+        Returns:
+            Future записи снимка
+        """
+        self._buffer = []
+        self._since_snapshot = 0
+        self.error = None
+        vehicles, clients = capture_snapshot(company)
+        return self._submit(_write_snapshot, self.snapshot_path, self.journal, vehicles, clients)
+
+    def _submit(self, func, *args) -> Future:
+        """Поставить операцию в очередь потока записи."""
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._on_done)
+        self._last = future
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        if future.exception() is not None:
+            self.error = future.exception()
+
+    def wait(self) -> None:
+        """Дождаться записи всех поставленных операций."""
+        if self._last is not None:
+            self._last.exception()
+
+    def close(self) -> None:
+        """Дождаться записи и остановить поток (накопленные изменения не пишутся)."""
+        self._executor.shutdown(wait=True)
+        self._last = None
@@ -0,0 +1,199 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from .vehicle import Vehicle
+from .client import Client
+from .airplane import Airplane
+from .van import Van
+from .packing import DEFAULT_STRATEGY
+
+# Компактные представления для передачи в процессы-исполнители:
+# транспорт - кортеж (тип, грузоподъемность, доп. параметр, вместимость по объему),
+# клиенты - массив весов, байтовая строка флагов (VIP, холодильник) и массивы
+# объемов и ограничений высоты (None, если ни у одного клиента они не заданы)
+PackedVehicle = Tuple[str, float, float, Optional[float]]
+PackedClients = Tuple[array, bytes, Optional[array], Optional[array]]
+
+FLAG_VIP = 1
+FLAG_REFRIGERATION = 2
+
+
+def _pack_vehicle(vehicle: Vehicle) -> PackedVehicle:
+    """Упаковать транспортное средство в кортеж простых значений."""
+    if isinstance(vehicle, Airplane):
+        return ("airplane", vehicle.capacity, vehicle.max_altitude, vehicle.volume_capacity)
+    return ("van", vehicle.capacity, vehicle.is_refrigerated, vehicle.volume_capacity)
+
+
+def _unpack_vehicle(packed: PackedVehicle) -> Vehicle:
+    """Восстановить транспортное средство из кортежа."""
+    kind, capacity, extra, volume_capacity = packed
+    if kind == "airplane":
+        return Airplane(capacity, extra, volume_capacity)
+    return Van(capacity, extra, volume_capacity)
+
+
+def _pack_clients(clients: Iterable[Client]) -> PackedClients:
+    """Упаковать клиентов в массивы весов, флагов, объемов и ограничений высоты."""
+    nan = float("nan")
+    weights, volumes, altitudes = array("d"), array("d"), array("d")
+    flags = bytearray()
+    has_volume = has_altitude = False
+    for client in clients:
+        weights.append(client.cargo_weight)
+        flags.append(client.is_vip | (FLAG_REFRIGERATION if client.requires_refrigeration else 0))
+        volumes.append(nan if client.volume is None else client.volume)
+        altitudes.append(nan if client.altitude_limit is None else client.altitude_limit)
+        has_volume = has_volume or client.volume is not None
+        has_altitude = has_altitude or client.altitude_limit is not None
+    return weights, bytes(flags), volumes if has_volume else None, altitudes if has_altitude else None
+
+
+def _unpack_clients(packed: PackedClients) -> List[Client]:
+    """Восстановить клиентов из упакованного набора."""
+    weights, flags, volumes, altitudes = packed
+    volumes = volumes or [None] * len(weights)
+    altitudes = altitudes or [None] * len(weights)
+    return [
+        Client.from_validated("client", weight, bool(flag & FLAG_VIP),
+                              None if volume != volume else volume, bool(flag & FLAG_REFRIGERATION),
+                              None if altitude != altitude else altitude)
+        for weight, flag, volume, altitude in zip(weights, flags, volumes, altitudes)
+    ]
+
+
+class Scenario:
+    """
+    Вариант парка и клиентов для анализа «что если».
+
+    Данные хранятся в компактном виде, а варианты, полученные из одного
+    сценария, разделяют общий набор клиентов - он передается в каждый
+    процесс-исполнитель один раз.
+    """
+
+    def __init__(self, name: str, vehicles: Iterable[Vehicle], clients: Iterable[Client]):
+        """
+        Инициализация сценария.
+
+        Args:
+            name: Название сценария
+            vehicles: Транспортные средства
+            clients: Клиенты
+        """
+        self.name = name
+        self.vehicles: Tuple[PackedVehicle, ...] = tuple(_pack_vehicle(v) for v in vehicles)
+        self.clients: PackedClients = _pack_clients(clients)
+
+    @classmethod
+    def from_company(cls, company, name: str = "Текущий парк") -> "Scenario":
+        """Создать сценарий по текущим транспорту и клиентам компании."""
+        return cls(name, company.vehicles, company.clients)
+
+    def _derive(self, name: str, vehicles: Tuple[PackedVehicle, ...]) -> "Scenario":
+        """Создать вариант с другим парком и теми же клиентами."""
+        scenario = Scenario.__new__(Scenario)
+        scenario.name = name
+        scenario.vehicles = vehicles
+        scenario.clients = self.clients
+        return scenario
+
+    def with_vehicles(self, name: str, vehicles: Iterable[Vehicle]) -> "Scenario":
+        """
+        Получить вариант с дополнительным транспортом.
+
+        Args:
+            name: Название варианта
+            vehicles: Добавляемые транспортные средства
+
+        Returns:
+            Новый сценарий
+        """
+        return self._derive(name, self.vehicles + tuple(_pack_vehicle(v) for v in vehicles))
+
+    def without_vehicles(self, name: str, predicate: Callable[[Vehicle], bool]) -> "Scenario":
+        """
+        Получить вариант без транспорта, удовлетворяющего условию.
+
+        Args:
+            name: Название варианта
+            predicate: Условие исключения, например
+                lambda v: isinstance(v, Van) and v.is_refrigerated
+
+        Returns:
+            Новый сценарий
+        """
+        return self._derive(name, tuple(p for p in self.vehicles if not predicate(_unpack_vehicle(p))))
+
+    def __repr__(self):
+        return (f"Scenario(name='{self.name}', "
+                f"vehicles_count={len(self.vehicles)}, "
+                f"clients_count={len(self.clients[0])})")
+
+
+# Наборы клиентов, переданные процессу-исполнителю при запуске
+_worker_clients: List[PackedClients] = []
+
+
+def _init_worker(client_sets: List[PackedClients]) -> None:
+    """Сохранить общие наборы клиентов в процессе-исполнителе."""
+    global _worker_clients
+    _worker_clients = client_sets
+
+
+def _evaluate(name: str, vehicles: Tuple[PackedVehicle, ...], clients_ref: int, strategy: str) -> dict:
+    """Выполнить распределение для одного сценария в процессе-исполнителе."""
+    from .transport_company import TransportCompany
+
+    company = TransportCompany(name)
+    for packed in vehicles:
+        company.add_vehicle(_unpack_vehicle(packed))
+
+    company.clients = _unpack_clients(_worker_clients[clients_ref])
+
+    result = company.optimize_cargo_distribution(strategy)
+    stats = company.get_statistics()
+    stats.update({
+        "scenario": name,
+        "strategy": strategy,
+        "vehicles_used": result["vehicles_used"],
+        "failed_clients": len(result["failed"]),
+        "total_cargo": result["total_cargo"],
+        "cargo_distributed": result["cargo_distributed"],
+        "elapsed_ms": result["elapsed_ms"]
+    })
+    return stats
+
+
+def evaluate_scenarios(scenarios: Sequence[Scenario], strategy: str = DEFAULT_STRATEGY,
+                       max_workers: Optional[int] = None) -> List[dict]:
+    """
+    Параллельно рассчитать распределение для набора сценариев.
+
+    Каждый сценарий считается в отдельном процессе ProcessPoolExecutor.
+    Уникальные наборы клиентов передаются исполнителям один раз при запуске,
+    а в задачах передаются только парк и ссылка на набор.
+
+    Args:
+        scenarios: Сценарии
+        strategy: Имя стратегии распределения
+        max_workers: Число процессов (по умолчанию - число ядер)
+
+    Returns:
+        Список словарей в формате get_statistics() с полями scenario,
+        strategy, vehicles_used, failed_clients, total_cargo,
+        cargo_distributed и elapsed_ms - в порядке сценариев
+    """
+    client_sets: List[PackedClients] = []
+    refs: Dict[int, int] = {}
+    for scenario in scenarios:
+        if id(scenario.clients) not in refs:
+            refs[id(scenario.clients)] = len(client_sets)
+            client_sets.append(scenario.clients)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(client_sets,)) as executor:
+        futures = [
+            executor.submit(_evaluate, s.name, s.vehicles, refs[id(s.clients)], strategy)
+            for s in scenarios
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,348 @@
+import asyncio
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from typing import Dict, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+from .client import Client
+from .airplane import Airplane
+from .van import Van
+from .vehicle import Vehicle
+from .packing import DEFAULT_STRATEGY, get_strategy, run_strategy
+from .scenarios import PackedClients, PackedVehicle, _pack_clients, _pack_vehicle, _unpack_clients, _unpack_vehicle
+
+# Ограничение размера тела запроса (пакетное добавление клиентов)
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+
+class HTTPError(Exception):
+    """Ошибка запроса с HTTP-статусом ответа."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _plan_positions(strategy: str, clients: Sequence[Client], vehicles: Sequence[Vehicle],
+                    improve_ms: Optional[float]) -> dict:
+    """
+    Выполнить run_strategy и заменить объекты в плане их позициями.
+
+    План по позициям не зависит от того, передавались ли списки в
+    исполнитель по ссылке (пул потоков) или копией (пул процессов).
+    """
+    run = run_strategy(strategy, clients, vehicles, improve_ms)
+    client_pos = {id(c): i for i, c in enumerate(clients)}
+    vehicle_pos = {id(v): i for i, v in enumerate(vehicles)}
+    run["placements"] = [(client_pos[id(c)], vehicle_pos[id(v)]) for c, v in run["placements"]]
+    run["failed"] = [client_pos[id(c)] for c in run["failed"]]
+    return run
+
+
+def _plan_packed(strategy: str, vehicles: Tuple[PackedVehicle, ...], clients: PackedClients,
+                 improve_ms: Optional[float]) -> dict:
+    """Рассчитать план в процессе-исполнителе по компактной копии данных, как в sharding."""
+    return _plan_positions(strategy, _unpack_clients(clients), [_unpack_vehicle(v) for v in vehicles], improve_ms)
+
+
+class PlanningService:
+    """
+    HTTP/JSON-сервис планирования поверх TransportCompany на asyncio.
+
+    Все изменения компании выполняются в потоке цикла событий, а расчет
+    плана - в исполнителе (по умолчанию - пул потоков цикла), поэтому
+    сервис продолжает принимать запросы во время планирования. В пул
+    процессов (ProcessPoolExecutor) передается компактная копия клиентов
+    и транспорта, а план возвращается позициями в списках. Запросы
+    на распределение, пришедшие во время расчета, объединяются: следующий
+    пересчет выполняется один раз для всех ожидающих запросов с той же
+    стратегией и учитывает все изменения, сделанные до его начала.
+
+    Маршруты:
+        POST /clients     - добавить клиента (объект или список объектов)
+        GET  /clients/ID  - клиент и ID транспорта, в который загружен груз
+        POST /vehicles    - добавить транспорт (объект или список объектов)
+        POST /distribute  - распределить грузы {"strategy": ..., "placements": true}
+        GET  /stats       - статистика компании
+    """
+
+    def __init__(self, company, strategy: str = DEFAULT_STRATEGY, executor: Optional[Executor] = None,
+                 improve_ms: Optional[float] = None):
+        """
+        Инициализация сервиса.
+
+        Args:
+            company: Транспортная компания
+            strategy: Стратегия распределения по умолчанию
+            executor: Исполнитель для расчета плана (по умолчанию - пул потоков цикла;
+                подходит и ProcessPoolExecutor)
+            improve_ms: Бюджет улучшения плана локальным поиском в мс при каждом пересчете
+        """
+        get_strategy(strategy)
+        self.company = company
+        self.strategy = strategy
+        self.executor = executor
+        self.improve_ms = improve_ms
+        self.replans = 0  # Выполненных пересчетов
+        # Ожидающие пересчета запросы: стратегия -> (future результата, число запросов)
+        self._queued: Dict[str, Tuple[asyncio.Future, int]] = {}
+        self._runner: Optional[asyncio.Task] = None
+
+    # ───── Операции ─────
+
+    @staticmethod
+    def _client_from_json(data) -> Client:
+        """Создать клиента из объекта JSON."""
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Ожидается объект клиента")
+        return Client(data.get("name"), data.get("cargo_weight"), data.get("is_vip", False),
+                      data.get("volume"), data.get("requires_refrigeration", False),
+                      data.get("altitude_limit"))
+
+    @staticmethod
+    def _vehicle_from_json(data):
+        """Создать самолет или фургон из объекта JSON."""
+        if not isinstance(data, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Ожидается объект транспорта")
+        kind = data.get("type")
+        if kind == "airplane":
+            return Airplane(data.get("capacity"), data.get("max_altitude"), data.get("volume_capacity"))
+        if kind == "van":
+            return Van(data.get("capacity"), data.get("is_refrigerated", False), data.get("volume_capacity"))
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Тип транспорта должен быть airplane или van")
+
+    def add_clients(self, items) -> dict:
+        """
+        Добавить одного клиента или список клиентов.
+
+        Список проверяется целиком до добавления: при ошибке в любом
+        элементе не добавляется ни один клиент. ID клиента - его позиция
+        в списке компании.
+
+        Returns:
+            {"client_id": ...} для одного клиента или
+            {"first_client_id": ..., "count": ...} для списка
+        """
+        clients = [self._client_from_json(item) for item in items] if isinstance(items, list) \
+            else [self._client_from_json(items)]
+        first = len(self.company.clients)
+        for client in clients:
+            self.company.add_client(client)
+        if isinstance(items, list):
+            return {"first_client_id": first, "count": len(clients)}
+        return {"client_id": first}
+
+    def add_vehicles(self, items) -> dict:
+        """
+        Добавить одно транспортное средство или список (проверяется целиком).
+
+        Returns:
+            {"vehicle_id": ...} или {"vehicle_ids": [...]} для списка
+        """
+        vehicles = [self._vehicle_from_json(item) for item in items] if isinstance(items, list) \
+            else [self._vehicle_from_json(items)]
+        for vehicle in vehicles:
+            self.company.add_vehicle(vehicle)
+        if isinstance(items, list):
+            return {"vehicle_ids": [v.vehicle_id for v in vehicles]}
+        return {"vehicle_id": vehicles[0].vehicle_id}
+
+    def get_client(self, client_id: int) -> dict:
+        """Получить клиента и ID транспорта, в который загружен его груз."""
+        if not 0 <= client_id < len(self.company.clients):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Клиент {client_id} не найден")
+        client = self.company.clients[client_id]
+        return {"client_id": client_id, **client.to_dict(),
+                "vehicle_id": self.company.get_client_vehicle_id(client)}
+
+    def stats(self) -> dict:
+        """Получить статистику компании."""
+        return self.company.get_statistics()
+
+    async def distribute(self, strategy: Optional[str] = None, placements: bool = True) -> dict:
+        """
+        Распределить грузы с объединением одновременных запросов.
+
+        Args:
+            strategy: Имя стратегии (по умолчанию - стратегия сервиса)
+            placements: Включить в ответ пары client_id - vehicle_id
+
+        Returns:
+            Итоги распределения; coalesced - число запросов, обслуженных
+            одним пересчетом
+        """
+        strategy = strategy or self.strategy
+        get_strategy(strategy)
+
+        future, waiting = self._queued.get(strategy, (None, 0))
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+        self._queued[strategy] = (future, waiting + 1)
+        if self._runner is None:
+            self._runner = asyncio.ensure_future(self._run_replans())
+
+        result = dict(await asyncio.shield(future))
+        if placements:
+            positions = {id(c): i for i, c in enumerate(self.company.clients)}
+            result["placements"] = [
+                {"client_id": positions[id(c)], "vehicle_id": v.vehicle_id}
+                for v in self.company.vehicles for c in v.clients_list if id(c) in positions
+            ]
+        return result
+
+    async def _run_replans(self) -> None:
+        """Выполнять пересчеты, пока есть ожидающие запросы."""
+        loop = asyncio.get_running_loop()
+        try:
+            while self._queued:
+                strategy = next(iter(self._queued))
+                future, waiting = self._queued.pop(strategy)
+                try:
+                    # Стратегия получает копии списков: компанию можно менять во время расчета
+                    clients, vehicles = list(self.company.clients), list(self.company.vehicles)
+                    if isinstance(self.executor, ProcessPoolExecutor):
+                        task = partial(_plan_packed, strategy, tuple(_pack_vehicle(v) for v in vehicles),
+                                       _pack_clients(clients), self.improve_ms)
+                    else:
+                        task = partial(_plan_positions, strategy, clients, vehicles, self.improve_ms)
+                    run = await loop.run_in_executor(self.executor, task)
+                    # apply_plan сопоставляет объекты компании по id - возвращаем позиции к ним
+                    run["placements"] = [(clients[c], vehicles[v]) for c, v in run["placements"]]
+                    run["failed"] = [clients[c] for c in run["failed"]]
+                    result = self.company.apply_plan(run)
+                    self.replans += 1
+                    summary = {
+                        "strategy": strategy,
+                        "elapsed_ms": result["elapsed_ms"],
+                        "successful": len(result["successful"]),
+                        "failed": len(result["failed"]),
+                        "vehicles_used": result["vehicles_used"],
+                        "lower_bound": result["lower_bound"],
+                        "optimality_gap": result["optimality_gap"],
+                        "total_cargo": result["total_cargo"],
+                        "cargo_distributed": result["cargo_distributed"],
+                        "coalesced": waiting
+                    }
+                    if "improvement" in result:
+                        summary["improvement"] = result["improvement"]
+                    future.set_result(summary)
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            self._runner = None
+
+    # ───── HTTP ─────
+
+    async def _route(self, method: str, path: str, body) -> Tuple[HTTPStatus, dict]:
+        """Выполнить запрос и получить статус и тело ответа."""
+        if path == "/clients" and method == "POST":
+            return HTTPStatus.CREATED, self.add_clients(body)
+        if path.startswith("/clients/") and method == "GET":
+            try:
+                client_id = int(path[len("/clients/"):])
+            except ValueError:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "Некорректный ID клиента") from None
+            return HTTPStatus.OK, self.get_client(client_id)
+        if path == "/vehicles" and method == "POST":
+            return HTTPStatus.CREATED, self.add_vehicles(body)
+        if path == "/distribute" and method == "POST":
+            options = body if isinstance(body, dict) else {}
+            return HTTPStatus.OK, await self.distribute(options.get("strategy"),
+                                                        bool(options.get("placements", True)))
+        if path == "/stats" and method == "GET":
+            return HTTPStatus.OK, self.stats()
+
+        if path in ("/clients", "/vehicles", "/distribute", "/stats") or path.startswith("/clients/"):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"Метод {method} не поддерживается для {path}")
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"Неизвестный путь: {path}")
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """Прочитать HTTP-запрос; None - соединение закрыто клиентом."""
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Некорректная строка запроса") from None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length должен быть неотрицательным целым") from None
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Слишком большое тело запроса")
+        raw = await reader.readexactly(length) if length else b""
+        keep_alive = (headers.get("connection", "").lower() != "close"
+                      and version.upper() != "HTTP/1.0")
+        return method.upper(), urlsplit(target).path, raw, keep_alive
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обработать соединение (поддерживается keep-alive)."""
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, raw, keep_alive = request
+                    try:
+                        body = json.loads(raw) if raw else None
+                    except ValueError:
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "Тело запроса должно быть JSON") from None
+                    status, payload = await self._route(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ValueError, TypeError) as e:
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+                except Exception as e:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # Остановка сервера при открытом keep-alive соединении
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """
+        Запустить сервер.
+
+        Args:
+            host: Адрес
+            port: Порт (0 - любой свободный)
+
+        Returns:
+            Запущенный сервер asyncio
+        """
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """Запустить сервер и обслуживать запросы до отмены."""
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,200 @@
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+from .vehicle import Vehicle
+from .client import Client
+from .capacity_index import CategoryIndex
+from .bounds import plan_bounds
+from .packing import DEFAULT_STRATEGY, Placement, get_strategy, run_strategy, sort_clients
+from .scenarios import PackedClients, PackedVehicle, _pack_clients, _pack_vehicle, _unpack_clients, _unpack_vehicle
+
+# Ключ шарда (например, склад): функция клиента или транспорта -> метка
+ShardKey = Callable[[Union[Client, Vehicle]], Hashable]
+Shard = Tuple[List[Client], List[Vehicle]]
+
+
+def split_shards(clients: Sequence[Client], vehicles: Sequence[Vehicle],
+                 shards: Optional[int] = None, key: Optional[ShardKey] = None) -> List[Shard]:
+    """
+    Разбить клиентов и транспорт на шарды.
+
+    С ключом шард образуют клиенты и транспорт с одинаковой меткой (метки
+    идут в порядке первого появления; шард может остаться без клиентов или
+    без транспорта). Без ключа клиенты распределяются по остатку от деления
+    позиции, а транспорт, упорядоченный по убыванию грузоподъемности, -
+    по кругу, поэтому шарды получают близкие объемы грузов и парка.
+
+    Args:
+        clients: Клиенты
+        vehicles: Транспортные средства
+        shards: Число шардов без ключа (по умолчанию - число ядер)
+        key: Необязательная функция метки шарда
+
+    Returns:
+        Список пар (клиенты шарда, транспорт шарда)
+    """
+    if key is not None:
+        groups: Dict[Hashable, Shard] = {}
+        for client in clients:
+            groups.setdefault(key(client), ([], []))[0].append(client)
+        for vehicle in vehicles:
+            groups.setdefault(key(vehicle), ([], []))[1].append(vehicle)
+        return list(groups.values())
+
+    count = shards or os.cpu_count() or 1
+    if count < 1:
+        raise ValueError("Число шардов должно быть положительным")
+    ordered = sorted(vehicles, key=lambda v: v.capacity, reverse=True)
+    return [(list(clients[i::count]), ordered[i::count]) for i in range(count)]
+
+
+def _plan_shard(vehicles: Tuple[PackedVehicle, ...], clients: PackedClients,
+                strategy: str, improve_ms: Optional[float]) -> Tuple[array, array, array, float]:
+    """
+    Распределить грузы одного шарда в процессе-исполнителе.
+
+    Returns:
+        Позиции размещенных клиентов, позиции их транспорта, позиции
+        неразмещенных клиентов (в пределах шарда) и время расчета в мс
+    """
+    fleet = [_unpack_vehicle(packed) for packed in vehicles]
+    items = _unpack_clients(clients)
+    run = run_strategy(strategy, items, fleet, improve_ms)
+
+    client_pos = {id(c): i for i, c in enumerate(items)}
+    vehicle_pos = {id(v): i for i, v in enumerate(fleet)}
+    placed, targets = array("I"), array("I")
+    for client, vehicle in run["placements"]:
+        placed.append(client_pos[id(client)])
+        targets.append(vehicle_pos[id(vehicle)])
+    failed = array("I", (client_pos[id(c)] for c in run["failed"]))
+    return placed, targets, failed, run["elapsed_ms"]
+
+
+def rebalance(failed: Sequence[Client], vehicles: Sequence[Vehicle],
+              placements: Sequence[Placement]) -> Tuple[List[Placement], List[Client]]:
+    """
+    Разместить неразмещенных клиентов в свободном месте всего парка.
+
+    Свободное место считается по плану placements (транспорт не изменяется),
+    клиенты обходятся в порядке распределения и помещаются методом Best Fit
+    по индексу CategoryIndex, поэтому проход стоит O(F log V).
+
+    Args:
+        failed: Клиенты, не размещенные в своих шардах
+        vehicles: Весь парк
+        placements: Размещения по шардам
+
+    Returns:
+        Кортеж (новые размещения, оставшиеся неразмещенные клиенты)
+    """
+    loads: Dict[int, float] = {}
+    volumes: Dict[int, float] = {}
+    for client, vehicle in placements:
+        loads[id(vehicle)] = loads.get(id(vehicle), 0.0) + client.cargo_weight
+        if client.volume is not None:
+            volumes[id(vehicle)] = volumes.get(id(vehicle), 0.0) + client.volume
+
+    index = CategoryIndex(
+        vehicles,
+        (v.capacity - loads.get(id(v), 0.0) for v in vehicles),
+        (None if v.volume_capacity is None else v.volume_capacity - volumes.get(id(v), 0.0)
+         for v in vehicles)
+    )
+    moved: List[Placement] = []
+    still_failed: List[Client] = []
+    for client in sort_clients(failed):
+        vehicle = index.best_fit(client)
+        if vehicle is None:
+            still_failed.append(client)
+            continue
+        index.consume(vehicle, client)
+        moved.append((client, vehicle))
+    return moved, still_failed
+
+
+def run_sharded(clients: Sequence[Client], vehicles: Sequence[Vehicle], strategy: str = DEFAULT_STRATEGY,
+                shards: Optional[int] = None, key: Optional[ShardKey] = None,
+                max_workers: Optional[int] = None, improve_ms: Optional[float] = None) -> dict:
+    """
+    Распределить грузы по шардам в отдельных процессах.
+
+    Каждый шард (склад) планируется стратегией strategy в своем процессе
+    ProcessPoolExecutor; шарды передаются в компактном виде, как в
+    evaluate_scenarios. Затем клиенты, не размещенные в своих шардах,
+    переносятся в свободное место транспорта других шардов (rebalance).
+
+    Args:
+        clients: Клиенты
+        vehicles: Транспортные средства (считаются пустыми)
+        strategy: Имя стратегии распределения внутри шарда
+        shards: Число шардов без ключа (по умолчанию - число ядер)
+        key: Необязательная функция метки шарда (например, склада)
+        max_workers: Число процессов (по умолчанию - число ядер)
+        improve_ms: Бюджет улучшения плана каждого шарда локальным поиском в мс
+
+    Returns:
+        Словарь в формате packing.run_strategy (подходит для
+        TransportCompany.apply_plan) с дополнительными полями shards
+        (итоги по шардам) и rebalanced (число перенесенных клиентов)
+    """
+    get_strategy(strategy)
+    start = time.perf_counter()
+    parts = split_shards(clients, vehicles, shards, key)
+    # Шардам без клиентов или без транспорта планировать нечего
+    active = [i for i, (items, fleet) in enumerate(parts) if items and fleet]
+
+    # Планы шардов: (размещения, неразмещенные клиенты, время расчета в мс)
+    plans: Dict[int, Tuple[List[Placement], List[Client], float]] = {}
+    if len(active) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                i: executor.submit(_plan_shard, tuple(_pack_vehicle(v) for v in parts[i][1]),
+                                   _pack_clients(parts[i][0]), strategy, improve_ms)
+                for i in active
+            }
+            for i, future in futures.items():
+                placed, targets, missed, elapsed_ms = future.result()
+                items, fleet = parts[i]
+                plans[i] = ([(items[c], fleet[v]) for c, v in zip(placed, targets)],
+                            [items[c] for c in missed], elapsed_ms)
+    else:
+        # В одном процессе шарды планируются по самим объектам, без упаковки
+        for i in active:
+            run = run_strategy(strategy, *parts[i], improve_ms)
+            plans[i] = (run["placements"], run["failed"], run["elapsed_ms"])
+
+    placements: List[Placement] = []
+    failed: List[Client] = []
+    summaries = []
+    for i, (items, fleet) in enumerate(parts):
+        placed, missed, elapsed_ms = plans.get(i, ((), items, 0.0))
+        placements.extend(placed)
+        failed.extend(missed)
+        summaries.append({
+            "clients": len(items),
+            "vehicles": len(fleet),
+            "placed": len(placed),
+            "failed": len(missed),
+            "elapsed_ms": elapsed_ms
+        })
+
+    # Внутри одного шарда переносить некуда: стратегия уже не нашла места
+    moved: List[Placement] = []
+    if len(parts) > 1:
+        moved, failed = rebalance(failed, vehicles, placements)
+        placements.extend(moved)
+
+    vehicles_used = len({id(v) for _, v in placements})
+    return {
+        "strategy": strategy,
+        "placements": placements,
+        "failed": failed,
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+        "vehicles_used": vehicles_used,
+        **plan_bounds(placements, vehicles, vehicles_used),
+        "shards": summaries,
+        "rebalanced": len(moved)
+    }
@@ -0,0 +1,371 @@
+import gc
+import mmap
+import struct
+from collections.abc import MutableSequence
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+from .vehicle import Vehicle
+from .client import Client
+from .airplane import Airplane
+from .van import Van
+
+PathLike = Union[str, Path]
+
+SNAPSHOT_SUFFIX = ".snap"
+MAGIC = b"TCSNAP\x00\x01"
+VERSION = 3
+
+# Заголовок: сигнатура, версия, номер записи журнала, число транспорта и клиентов
+HEADER = struct.Struct("<8sIQII")
+# Продолжение заголовка с версии 3: число VIP-клиентов и общий вес грузов, чтобы
+# статистика читалась без декодирования клиентов
+HEADER_STATS = struct.Struct("<Id")
+# Транспорт: тип (0 - самолет, 1 - фургон), грузоподъемность, загрузка,
+# доп. параметр (высота или наличие холодильника), смещение и длина ID в куче строк,
+# вместимость по объему (NaN - не ограничена) и загрузка по объему
+VEHICLE_RECORD = struct.Struct("<BdddQIdd")
+# Клиент: вес груза, смещение и длина имени в куче строк, флаги (VIP, холодильник),
+# объем и ограничение высоты (NaN - не заданы)
+CLIENT_RECORD = struct.Struct("<dQIBdd")
+# Записи версии 1 (без объема и требований к перевозке) читаются для совместимости
+VEHICLE_RECORD_V1 = struct.Struct("<BdddQI")
+CLIENT_RECORD_V1 = struct.Struct("<dQIB")
+RECORDS = {1: (VEHICLE_RECORD_V1, CLIENT_RECORD_V1), 2: (VEHICLE_RECORD, CLIENT_RECORD),
+           3: (VEHICLE_RECORD, CLIENT_RECORD)}
+
+KIND_AIRPLANE = 0
+KIND_VAN = 1
+
+FLAG_VIP = 1
+FLAG_REFRIGERATION = 2
+
+NAN = float("nan")
+
+
+def _optional(value: Optional[float]) -> float:
+    """Необязательное число для записи: None кодируется как NaN."""
+    return NAN if value is None else value
+
+
+def encode_snapshot(vehicles, clients, journal_seq: int = 0) -> bytes:
+    """
+    Упаковать транспорт и клиентов в двоичный снимок.
+
+    Снимок состоит из заголовка (с числом VIP-клиентов и общим весом
+    грузов), таблицы записей транспорта фиксированной
+    длины, таблицы записей клиентов фиксированной длины и кучи строк UTF-8
+    (ID транспорта и имена клиентов). Фиксированная длина записей позволяет
+    декодировать i-го клиента без чтения остальных.
+
+    Args:
+        vehicles: Транспортные средства
+        clients: Клиенты
+        journal_seq: Номер последней записи журнала, учтенной в снимке
+
+    Returns:
+        Содержимое файла снимка
+    """
+    heap = bytearray()
+
+    def put(text: str) -> Tuple[int, int]:
+        data = text.encode("utf-8")
+        offset = len(heap)
+        heap.extend(data)
+        return offset, len(data)
+
+    vehicle_part = bytearray()
+    for vehicle in vehicles:
+        if isinstance(vehicle, Airplane):
+            kind, extra = KIND_AIRPLANE, vehicle.max_altitude
+        else:
+            kind, extra = KIND_VAN, float(vehicle.is_refrigerated)
+        vehicle_part += VEHICLE_RECORD.pack(kind, vehicle.capacity, vehicle.current_load, extra,
+                                            *put(vehicle.vehicle_id),
+                                            _optional(vehicle.volume_capacity), vehicle.current_volume)
+
+    client_part = bytearray()
+    count = vip_count = 0
+    total_weight = 0.0
+    for client in clients:
+        flags = client.is_vip | (FLAG_REFRIGERATION if client.requires_refrigeration else 0)
+        client_part += CLIENT_RECORD.pack(client.cargo_weight, *put(client.name), flags,
+                                          _optional(client.volume), _optional(client.altitude_limit))
+        count += 1
+        vip_count += client.is_vip
+        total_weight += client.cargo_weight
+
+    n_vehicles = len(vehicle_part) // VEHICLE_RECORD.size
+    header = HEADER.pack(MAGIC, VERSION, journal_seq, n_vehicles, count)
+    stats = HEADER_STATS.pack(vip_count, total_weight)
+    return b"".join((header, stats, vehicle_part, client_part, heap))
+
+
+def is_snapshot(path: PathLike) -> bool:
+    """Проверить, что файл начинается с сигнатуры двоичного снимка."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _text(data, length: int) -> str:
+    """Декодировать строку из кучи, проверив, что она не обрезана."""
+    if len(data) != length:
+        raise ValueError("Файл снимка поврежден: куча строк обрезана")
+    return bytes(data).decode("utf-8")
+
+
+def _client(name: str, weight: float, name_offset: int, name_length: int, flags: int,
+            volume: float = NAN, altitude_limit: float = NAN) -> Client:
+    """Создать клиента из полей записи (в версии 1 объема и высоты нет)."""
+    return Client.from_validated(name, weight, bool(flags & FLAG_VIP),
+                                 None if volume != volume else volume,
+                                 bool(flags & FLAG_REFRIGERATION),
+                                 None if altitude_limit != altitude_limit else altitude_limit)
+
+
+class LazyClientList(MutableSequence):
+    """
+    Список клиентов, декодируемых из снимка по мере обращения.
+
+    Записи читаются из отображенного в память файла; клиент создается при
+    первом обращении к его позиции и дальше хранится как обычный объект,
+    поэтому повторные обращения возвращают тот же экземпляр. Изменения
+    поддерживаются полностью: добавление в конец и замена не трогают
+    ненагруженные записи, а вставка и удаление со сдвигом сначала
+    закрепляют за каждой позицией номер ее записи. Как и TrackedList,
+    список считает изменения в version.
+
+    Число VIP-клиентов (vip_count) и общий вес грузов (total_weight) берутся
+    из заголовка снимка и поддерживаются при изменениях, поэтому статистика
+    не требует декодирования; для снимков версий 1 и 2 они равны None.
+    """
+
+    def __init__(self, buffer, offset: int, count: int, heap_offset: int,
+                 record: struct.Struct = CLIENT_RECORD, vip_count: Optional[int] = None,
+                 total_weight: Optional[float] = None):
+        """
+        Инициализация списка.
+
+        Args:
+            buffer: Буфер со снимком (mmap или bytes)
+            offset: Смещение таблицы клиентов
+            count: Число записей клиентов
+            heap_offset: Смещение кучи строк
+            record: Формат записи клиента (зависит от версии снимка)
+            vip_count: Число VIP-клиентов (None - неизвестно)
+            total_weight: Общий вес грузов (None - неизвестен)
+        """
+        self.vip_count = vip_count
+        self.total_weight = total_weight if vip_count is not None else None
+        self._buffer = buffer
+        self._record = record
+        self._offset = offset
+        self._count = count
+        self._heap = heap_offset
+        # None - запись с номером, равным позиции; int - номер записи после сдвига
+        self._items: list = [None] * count
+        self._pinned = False
+        self.version = 0
+        if not count:
+            self.close()
+
+    def _decode(self, record: int) -> Client:
+        """Декодировать запись клиента с заданным номером."""
+        fields = self._record.unpack_from(self._buffer, self._offset + record * self._record.size)
+        start = self._heap + fields[1]
+        name = _text(self._buffer[start:start + fields[2]], fields[2])
+        return _client(name, *fields)
+
+    def _account(self, clients, sign: int) -> None:
+        """Учесть добавленных (sign=1) или убранных (sign=-1) клиентов в vip_count и total_weight."""
+        if self.vip_count is None:
+            return
+        for client in clients:
+            self.vip_count += sign * client.is_vip
+            self.total_weight += sign * client.cargo_weight
+        if not self._items:
+            # Пустой список обнуляется явно, чтобы не копить погрешность float
+            self.total_weight = 0.0
+
+    def _pin(self) -> None:
+        """Закрепить номера записей за позициями перед сдвигом элементов."""
+        if not self._pinned:
+            self._items = [i if item is None else item for i, item in enumerate(self._items)]
+            self._pinned = True
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if isinstance(item, Client):
+            return item
+        if index < 0:
+            index += len(self._items)
+        item = self._items[index] = self._decode(index if item is None else item)
+        return item
+
+    def __iter__(self):
+        # Полный проход все равно декодирует всех клиентов - делаем это пакетно
+        self.materialize()
+        return iter(self._items)
+
+    def __setitem__(self, index, value):
+        # Заменяемые записи декодируются по одной - только чтобы учесть их в статистике
+        if isinstance(index, slice):
+            old, value = self[index], list(value)
+            self._pin()
+        else:
+            old, value = [self[index]], value
+        self._items[index] = value
+        self._account(old, -1)
+        self._account(value if isinstance(index, slice) else [value], 1)
+        self.version += 1
+
+    def __delitem__(self, index):
+        old = self[index] if isinstance(index, slice) else [self[index]]
+        self._pin()
+        del self._items[index]
+        self._account(old, -1)
+        self.version += 1
+
+    def insert(self, index: int, value: Client) -> None:
+        self._pin()
+        self._items.insert(index, value)
+        self._account([value], 1)
+        self.version += 1
+
+    def append(self, value: Client) -> None:
+        self._items.append(value)
+        self._account([value], 1)
+        self.version += 1
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.close()
+        if self.vip_count is not None:
+            self.vip_count, self.total_weight = 0, 0.0
+        self.version += 1
+
+    def index(self, value, start: int = 0, stop: Optional[int] = None) -> int:
+        # Клиенты сравниваются по ссылке, а недекодированная запись не может
+        # быть уже существующим объектом - поэтому поиск ничего не декодирует
+        stop = len(self._items) if stop is None else stop
+        for i in range(*slice(start, stop).indices(len(self._items))):
+            if self._items[i] is value:
+                return i
+        raise ValueError(f"{value!r} нет в списке")
+
+    def __contains__(self, value) -> bool:
+        return any(item is value for item in self._items)
+
+    @property
+    def decoded(self) -> bool:
+        """Все ли клиенты уже декодированы."""
+        return self._buffer is None
+
+    def materialize(self) -> None:
+        """Декодировать всех клиентов и освободить отображение файла."""
+        if self._buffer is None:
+            return
+        table = self._buffer[self._offset:self._offset + self._count * self._record.size]
+        heap = self._buffer[self._heap:]
+        # Новые объекты не образуют циклов: сборщик мусора на время пакетного
+        # декодирования отключается, иначе он многократно обходит растущую кучу
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            records = [
+                _client(_text(heap[fields[1]:fields[1] + fields[2]], fields[2]), *fields)
+                for fields in self._record.iter_unpack(table)
+            ]
+        finally:
+            if gc_enabled:
+                gc.enable()
+        items = self._items
+        for i, item in enumerate(items):
+            if item is None:
+                items[i] = records[i]
+            elif not isinstance(item, Client):
+                items[i] = records[item]
+        self._release()
+
+    def close(self) -> None:
+        """Освободить отображение файла (только если все клиенты декодированы)."""
+        if self._buffer is None:
+            return
+        if any(not isinstance(item, Client) for item in self._items):
+            raise ValueError("Нельзя освободить снимок: не все клиенты декодированы")
+        self._release()
+
+    def _release(self) -> None:
+        """Закрыть отображение файла."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = None
+
+    def __repr__(self):
+        return f"LazyClientList(count={len(self._items)}, decoded={self.decoded})"
+
+
+def open_snapshot(path: PathLike) -> Tuple[List[Vehicle], LazyClientList, int]:
+    """
+    Открыть двоичный снимок.
+
+    Транспорт декодируется сразу, клиенты - лениво при обращении.
+
+    Args:
+        path: Путь к файлу снимка
+
+    Returns:
+        Кортеж (транспорт, ленивый список клиентов, номер записи журнала)
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        if len(buffer) < HEADER.size:
+            raise ValueError("Файл снимка поврежден: нет заголовка")
+        magic, version, journal_seq, n_vehicles, n_clients = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Файл не является двоичным снимком")
+        if version not in RECORDS:
+            raise ValueError(f"Неподдерживаемая версия снимка: {version}")
+        vehicle_record, client_record = RECORDS[version]
+
+        vehicles_offset = HEADER.size
+        vip_count = total_weight = None
+        if version >= 3:
+            if len(buffer) < HEADER.size + HEADER_STATS.size:
+                raise ValueError("Файл снимка поврежден: нет заголовка")
+            vip_count, total_weight = HEADER_STATS.unpack_from(buffer, HEADER.size)
+            vehicles_offset += HEADER_STATS.size
+
+        clients_offset = vehicles_offset + n_vehicles * vehicle_record.size
+        heap_offset = clients_offset + n_clients * client_record.size
+        if len(buffer) < heap_offset:
+            raise ValueError("Файл снимка поврежден: таблицы обрезаны")
+
+        vehicles = []
+        for i in range(n_vehicles):
+            kind, capacity, load, extra, id_offset, id_length, *volume = vehicle_record.unpack_from(
+                buffer, vehicles_offset + i * vehicle_record.size)
+            volume_capacity, volume_load = volume or (NAN, 0.0)
+            volume_capacity = None if volume_capacity != volume_capacity else volume_capacity
+            start = heap_offset + id_offset
+            vehicle_id = _text(buffer[start:start + id_length], id_length)
+            if kind == KIND_AIRPLANE:
+                vehicle = Airplane(capacity, extra, volume_capacity, vehicle_id)
+            else:
+                vehicle = Van(capacity, bool(extra), volume_capacity, vehicle_id)
+            vehicle.current_load = load
+            vehicle.current_volume = volume_load
+            vehicles.append(vehicle)
+    except BaseException:
+        buffer.close()
+        raise
+
+    clients = LazyClientList(buffer, clients_offset, n_clients, heap_offset, client_record,
+                             vip_count, total_weight)
+    return vehicles, clients, journal_seq
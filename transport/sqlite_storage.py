@@ -0,0 +1,340 @@
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+from .client import Client
+from .vehicle import Vehicle
+from .airplane import Airplane
+from .van import Van
+from .ids import report_duplicates
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS clients (
+    id           INTEGER PRIMARY KEY,
+    name         TEXT    NOT NULL,
+    cargo_weight REAL    NOT NULL CHECK (cargo_weight > 0),
+    is_vip       INTEGER NOT NULL,
+    volume       REAL,
+    requires_refrigeration INTEGER NOT NULL DEFAULT 0,
+    altitude_limit REAL
+);
+CREATE TABLE IF NOT EXISTS vehicles (
+    position        INTEGER NOT NULL,
+    vehicle_id      TEXT    PRIMARY KEY,
+    type            TEXT    NOT NULL,
+    capacity        REAL    NOT NULL CHECK (capacity > 0),
+    current_load    REAL    NOT NULL DEFAULT 0,
+    max_altitude    REAL,
+    is_refrigerated INTEGER,
+    volume_capacity REAL,
+    current_volume  REAL    NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    client_id  INTEGER PRIMARY KEY REFERENCES clients(id) ON DELETE CASCADE,
+    vehicle_id TEXT    NOT NULL REFERENCES vehicles(vehicle_id) ON DELETE CASCADE,
+    position   INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_clients_vip ON clients(is_vip);
+CREATE INDEX IF NOT EXISTS idx_clients_weight ON clients(cargo_weight);
+CREATE INDEX IF NOT EXISTS idx_vehicles_type ON vehicles(type);
+CREATE INDEX IF NOT EXISTS idx_assignments_vehicle ON assignments(vehicle_id);
+"""
+
+# Столбцы, добавленные после первой версии схемы: таблица -> [(столбец, определение)]
+MIGRATIONS = {
+    "clients": [("volume", "REAL"),
+                ("requires_refrigeration", "INTEGER NOT NULL DEFAULT 0"),
+                ("altitude_limit", "REAL")],
+    "vehicles": [("volume_capacity", "REAL"),
+                 ("current_volume", "REAL NOT NULL DEFAULT 0")],
+}
+
+CLIENT_COLUMNS = "name, cargo_weight, is_vip, volume, requires_refrigeration, altitude_limit"
+
+
+class SQLiteStorage:
+    """
+    Хранилище компании в базе SQLite.
+
+    Клиенты, транспорт и назначения хранятся в отдельных таблицах с
+    индексами по VIP-статусу, весу, типу транспорта и vehicle_id, поэтому
+    выборки, постраничный вывод и статистика выполняются запросами SQL
+    без создания объектов Client для всех записей.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        """
+        Инициализация хранилища.
+
+        Args:
+            path: Путь к файлу базы данных (по умолчанию - в памяти)
+        """
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+
+    def _migrate(self) -> None:
+        """Добавить недостающие столбцы в базу, созданную прежней версией схемы."""
+        with self.conn:
+            for table, columns in MIGRATIONS.items():
+                existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+                if not existing:
+                    continue  # Таблицы еще нет - ее создаст SCHEMA
+                for name, definition in columns:
+                    if name not in existing:
+                        self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        """Закрыть соединение с базой данных."""
+        self.conn.close()
+
+    # ───── Запись ─────
+
+    def save_company(self, company) -> None:
+        """
+        Сохранить компанию целиком, заменив прежние данные.
+
+        Вставка выполняется пакетно (executemany) в одной транзакции.
+
+        Args:
+            company: Транспортная компания
+        """
+        client_ids = {id(c): i for i, c in enumerate(company.clients, 1)}
+
+        with self.conn:
+            self.conn.execute("DELETE FROM assignments")
+            self.conn.execute("DELETE FROM clients")
+            self.conn.execute("DELETE FROM vehicles")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('company_name', ?)",
+                              (company.name,))
+
+            self.conn.executemany(
+                f"INSERT INTO clients (id, {CLIENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((i, *self._client_row(c)) for i, c in enumerate(company.clients, 1))
+            )
+            self.conn.executemany(
+                "INSERT INTO vehicles (position, vehicle_id, type, capacity, current_load, "
+                "max_altitude, is_refrigerated, volume_capacity, current_volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._vehicle_row(i, v) for i, v in enumerate(company.vehicles))
+            )
+            self.conn.executemany(
+                "INSERT INTO assignments (client_id, vehicle_id, position) VALUES (?, ?, ?)",
+                ((client_ids[id(c)], v.vehicle_id, i)
+                 for v in company.vehicles for i, c in enumerate(v.clients_list) if id(c) in client_ids)
+            )
+
+    def add_clients(self, clients: Iterable[Client]) -> int:
+        """
+        Пакетно добавить клиентов.
+
+        Args:
+            clients: Клиенты
+
+        Returns:
+            Количество добавленных записей
+        """
+        with self.conn:
+            cursor = self.conn.executemany(
+                f"INSERT INTO clients ({CLIENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                (self._client_row(c) for c in clients)
+            )
+        return cursor.rowcount
+
+    @staticmethod
+    def _client_row(client: Client) -> tuple:
+        """Значения столбцов CLIENT_COLUMNS для клиента."""
+        return (client.name, client.cargo_weight, int(client.is_vip), client.volume,
+                int(client.requires_refrigeration), client.altitude_limit)
+
+    @staticmethod
+    def _client_from_row(row: tuple) -> Client:
+        """Клиент из значений столбцов CLIENT_COLUMNS."""
+        name, weight, is_vip, volume, refrigeration, altitude_limit = row
+        return Client(name, weight, bool(is_vip), volume, bool(refrigeration), altitude_limit)
+
+    @staticmethod
+    def _vehicle_row(position: int, vehicle: Vehicle) -> tuple:
+        """Строка таблицы vehicles для транспортного средства."""
+        if isinstance(vehicle, Airplane):
+            kind, altitude, refrigerated = "airplane", vehicle.max_altitude, None
+        else:
+            kind, altitude, refrigerated = "van", None, int(vehicle.is_refrigerated)
+        return (position, vehicle.vehicle_id, kind, vehicle.capacity, vehicle.current_load,
+                altitude, refrigerated, vehicle.volume_capacity, vehicle.current_volume)
+
+    # ───── Чтение ─────
+
+    def load_company(self, company) -> None:
+        """
+        Загрузить клиентов, транспорт и назначения в компанию.
+
+        Транспорт с ID, уже занятым в компании, получает новый ID
+        (TransportCompany.add_vehicle) - так же, как при загрузке JSON.
+
+        Args:
+            company: Транспортная компания (обычно пустая)
+        """
+        collisions = company.id_collisions
+        clients = {}
+        for row_id, *row in self.conn.execute(f"SELECT id, {CLIENT_COLUMNS} FROM clients ORDER BY id"):
+            client = self._client_from_row(row)
+            clients[row_id] = client
+            company.add_client(client)
+
+        # Если назначения сохранены, загрузка восстанавливается через load_cargo
+        # в исходном порядке, чтобы сумма весов совпала до последнего знака
+        assignments = self.conn.execute(
+            "SELECT client_id, vehicle_id FROM assignments ORDER BY vehicle_id, position").fetchall()
+
+        vehicles = {}
+        rows = self.conn.execute(
+            "SELECT vehicle_id, type, capacity, current_load, max_altitude, is_refrigerated, "
+            "volume_capacity, current_volume FROM vehicles ORDER BY position")
+        for vehicle_id, kind, capacity, load, altitude, refrigerated, volume_capacity, volume_load in rows:
+            if kind == "airplane":
+                vehicle = Airplane(capacity, altitude, volume_capacity, vehicle_id)
+            else:
+                vehicle = Van(capacity, bool(refrigerated), volume_capacity, vehicle_id)
+            vehicle.current_load = 0.0 if assignments else load
+            vehicle.current_volume = 0.0 if assignments else volume_load
+            vehicles[vehicle_id] = vehicle
+            company.add_vehicle(vehicle)
+
+        for client_id, vehicle_id in assignments:
+            vehicles[vehicle_id].load_cargo(clients[client_id])
+        report_duplicates(company.id_collisions - collisions, self.path)
+
+    def get_company_name(self) -> Optional[str]:
+        """Получить сохраненное название компании."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'company_name'").fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _client_filter(is_vip: Optional[bool], min_weight: Optional[float],
+                       max_weight: Optional[float]) -> Tuple[str, list]:
+        """Собрать условие WHERE для выборки клиентов."""
+        conditions, params = [], []
+        if is_vip is not None:
+            conditions.append("is_vip = ?")
+            params.append(int(is_vip))
+        if min_weight is not None:
+            conditions.append("cargo_weight >= ?")
+            params.append(min_weight)
+        if max_weight is not None:
+            conditions.append("cargo_weight <= ?")
+            params.append(max_weight)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def get_clients(self, is_vip: Optional[bool] = None, min_weight: Optional[float] = None,
+                    max_weight: Optional[float] = None, page: int = 0,
+                    page_size: int = 100) -> List[Client]:
+        """
+        Получить страницу клиентов с фильтрацией.
+
+        Args:
+            is_vip: Фильтр по VIP-статусу
+            min_weight: Минимальный вес груза
+            max_weight: Максимальный вес груза
+            page: Номер страницы (с нуля)
+            page_size: Размер страницы
+
+        Returns:
+            Список клиентов страницы
+        """
+        where, params = self._client_filter(is_vip, min_weight, max_weight)
+        rows = self.conn.execute(
+            f"SELECT {CLIENT_COLUMNS} FROM clients{where} ORDER BY id LIMIT ? OFFSET ?",
+            params + [page_size, page * page_size]
+        )
+        return [self._client_from_row(row) for row in rows]
+
+    def count_clients(self, is_vip: Optional[bool] = None, min_weight: Optional[float] = None,
+                      max_weight: Optional[float] = None) -> int:
+        """
+        Подсчитать клиентов, удовлетворяющих фильтру.
+
+        Args:
+            is_vip: Фильтр по VIP-статусу
+            min_weight: Минимальный вес груза
+            max_weight: Максимальный вес груза
+
+        Returns:
+            Количество клиентов
+        """
+        where, params = self._client_filter(is_vip, min_weight, max_weight)
+        return self.conn.execute(f"SELECT COUNT(*) FROM clients{where}", params).fetchone()[0]
+
+    def get_vehicle_ids(self, vehicle_type: Optional[str] = None) -> List[str]:
+        """
+        Получить ID транспорта, при необходимости только заданного типа.
+
+        Args:
+            vehicle_type: "airplane" или "van"
+
+        Returns:
+            Список ID в порядке добавления
+        """
+        if vehicle_type is None:
+            rows = self.conn.execute("SELECT vehicle_id FROM vehicles ORDER BY position")
+        else:
+            rows = self.conn.execute("SELECT vehicle_id FROM vehicles WHERE type = ? ORDER BY position",
+                                     (vehicle_type,))
+        return [row[0] for row in rows]
+
+    def get_vehicle_clients(self, vehicle_id: str) -> List[Client]:
+        """
+        Получить клиентов, назначенных на транспорт.
+
+        Args:
+            vehicle_id: ID транспортного средства
+
+        Returns:
+            Список клиентов
+        """
+        columns = ", ".join(f"c.{name}" for name in CLIENT_COLUMNS.split(", "))
+        rows = self.conn.execute(
+            f"SELECT {columns} FROM assignments a "
+            "JOIN clients c ON c.id = a.client_id WHERE a.vehicle_id = ? ORDER BY a.position",
+            (vehicle_id,)
+        )
+        return [self._client_from_row(row) for row in rows]
+
+    def get_statistics(self) -> dict:
+        """
+        Получить статистику в формате TransportCompany.get_statistics().
+
+        Все агрегаты считаются запросами SQL.
+
+        Returns:
+            Словарь со статистикой
+        """
+        total_vehicles, total_capacity, used_capacity = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(capacity), 0), COALESCE(SUM(current_load), 0) FROM vehicles"
+        ).fetchone()
+        total_clients, vip_clients = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(is_vip), 0) FROM clients"
+        ).fetchone()
+
+        return {
+            "company_name": self.get_company_name() or "",
+            "total_vehicles": total_vehicles,
+            "total_capacity": total_capacity,
+            "used_capacity": used_capacity,
+            "utilization_percentage": (used_capacity / total_capacity * 100) if total_capacity > 0 else 0,
+            "total_clients": total_clients,
+            "vip_clients": vip_clients,
+            "regular_clients": total_clients - vip_clients
+        }
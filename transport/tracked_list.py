@@ -0,0 +1,63 @@
+class TrackedList(list):
+    """
+    Список со счетчиком изменений.
+
+    Каждая изменяющая операция увеличивает version на единицу. Владелец
+    списка сравнивает счетчик с числом изменений, сделанных им самим, и так
+    узнает о прямых изменениях списка в обход его методов (например,
+    company.vehicles.clear()). Чтение работает со скоростью обычного list.
+    """
+
+    __slots__ = ('version',)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+    # Без этого pickle восстанавливает элементы через extend() раньше слота version
+    def __reduce_ex__(self, protocol):
+        return self.__class__, (list(self),), self.version
+
+    def __setstate__(self, version) -> None:
+        self.version = version
+
+    def append(self, item) -> None:
+        self.version += 1
+        super().append(item)
+
+    def extend(self, items) -> None:
+        self.version += 1
+        super().extend(items)
+
+    def insert(self, index, item) -> None:
+        self.version += 1
+        super().insert(index, item)
+
+    def remove(self, item) -> None:
+        super().remove(item)
+        self.version += 1
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self.version += 1
+        return item
+
+    def clear(self) -> None:
+        self.version += 1
+        super().clear()
+
+    def __setitem__(self, index, value) -> None:
+        self.version += 1
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self.version += 1
+
+    def __iadd__(self, items):
+        self.version += 1
+        return super().__iadd__(items)
+
+    def __imul__(self, n):
+        self.version += 1
+        return super().__imul__(n)
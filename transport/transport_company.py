@@ -1,14 +1,27 @@
-from typing import List, Union
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Union
 from .vehicle import Vehicle
 from .client import Client
 from .airplane import Airplane
 from .van import Van
+from .packing import DEFAULT_STRATEGY, run_strategy
+from .sharding import ShardKey, run_sharded
+from .capacity_index import CategoryIndex
+from .columnar import ColumnarFleet
+from .sqlite_storage import SQLiteStorage
+from .exporter import DEFAULT_BUFFER_SIZE, export_distribution
+from .tracked_list import TrackedList
+from .ids import allocate_id
+from . import instrumentation
 
 class TransportCompany:
     """
     Класс для управления транспортной компанией.
     """
     
+    # Доля инкрементальных изменений от числа клиентов, после которой
+    # план пересчитывается целиком
+    replan_threshold = 0.25
+    
     def __init__(self, name: str):
         """
         Инициализация транспортной компании.
@@ -19,8 +32,49 @@ class TransportCompany:
         self._validate_name(name)
         
         self.name = name
+        self._client_vehicle: Dict[Client, Vehicle] = {}  # Обратный индекс клиент -> транспорт
+        self._free_index: Optional[CategoryIndex] = None  # Индекс текущего плана
+        self._incremental_changes = 0
+        self._attached: Set[Vehicle] = set()  # Транспорт, подключенный к компании
+        # Занятые ID транспорта: уникальность ID обеспечивается в пределах компании
+        self._vehicle_ids: Dict[str, Vehicle] = {}
+        # Сколько добавленного транспорта получило новый ID из-за совпадения
+        self.id_collisions = 0
+        # Полных пересчетов плана (apply_plan): по изменению счетчика видно, что
+        # инкрементальная операция перешла к полной оптимизации
+        self.replans = 0
+        
+        # Агрегаты статистики поддерживаются инкрементально; *_seen - число
+        # изменений списков, сделанных методами компании (см. TrackedList)
+        self._total_capacity = 0.0
+        self._used_capacity = 0.0
+        self._vip_clients = 0
         self.vehicles: List[Union[Airplane, Van]] = []
         self.clients: List[Client] = []
+        self._stats_dirty = False
+    
+    @property
+    def vehicles(self) -> List[Union[Airplane, Van]]:
+        """Транспортные средства компании."""
+        return self._vehicles
+    
+    @vehicles.setter
+    def vehicles(self, value: Iterable[Union[Airplane, Van]]) -> None:
+        self._vehicles = value if isinstance(value, TrackedList) else TrackedList(value)
+        self._vehicles_seen = self._vehicles.version
+        self._stats_dirty = True
+    
+    @property
+    def clients(self) -> List[Client]:
+        """Клиенты компании."""
+        return self._clients
+    
+    @clients.setter
+    def clients(self, value: Iterable[Client]) -> None:
+        # Списки со счетчиком изменений (TrackedList, LazyClientList) не копируются
+        self._clients = value if hasattr(value, "version") else TrackedList(value)
+        self._clients_seen = self._clients.version
+        self._stats_dirty = True
     
     def _validate_name(self, name: str):
         """Валидация названия компании."""
@@ -31,13 +85,86 @@ class TransportCompany:
         """
         Добавить транспортное средство.
         
+        Если ID уже занят другим транспортом компании (повтор в загруженных
+        данных или совпадение с выданным генератором), транспорт получает
+        новый ID, а совпадение учитывается в id_collisions.
+        
         Args:
             vehicle: Объект транспортного средства
         """
         if not isinstance(vehicle, (Airplane, Van)):
             raise TypeError("Транспортное средство должно быть Airplane или Van")
         
+        self._attach_vehicle(vehicle)
         self.vehicles.append(vehicle)
+        self._vehicles_seen += 1
+    
+    def replace_vehicle(self, old: Union[Airplane, Van], new: Union[Airplane, Van]) -> None:
+        """
+        Заменить транспортное средство на той же позиции.
+        
+        Грузы заменяемого транспорта выгружаются.
+        
+        Args:
+            old: Заменяемое транспортное средство
+            new: Новое транспортное средство
+        """
+        if not isinstance(new, (Airplane, Van)):
+            raise TypeError("Транспортное средство должно быть Airplane или Van")
+        
+        idx = self.vehicles.index(old)
+        self._detach_vehicle(old)
+        self._attach_vehicle(new)
+        self.vehicles[idx] = new
+        self._vehicles_seen += 1
+    
+    def remove_vehicle(self, vehicle: Union[Airplane, Van]) -> None:
+        """
+        Удалить транспортное средство, выгрузив его грузы.
+        
+        Args:
+            vehicle: Удаляемое транспортное средство
+        """
+        self.vehicles.remove(vehicle)
+        self._vehicles_seen += 1
+        self._detach_vehicle(vehicle)
+    
+    def __setstate__(self, state: dict) -> None:
+        # Транспорт не сохраняет ссылку на компанию (Vehicle.__getstate__)
+        self.__dict__.update(state)
+        for vehicle in self._attached:
+            vehicle._owner = self
+    
+    def _claim_id(self, vehicle: Vehicle) -> None:
+        """Занять ID транспорта в компании, выдав новый при совпадении."""
+        if self._vehicle_ids.setdefault(vehicle.vehicle_id, vehicle) is not vehicle:
+            vehicle.vehicle_id = allocate_id(self._vehicle_ids)
+            self._vehicle_ids[vehicle.vehicle_id] = vehicle
+            self.id_collisions += 1
+    
+    def _attach_vehicle(self, vehicle: Vehicle) -> None:
+        """Подключить транспорт к обратному индексу, индексу плана и статистике."""
+        vehicle._owner = self
+        self._attached.add(vehicle)
+        self._claim_id(vehicle)
+        for client in vehicle.clients_list:
+            self._client_vehicle[client] = vehicle
+        if self._free_index is not None:
+            self._free_index.add(vehicle)
+        self._total_capacity += vehicle.capacity
+        self._used_capacity += vehicle.current_load
+    
+    def _detach_vehicle(self, vehicle: Vehicle) -> None:
+        """Отключить транспорт от компании, выгрузив его грузы."""
+        vehicle.unload_cargo()
+        vehicle._owner = None
+        self._attached.discard(vehicle)
+        if self._vehicle_ids.get(vehicle.vehicle_id) is vehicle:
+            del self._vehicle_ids[vehicle.vehicle_id]
+        if self._free_index is not None and vehicle in self._free_index:
+            self._free_index.remove(vehicle)
+        # Без транспорта сумма обнуляется явно, чтобы не копить погрешность float
+        self._total_capacity = self._total_capacity - vehicle.capacity if self._attached else 0.0
     
     def list_vehicles(self) -> List[str]:
         """
@@ -59,73 +186,288 @@ class TransportCompany:
             raise TypeError("Аргумент должен быть объектом класса Client")
         
         self.clients.append(client)
+        self._clients_seen += 1
+        self._vip_clients += client.is_vip
+    
+    def get_client_vehicle(self, client: Client) -> Optional[Vehicle]:
+        """
+        Получить транспорт, в который загружен груз клиента.
+        
+        Поиск выполняется по обратному индексу за O(1).
+        
+        Args:
+            client: Объект клиента
+            
+        Returns:
+            Транспортное средство или None, если груз не загружен
+        """
+        return self._client_vehicle.get(client)
+    
+    def get_client_vehicle_id(self, client: Client) -> Optional[str]:
+        """
+        Получить ID транспорта, в который загружен груз клиента.
+        
+        Args:
+            client: Объект клиента
+            
+        Returns:
+            ID транспортного средства или None, если груз не загружен
+        """
+        vehicle = self._client_vehicle.get(client)
+        return vehicle.vehicle_id if vehicle is not None else None
+    
+    def _on_cargo_loaded(self, vehicle: Vehicle, client: Client) -> None:
+        """Обновить индексы и статистику после погрузки (вызывается из Vehicle)."""
+        self._client_vehicle[client] = vehicle
+        self._used_capacity += client.cargo_weight
+        if self._free_index is not None and vehicle in self._free_index:
+            self._free_index.update(vehicle)
+    
+    def _on_cargo_unloaded(self, vehicle: Vehicle, clients: Iterable[Client], freed: float) -> None:
+        """Обновить индексы и статистику после разгрузки (вызывается из Vehicle)."""
+        for client in clients:
+            if self._client_vehicle.get(client) is vehicle:
+                del self._client_vehicle[client]
+        self._used_capacity -= freed
+        if self._free_index is not None and vehicle in self._free_index:
+            self._free_index.update(vehicle)
+    
+    @property
+    def has_plan(self) -> bool:
+        """Есть ли текущий план распределения для инкрементальных изменений."""
+        return self._free_index is not None
+    
+    def place_client(self, client: Client) -> Optional[Vehicle]:
+        """
+        Инкрементально разместить груз клиента в текущем плане.
+        
+        Груз помещается в совместимый транспорт с наименьшим достаточным
+        свободным местом за O(log V), остальные грузы не переупаковываются; если
+        транспорт все же отказывает в погрузке, выбирается следующий. Клиент
+        должен быть уже добавлен в компанию. Если VIP-клиент не помещается
+        или накоплено слишком много изменений (replan_threshold),
+        выполняется полная оптимизация (увеличивается replans).
+        
+        Args:
+            client: Объект клиента
+            
+        Returns:
+            Транспорт, в который загружен груз, или None
+        """
+        if client in self._client_vehicle:
+            return self._client_vehicle[client]
+        
+        index = self._ensure_free_index()
+        vehicle = index.best_fit(client)
+        rejected = []
+        while vehicle is not None and not vehicle.load_cargo(client):
+            # Индекс разошелся с транспортом (например, его загрузку изменили
+            # напрямую): транспорт временно исключается, и поиск повторяется
+            index.remove(vehicle)
+            rejected.append(vehicle)
+            vehicle = index.best_fit(client)
+        for stale in rejected:
+            index.add(stale)
+        placed = vehicle is not None
+        
+        if not placed and client.is_vip:
+            # VIP обслуживаются первыми - освобождаем место полной переупаковкой
+            self.optimize_cargo_distribution()
+        else:
+            self._register_incremental_change()
+        return self._client_vehicle.get(client)
+    
+    def unplace_client(self, client: Client) -> bool:
+        """
+        Инкрементально выгрузить груз клиента из текущего плана.
+        
+        Args:
+            client: Объект клиента
+            
+        Returns:
+            True если груз клиента был загружен, False в противном случае
+        """
+        vehicle = self._client_vehicle.get(client)
+        if vehicle is None:
+            return False
+        
+        vehicle.unload_client(client)
+        self._register_incremental_change()
+        return True
+    
+    def replace_client(self, old: Client, new: Client) -> Optional[Vehicle]:
+        """
+        Заменить клиента (например, после редактирования) с учетом плана.
+        
+        Груз прежнего клиента выгружается, а груз нового клиента размещается
+        инкрементально, если план уже построен или прежний груз был загружен.
+        
+        Args:
+            old: Заменяемый клиент
+            new: Новый клиент
+            
+        Returns:
+            Транспорт, в который загружен груз нового клиента, или None
+        """
+        if not isinstance(new, Client):
+            raise TypeError("Аргумент должен быть объектом класса Client")
+        
+        self.clients[self.clients.index(old)] = new
+        self._clients_seen += 1
+        self._vip_clients += new.is_vip - old.is_vip
+        was_placed = self.unplace_client(old)
+        if not was_placed and self._free_index is None:
+            return None
+        return self.place_client(new)
+    
+    def remove_client(self, client: Client) -> None:
+        """
+        Удалить клиента, выгрузив его груз.
+        
+        Args:
+            client: Объект клиента
+        """
+        self.clients.remove(client)
+        self._clients_seen += 1
+        self._vip_clients -= client.is_vip
+        self.unplace_client(client)
     
-    def optimize_cargo_distribution(self) -> dict:
+    def _ensure_free_index(self) -> CategoryIndex:
+        """Получить индекс плана, построив его по текущей загрузке при необходимости."""
+        self._sync_if_stale()
+        if self._free_index is None:
+            # При равном свободном месте предпочтение - более вместительному транспорту
+            ordered = sorted(self.vehicles, key=lambda v: v.capacity, reverse=True)
+            self._free_index = CategoryIndex(ordered)
+            self._incremental_changes = 0
+        return self._free_index
+    
+    def _register_incremental_change(self) -> None:
+        """Учесть инкрементальное изменение и при превышении порога пересчитать план."""
+        self._incremental_changes += 1
+        if self._incremental_changes > self.replan_threshold * max(len(self.clients), 1):
+            self.optimize_cargo_distribution()
+    
+    def optimize_cargo_distribution(self, strategy: str = DEFAULT_STRATEGY, **options) -> dict:
         """
         Оптимизировать распределение грузов по транспортным средствам.
         
+        По умолчанию используется метод Best Fit Decreasing: VIP-клиенты
+        обрабатываются первыми, внутри группы - по убыванию веса; каждый груз
+        помещается в транспорт с наименьшим достаточным свободным местом.
+        Другие стратегии см. в packing.STRATEGIES.
+        
+        Args:
+            strategy: Имя стратегии распределения
+            **options: Параметры стратегии и improve_ms - бюджет улучшения
+                плана локальным поиском в мс (см. packing.run_strategy)
+        
         Returns:
             Словарь с результатами распределения
         """
-        # Сортируем клиентов: сначала VIP, затем обычные
-        sorted_clients = sorted(self.clients, key=lambda x: (not x.is_vip, x.cargo_weight), reverse=True)
+        with instrumentation.span("optimize_cargo_distribution"):
+            return self.apply_plan(run_strategy(strategy, self.clients, self.vehicles, **options))
+    
+    def optimize_sharded(self, strategy: str = DEFAULT_STRATEGY, shards: Optional[int] = None,
+                         key: Optional[ShardKey] = None, max_workers: Optional[int] = None,
+                         improve_ms: Optional[float] = None) -> dict:
+        """
+        Распределить грузы по шардам (складам) в отдельных процессах.
+        
+        Клиенты и транспорт разбиваются по ключу key или равномерно на
+        shards частей, каждая часть планируется в своем процессе, после
+        чего неразмещенные клиенты переносятся в свободное место других
+        шардов (см. sharding.run_sharded).
+        
+        Args:
+            strategy: Имя стратегии распределения внутри шарда
+            shards: Число шардов без ключа (по умолчанию - число ядер)
+            key: Необязательная функция метки шарда для клиента и транспорта
+            max_workers: Число процессов (по умолчанию - число ядер)
+            improve_ms: Бюджет улучшения плана каждого шарда локальным поиском в мс
+        
+        Returns:
+            Словарь с результатами распределения, а также shards и rebalanced
+        """
+        with instrumentation.span("optimize_sharded"):
+            run = run_sharded(self.clients, self.vehicles, strategy, shards, key, max_workers, improve_ms)
+            result = self.apply_plan(run)
+        result.update(shards=run["shards"], rebalanced=run["rebalanced"])
+        return result
+    
+    def apply_plan(self, run: dict) -> dict:
+        """
+        Загрузить транспорт по готовому плану.
+        
+        План может быть рассчитан заранее (например, в фоновом потоке) по
+        снимку данных; транспорт и клиенты, удаленные из компании за это
+        время, пропускаются.
         
-        # Сортируем транспорт по грузоподъемности (от большей к меньшей)
-        sorted_vehicles = sorted(self.vehicles, key=lambda x: x.capacity, reverse=True)
+        Args:
+            run: Результат packing.run_strategy
+            
+        Returns:
+            Словарь с результатами распределения
+        """
+        self._sync_if_stale()
+        # Индекс плана перестраивается после загрузки, а не на каждой погрузке
+        self._free_index = None
         
         # Разгружаем все транспортные средства
-        for vehicle in sorted_vehicles:
+        for vehicle in self.vehicles:
             vehicle.unload_cargo()
         
+        alive_vehicles = set(map(id, self.vehicles))
+        alive_clients = set(map(id, self.clients))
+        
         # Распределение грузов
         distribution_result = {
             "successful": [],
-            "failed": [],
+            "failed": [c for c in run["failed"] if id(c) in alive_clients],
             "vehicles_used": 0,
             "total_cargo": sum(c.cargo_weight for c in self.clients),
-            "cargo_distributed": 0
+            "cargo_distributed": 0,
+            "strategy": run["strategy"],
+            "elapsed_ms": run["elapsed_ms"],
+            "lower_bound": run["lower_bound"],
+            "optimality_gap": run["optimality_gap"]
         }
+        if "improvement" in run:
+            distribution_result["improvement"] = run["improvement"]
         
-        for client in sorted_clients:
-            cargo_loaded = False
-            
-            # Пытаемся загрузить в уже частично заполненный транспорт
-            for vehicle in sorted_vehicles:
-                if vehicle.get_free_capacity() >= client.cargo_weight:
-                    if vehicle.load_cargo(client):
-                        cargo_loaded = True
-                        break
-            
-            # Если не поместилось, ищем пустой транспорт
-            if not cargo_loaded:
-                for vehicle in sorted_vehicles:
-                    if vehicle.current_load == 0 and vehicle.capacity >= client.cargo_weight:
-                        if vehicle.load_cargo(client):
-                            cargo_loaded = True
-                            break
-            
+        for client, vehicle in run["placements"]:
+            if id(client) not in alive_clients:
+                continue
             # Записываем результат
-            if cargo_loaded:
+            if id(vehicle) in alive_vehicles and vehicle.load_cargo(client):
                 distribution_result["successful"].append(client)
                 distribution_result["cargo_distributed"] += client.cargo_weight
             else:
                 distribution_result["failed"].append(client)
         
         # Подсчитываем использованный транспорт
-        distribution_result["vehicles_used"] = sum(1 for v in sorted_vehicles if v.current_load > 0)
+        distribution_result["vehicles_used"] = sum(1 for v in self.vehicles if v.current_load > 0)
         
+        self._ensure_free_index()
+        self.replans += 1
         return distribution_result
     
     def get_statistics(self) -> dict:
         """
         Получить статистику по компании.
         
+        Агрегаты поддерживаются инкрементально, поэтому вызов стоит O(1).
+        После прямого изменения списков vehicles/clients в обход методов
+        компании (например, company.vehicles.clear()) они один раз
+        пересчитываются полным проходом.
+        
         Returns:
             Словарь со статистикой
         """
-        total_capacity = sum(v.capacity for v in self.vehicles)
-        used_capacity = sum(v.current_load for v in self.vehicles)
-        vip_clients = sum(1 for c in self.clients if c.is_vip)
+        self._sync_if_stale()
+        total_capacity = self._total_capacity
+        used_capacity = max(self._used_capacity, 0.0)
+        total_clients = len(self.clients)
         
         return {
             "company_name": self.name,
@@ -133,11 +475,113 @@ class TransportCompany:
             "total_capacity": total_capacity,
             "used_capacity": used_capacity,
             "utilization_percentage": (used_capacity / total_capacity * 100) if total_capacity > 0 else 0,
-            "total_clients": len(self.clients),
-            "vip_clients": vip_clients,
-            "regular_clients": len(self.clients) - vip_clients
+            "total_clients": total_clients,
+            "vip_clients": self._vip_clients,
+            "regular_clients": total_clients - self._vip_clients
         }
     
+    def invalidate_statistics(self) -> None:
+        """
+        Пометить агрегаты устаревшими.
+        
+        Нужно после прямого изменения атрибутов транспорта или клиентов
+        (capacity, current_load, clients_list, is_vip); изменения самих
+        списков vehicles и clients отслеживаются автоматически.
+        """
+        self._stats_dirty = True
+    
+    def _sync_if_stale(self) -> None:
+        """Пересчитать агрегаты и индексы, если списки менялись в обход методов компании."""
+        vehicles_changed = self._vehicles.version != self._vehicles_seen
+        if not (self._stats_dirty or vehicles_changed or self._clients.version != self._clients_seen):
+            return
+        
+        # Транспорт, удаленный из списка напрямую, перестает уведомлять компанию
+        current = set(self.vehicles)
+        for vehicle in self._attached - current:
+            vehicle._owner = None
+        for vehicle in current - self._attached:
+            vehicle._owner = self
+        self._attached = current
+        # При совпадении ID сохраняет транспорт, который уже был в компании
+        self._vehicle_ids = {vehicle_id: v for vehicle_id, v in self._vehicle_ids.items()
+                             if v in current and v.vehicle_id == vehicle_id}
+        for vehicle in self.vehicles:
+            self._claim_id(vehicle)
+        
+        self._client_vehicle = {c: v for v in self.vehicles for c in v.clients_list}
+        if vehicles_changed or self._stats_dirty:
+            self._free_index = None
+        
+        self._total_capacity = sum(v.capacity for v in self.vehicles)
+        self._used_capacity = sum(v.current_load for v in self.vehicles)
+        # Список из двоичного снимка знает число VIP из заголовка и не декодирует клиентов
+        vip_count = getattr(self.clients, "vip_count", None)
+        self._vip_clients = vip_count if vip_count is not None else sum(1 for c in self.clients if c.is_vip)
+        self._vehicles_seen = self._vehicles.version
+        self._clients_seen = self._clients.version
+        self._stats_dirty = False
+    
+    def export_distribution(self, target: Union[str, TextIO], fmt: Optional[str] = None,
+                            buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+        """
+        Потоково выгрузить текущее распределение грузов в файл.
+        
+        Args:
+            target: Путь к файлу или открытый текстовый поток
+            fmt: Формат (json, jsonl, csv, txt); по умолчанию - по расширению файла
+            buffer_size: Размер буфера записи в байтах
+            
+        Returns:
+            Количество выгруженных назначений
+        """
+        return export_distribution(self, target, fmt, buffer_size)
+    
+    def to_columnar(self) -> ColumnarFleet:
+        """
+        Получить колоночное представление компании на NumPy.
+        
+        Подходит для векторной статистики и поиска кандидатов на больших
+        объемах данных. Требует установленного NumPy.
+        
+        Returns:
+            Объект ColumnarFleet со снимком текущих данных
+        """
+        return ColumnarFleet.from_company(self)
+    
+    def to_sqlite(self, path: str = ":memory:") -> SQLiteStorage:
+        """
+        Сохранить компанию в базу SQLite.
+        
+        Полученное хранилище позволяет постранично выбирать и фильтровать
+        клиентов и считать статистику запросами SQL.
+        
+        Args:
+            path: Путь к файлу базы данных (по умолчанию - в памяти)
+            
+        Returns:
+            Открытое хранилище SQLiteStorage
+        """
+        storage = SQLiteStorage(path)
+        storage.save_company(self)
+        return storage
+    
+    @classmethod
+    def from_sqlite(cls, path: str) -> "TransportCompany":
+        """
+        Загрузить компанию из базы SQLite.
+        
+        Args:
+            path: Путь к файлу базы данных
+            
+        Returns:
+            Транспортная компания с клиентами, транспортом и назначениями
+        """
+        with SQLiteStorage(path) as storage:
+            company = cls(storage.get_company_name() or "Компания")
+            storage.load_company(company)
+        return company
+    
     def __str__(self):
         stats = self.get_statistics()
         return (f"Транспортная компания: {self.name}\n"
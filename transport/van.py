@@ -1,3 +1,4 @@
+from typing import Optional
 from .vehicle import Vehicle
 
 class Van(Vehicle):
@@ -6,15 +7,20 @@ class Van(Vehicle):
     Наследуется от Vehicle.
     """
     
-    def __init__(self, capacity: float, is_refrigerated: bool = False):
+    __slots__ = ('is_refrigerated',)
+    
+    def __init__(self, capacity: float, is_refrigerated: bool = False, volume_capacity: Optional[float] = None,
+                 vehicle_id: Optional[str] = None):
         """
         Инициализация фургона.
         
         Args:
             capacity: Грузоподъемность в тоннах
             is_refrigerated: Наличие холодильника
+            volume_capacity: Вместимость в м³ (None - объем не ограничен)
+            vehicle_id: Существующий ID; None - выдать новый
         """
-        super().__init__(capacity)
+        super().__init__(capacity, volume_capacity, vehicle_id)
         self._validate_refrigerated(is_refrigerated)
         self.is_refrigerated = is_refrigerated
     
@@ -23,6 +29,16 @@ class Van(Vehicle):
         if not isinstance(is_refrigerated, bool):
             raise ValueError("Флаг наличия холодильника должен быть булевым значением")
     
+    def accepts(self, client) -> bool:
+        """Фургон везет грузы без ограничения высоты; охлажденные - только с холодильником."""
+        return self.is_refrigerated or not client.requires_refrigeration
+    
+    def to_dict(self) -> dict:
+        """Получить словарь атрибутов для сериализации."""
+        data = super().to_dict()
+        data.update({"type": "van", "is_refrigerated": self.is_refrigerated})
+        return data
+    
     def __str__(self):
         base_str = super().__str__()
         refrigeration = "с холодильником" if self.is_refrigerated else "без холодильника"
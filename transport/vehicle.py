@@ -1,31 +1,106 @@
-import uuid
-from typing import List
+from typing import List, Optional
 from .client import Client
+from .ids import allocate_id, intern_id
+
+# Допуск сравнения загрузки с вместимостью: сумма весов float зависит от
+# порядка сложения, а план и погрузка складывают их по-разному
+CAPACITY_TOLERANCE = 1e-9
+
+
+def fits(load: float, amount: float, capacity: float) -> bool:
+    """
+    Проверить, помещается ли приращение в вместимость с учетом допуска.
+
+    Единая проверка для погрузки (Vehicle.load_cargo) и для планировщиков,
+    которые ведут свободное место отдельно, чтобы план и погрузка не
+    расходились на погрешность float.
+
+    Args:
+        load: Текущая загрузка
+        amount: Приращение
+        capacity: Вместимость
+
+    Returns:
+        True если load + amount не превышает capacity с учетом допуска
+    """
+    return load + amount <= capacity + CAPACITY_TOLERANCE
 
 class Vehicle:
     """
     Базовый класс для транспортных средств.
     """
     
-    def __init__(self, capacity: float):
+    __slots__ = ('vehicle_id', 'capacity', 'current_load', 'volume_capacity', 'current_volume',
+                 'clients_list', '_owner')
+    
+    def __init__(self, capacity: float, volume_capacity: Optional[float] = None,
+                 vehicle_id: Optional[str] = None):
         """
         Инициализация транспортного средства.
         
         Args:
             capacity: Грузоподъемность в тоннах
+            volume_capacity: Вместимость в м³ (None - объем не ограничен)
+            vehicle_id: Существующий ID (например, из файла); None - выдать новый
+                текущим генератором ids.get_allocator()
         """
         self._validate_capacity(capacity)
+        self._validate_volume_capacity(volume_capacity)
+        self._validate_vehicle_id(vehicle_id)
         
-        self.vehicle_id = str(uuid.uuid4())[:8]  # Уникальный ID
+        # Интернированный ID; уникальность в компании проверяет TransportCompany.add_vehicle
+        self.vehicle_id = allocate_id() if vehicle_id is None else intern_id(vehicle_id)
         self.capacity = capacity
         self.current_load = 0.0
+        self.volume_capacity = volume_capacity
+        self.current_volume = 0.0
         self.clients_list: List[Client] = []
+        self._owner = None  # Компания, которую уведомляют о погрузке/разгрузке
+    
+    def __getstate__(self):
+        """
+        Состояние для pickle и copy без обратной ссылки на компанию.
+
+        Иначе копия одного транспорта тянет за собой всю компанию;
+        компания восстанавливает ссылку сама (TransportCompany.__setstate__).
+        """
+        state = {slot: getattr(self, slot)
+                 for cls in type(self).__mro__ for slot in getattr(cls, '__slots__', ())
+                 if hasattr(self, slot)}
+        state['_owner'] = None
+        return None, state
     
     def _validate_capacity(self, capacity: float):
         """Валидация грузоподъемности."""
         if not isinstance(capacity, (int, float)) or capacity <= 0:
             raise ValueError("Грузоподъемность должна быть положительным числом")
     
+    def _validate_volume_capacity(self, volume_capacity: Optional[float]):
+        """Валидация вместимости по объему."""
+        if volume_capacity is not None and (not isinstance(volume_capacity, (int, float)) or volume_capacity <= 0):
+            raise ValueError("Вместимость по объему должна быть положительным числом")
+    
+    def _validate_vehicle_id(self, vehicle_id: Optional[str]):
+        """Валидация существующего ID."""
+        if vehicle_id is not None and (not isinstance(vehicle_id, str) or not vehicle_id):
+            raise ValueError("ID транспорта должен быть непустой строкой")
+    
+    def accepts(self, client: Client) -> bool:
+        """
+        Проверить, может ли транспорт перевозить груз клиента по его требованиям.
+        
+        Учитываются только требования категории груза (Client.category),
+        но не вес и объем. Транспорт без холодильника не принимает грузы,
+        которым он нужен.
+        
+        Args:
+            client: Объект клиента
+            
+        Returns:
+            True если транспорт совместим с грузом
+        """
+        return not client.requires_refrigeration
+    
     def load_cargo(self, client: Client) -> bool:
         """
         Загрузить груз клиента.
@@ -39,22 +114,82 @@ class Vehicle:
         if not isinstance(client, Client):
             raise TypeError("Аргумент должен быть объектом класса Client")
         
-        if self.current_load + client.cargo_weight > self.capacity:
+        if not fits(self.current_load, client.cargo_weight, self.capacity) or not self.accepts(client):
             return False
         
+        volume = client.volume
+        if volume is not None:
+            if self.volume_capacity is not None and not fits(self.current_volume, volume, self.volume_capacity):
+                return False
+            self.current_volume += volume
+        
         self.current_load += client.cargo_weight
         self.clients_list.append(client)
+        if self._owner is not None:
+            self._owner._on_cargo_loaded(self, client)
         return True
     
     def unload_cargo(self) -> None:
         """Разгрузить транспортное средство."""
+        unloaded = list(self.clients_list) if self._owner is not None else None
+        freed = self.current_load
         self.current_load = 0.0
+        self.current_volume = 0.0
         self.clients_list.clear()
+        if unloaded is not None:
+            self._owner._on_cargo_unloaded(self, unloaded, freed)
+    
+    def unload_client(self, client: Client) -> bool:
+        """
+        Выгрузить груз одного клиента.
+        
+        Args:
+            client: Объект клиента
+            
+        Returns:
+            True если груз клиента был в транспорте, False в противном случае
+        """
+        for i, loaded in enumerate(self.clients_list):
+            if loaded is client:
+                del self.clients_list[i]
+                break
+        else:
+            return False
+        
+        # Пустой транспорт обнуляется явно, чтобы не копить погрешность float
+        previous = self.current_load
+        self.current_load = self.current_load - client.cargo_weight if self.clients_list else 0.0
+        if not self.clients_list:
+            self.current_volume = 0.0
+        elif client.volume is not None:
+            self.current_volume -= client.volume
+        if self._owner is not None:
+            self._owner._on_cargo_unloaded(self, [client], previous - self.current_load)
+        return True
     
     def get_free_capacity(self) -> float:
         """Получить свободную грузоподъемность."""
         return self.capacity - self.current_load
     
+    def get_free_volume(self) -> float:
+        """Получить свободный объем (бесконечность, если объем не ограничен)."""
+        if self.volume_capacity is None:
+            return float("inf")
+        return self.volume_capacity - self.current_volume
+    
+    def to_dict(self) -> dict:
+        """
+        Получить словарь атрибутов для сериализации.
+        
+        Returns:
+            Словарь с ID, грузоподъемностью и текущей загрузкой; вместимость
+            по объему включается, только если она задана
+        """
+        data = {"vehicle_id": self.vehicle_id, "capacity": self.capacity, "current_load": self.current_load}
+        if self.volume_capacity is not None:
+            data.update({"volume_capacity": self.volume_capacity, "current_volume": self.current_volume})
+        return data
+    
     def __str__(self):
         return (f"Транспорт ID: {self.vehicle_id}, "
                 f"Грузоподъемность: {self.capacity}т, "